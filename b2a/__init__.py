@@ -3,26 +3,57 @@ B2A (Braille to Alphabet) - A Python package for translating between Braille and
 
 This package provides functionality to translate between standard text and Braille,
 supporting both Grade 1 (uncontracted) and Grade 2 (contracted) Braille.
+
+The names below are imported from their modules on first use, so that
+``import b2a`` and ``b2a --version`` stay fast.
 """
 
+import codecs
+
 __version__ = '0.2.0'
 
-from .translator import (
-    text_to_braille,
-    braille_to_text,
-    alphabet_to_braille,
-    CONTRACTIONS,
-    BRAILLE_ALPHABET,
-    BRAILLE_NUMBERS,
-    BRAILLE_PUNCTUATION,
-    CAPITAL_INDICATOR,
-    NUMBER_INDICATOR
-)
+# Public name -> submodule that defines it
+_LAZY_NAMES = {
+    'Translator': 'translator',
+    'text_to_braille': 'translator',
+    'braille_to_text': 'translator',
+    'text_to_brf': 'translator',
+    'brf_to_text': 'translator',
+    'alphabet_to_braille': 'translator',
+    'auto_translate': 'translator',
+    'iter_braille': 'translator',
+    'iter_text': 'translator',
+    'tokenize': 'translator',
+    'CONTRACTIONS': 'translator',
+    'BRAILLE_ALPHABET': 'translator',
+    'BRAILLE_NUMBERS': 'translator',
+    'BRAILLE_PUNCTUATION': 'translator',
+    'CAPITAL_INDICATOR': 'translator',
+    'NUMBER_INDICATOR': 'translator',
+    'translate_many': 'parallel',
+    'translate_tree': 'batch',
+}
+
+# Submodules, imported on first attribute access as well
+_SUBMODULES = frozenset({
+    'aio', 'batch', 'bench', 'brf', 'cells', 'cli', 'codec', 'daemon', 'differential',
+    'formatter', 'instrument', 'parallel', 'reference', 'server', 'tables', 'translator',
+    'vectorized',
+})
 
 __all__ = [
+    'Translator',
     'text_to_braille',
     'braille_to_text',
+    'text_to_brf',
+    'brf_to_text',
     'alphabet_to_braille',
+    'auto_translate',
+    'iter_braille',
+    'iter_text',
+    'tokenize',
+    'translate_many',
+    'translate_tree',
     'CONTRACTIONS',
     'BRAILLE_ALPHABET',
     'BRAILLE_NUMBERS',
@@ -31,3 +62,27 @@ __all__ = [
     'NUMBER_INDICATOR',
     '__version__'
 ]
+
+def __getattr__(name: str):
+    from importlib import import_module
+    if name in _SUBMODULES:
+        # Importing a submodule also sets it as an attribute of the package
+        return import_module(f'.{name}', __name__)
+    module = _LAZY_NAMES.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES) | _SUBMODULES)
+
+def _search_codec(name: str):
+    """Register the braille-g1 and braille-g2 codecs, loading b2a.codec on first lookup."""
+    if not name.startswith('braille'):
+        return None
+    from .codec import search
+    return search(name)
+
+codecs.register(_search_codec)
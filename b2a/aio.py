@@ -0,0 +1,163 @@
+"""
+Asyncio API for translating without blocking the event loop.
+
+Translation is CPU-bound, so a large document translated in one call stalls
+every other task on the loop. These coroutines cut the input into chunks at
+word boundaries and give control back to the loop after each chunk. Large
+inputs are translated on an executor instead of the loop thread; pass a
+ProcessPoolExecutor to keep the work off the loop's interpreter entirely.
+Cancelling the calling task stops translation after the current chunk.
+
+    braille = await atext_to_braille(document)
+
+    async for piece in aiter_braille(request.content.iter_chunked(65536)):
+        await response.write(piece.encode('utf-8'))
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, Union
+
+from .translator import _Incremental, _default_translator
+
+# Characters translated between returns to the event loop, a few
+# milliseconds of work
+ASYNC_CHUNK_SIZE = 8 * 1024
+
+# Inputs of at least this many characters are translated on the executor
+OFFLOAD_THRESHOLD = 256 * 1024
+
+async def _iter_source(source: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    """Iterate over a synchronous or asynchronous iterable of strings."""
+    if hasattr(source, '__aiter__'):
+        async for chunk in source:
+            yield chunk
+    else:
+        for chunk in source:
+            yield chunk
+
+async def _translate_chunks(source: Union[Iterable[str], AsyncIterable[str]], grade: int,
+                            decode: bool, executor: Optional[Executor], chunk_size: int,
+                            offload_threshold: int, size_hint: int = 0) -> AsyncIterator[str]:
+    """Translate chunks of input, yielding to the loop between pieces."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    incremental = _Incremental(_default_translator(grade), decode)
+    loop = asyncio.get_running_loop()
+    seen = size_hint
+
+    async def translate(piece: str, final: bool) -> str:
+        job = incremental.prepare(piece, final)
+        if seen >= offload_threshold:
+            return await loop.run_in_executor(executor, job)
+        result = job()
+        # Let other tasks run before the next piece
+        await asyncio.sleep(0)
+        return result
+
+    async for chunk in _iter_source(source):
+        if not isinstance(chunk, str):
+            raise TypeError("Input must be a string")
+        if not size_hint:
+            seen += len(chunk)
+        for start in range(0, len(chunk), chunk_size):
+            piece = incremental.take(chunk[start:start + chunk_size])
+            if piece is not None:
+                result = await translate(piece, False)
+                if result:
+                    yield result
+    # With final=True nothing is held back, so take() always returns a str
+    result = await translate(incremental.take('', final=True) or '', True)
+    if result:
+        yield result
+
+async def _translate(data: str, grade: int, decode: bool, executor: Optional[Executor],
+                     chunk_size: int, offload_threshold: int) -> str:
+    """Translate a whole string with the chunked async machinery."""
+    if not isinstance(data, str):
+        raise TypeError("Input must be a string")
+    # Validate the grade before any work is scheduled
+    translator = _default_translator(grade)
+    if len(data) <= chunk_size and len(data) < offload_threshold:
+        return translator._decode(data) if decode else translator._encode(data)
+    pieces = []
+    async for piece in _translate_chunks((data,), grade, decode, executor, chunk_size,
+                                         offload_threshold, size_hint=len(data)):
+        pieces.append(piece)
+    return ''.join(pieces)
+
+async def atext_to_braille(text: str, grade: int = 2, *, executor: Optional[Executor] = None,
+                           chunk_size: int = ASYNC_CHUNK_SIZE,
+                           offload_threshold: int = OFFLOAD_THRESHOLD) -> str:
+    """
+    Convert text to Braille without blocking the event loop.
+
+    Args:
+        text: The text to convert to Braille
+        grade: The Braille grade (1 or 2)
+        executor: Executor for large inputs (default: the loop's default executor)
+        chunk_size: Characters translated between returns to the event loop
+        offload_threshold: Inputs at least this long are translated on the executor
+
+    Returns:
+        The Braille representation of the text, as from text_to_braille()
+    """
+    return await _translate(text, grade, False, executor, chunk_size, offload_threshold)
+
+async def abraille_to_text(braille: str, grade: int = 2, *, executor: Optional[Executor] = None,
+                           chunk_size: int = ASYNC_CHUNK_SIZE,
+                           offload_threshold: int = OFFLOAD_THRESHOLD) -> str:
+    """
+    Convert Braille to text without blocking the event loop.
+
+    Args:
+        braille: The Braille to convert to text
+        grade: The Braille grade (1 or 2)
+        executor: Executor for large inputs (default: the loop's default executor)
+        chunk_size: Characters translated between returns to the event loop
+        offload_threshold: Inputs at least this long are translated on the executor
+
+    Returns:
+        The text representation of the Braille, as from braille_to_text()
+    """
+    return await _translate(braille, grade, True, executor, chunk_size, offload_threshold)
+
+def aiter_braille(chunks: Union[Iterable[str], AsyncIterable[str]], grade: int = 2, *,
+                  executor: Optional[Executor] = None, chunk_size: int = ASYNC_CHUNK_SIZE,
+                  offload_threshold: int = OFFLOAD_THRESHOLD) -> AsyncIterator[str]:
+    """
+    Translate a stream of text chunks to Braille as they arrive.
+
+    Chunks may be cut anywhere, even inside a word; the joined output is the
+    same as translating the joined input at once. Once offload_threshold
+    characters have been read, the rest is translated on the executor.
+
+    Args:
+        chunks: An iterable or async iterable of text
+        grade: The Braille grade (1 or 2)
+        executor: Executor for large inputs (default: the loop's default executor)
+        chunk_size: Characters translated between returns to the event loop
+        offload_threshold: Characters read before translation moves to the executor
+
+    Returns:
+        An async iterator over pieces of Braille
+    """
+    return _translate_chunks(chunks, grade, False, executor, chunk_size, offload_threshold)
+
+def aiter_text(chunks: Union[Iterable[str], AsyncIterable[str]], grade: int = 2, *,
+               executor: Optional[Executor] = None, chunk_size: int = ASYNC_CHUNK_SIZE,
+               offload_threshold: int = OFFLOAD_THRESHOLD) -> AsyncIterator[str]:
+    """
+    Translate a stream of Braille chunks to text as they arrive.
+
+    Args:
+        chunks: An iterable or async iterable of Braille
+        grade: The Braille grade (1 or 2)
+        executor: Executor for large inputs (default: the loop's default executor)
+        chunk_size: Characters translated between returns to the event loop
+        offload_threshold: Characters read before translation moves to the executor
+
+    Returns:
+        An async iterator over pieces of text
+    """
+    return _translate_chunks(chunks, grade, True, executor, chunk_size, offload_threshold)
@@ -0,0 +1,156 @@
+"""
+Batch translation of directory trees.
+
+translate_tree() translates every file under an input directory into the
+same relative path under an output directory, using a pool of processes.
+Outputs that are already up to date are skipped, so an interrupted or
+repeated run only redoes the files that changed.
+"""
+
+import os
+import time
+from collections import namedtuple
+from typing import Iterator, List, Optional, Tuple
+
+from .parallel import DIRECTIONS
+from .translator import Translator, _default_translator
+
+BatchSummary = namedtuple('BatchSummary', ['files', 'skipped', 'failures', 'bytes', 'seconds'])
+
+# Characters translated per write, so no file's whole translation is held
+WRITE_BATCH_SIZE = 64 * 1024
+
+def _translate_file(task: Tuple[str, str, int, bool]) -> Tuple[int, Optional[str]]:
+    """Translate one file, returning the bytes read and any error message."""
+    source, target, grade, decode = task
+    try:
+        with open(source, 'rb') as f:
+            data = f.read()
+        # Same handling as the text-to-braille and braille-to-text commands
+        content = data.decode('utf-8').strip()
+        translator = _default_translator(grade)
+        translate = translator.iter_decode if decode else translator.iter_encode
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Write under a temporary name so an interrupted run never leaves a
+        # truncated output that looks up to date
+        partial = target + '.part'
+        try:
+            with open(partial, 'w', encoding='utf-8') as f:
+                f.writelines(translate(content, WRITE_BATCH_SIZE))
+            os.replace(partial, target)
+        except BaseException:
+            # Nor a half-written temporary file beside it
+            try:
+                os.unlink(partial)
+            except OSError:
+                pass
+            raise
+    except Exception as e:
+        return 0, str(e)
+    return len(data), None
+
+def _iter_files(input_dir: str, output_dir: str) -> Iterator[str]:
+    """Yield the relative paths of all files under input_dir, in sorted order."""
+    skip = os.path.abspath(output_dir)
+    for root, dirs, files in os.walk(input_dir):
+        # Never read back our own output when it lives inside the input tree
+        dirs[:] = sorted(d for d in dirs if os.path.abspath(os.path.join(root, d)) != skip)
+        for name in sorted(files):
+            yield os.path.relpath(os.path.join(root, name), input_dir)
+
+def _is_up_to_date(source: str, target: str) -> bool:
+    """Check whether target exists and is not older than source."""
+    try:
+        return os.stat(target).st_mtime_ns >= os.stat(source).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+def translate_tree(input_dir: str, output_dir: str, grade: int = 2,
+                   direction: str = 'text-to-braille', jobs: Optional[int] = None,
+                   force: bool = False) -> BatchSummary:
+    """
+    Translate every file in a directory tree, mirroring it in another directory.
+
+    Files are read and written as UTF-8. A file whose output is not older
+    than it is skipped unless force is set. A file that cannot be read,
+    decoded or written is recorded as a failure and the rest carry on.
+
+    Args:
+        input_dir: The directory to read files from
+        output_dir: The directory to write translations to
+        grade: The Braille grade (1 or 2)
+        direction: 'text-to-braille' or 'braille-to-text'
+        jobs: Number of worker processes (default: number of CPUs); with 1
+            the files are translated in the current process
+        force: Translate all files even if their outputs are up to date
+
+    Returns:
+        A BatchSummary with the number of files translated and skipped, a
+        list of (path, error) failures, the bytes read and the elapsed time
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError(f"Direction must be one of: {', '.join(DIRECTIONS)}")
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    if not os.path.isdir(input_dir):
+        raise NotADirectoryError(f'Not a directory: {input_dir}')
+    # Validate the grade before starting any processes
+    Translator(grade)
+    decode = direction == 'braille-to-text'
+
+    start = time.perf_counter()
+    tasks = []
+    skipped = 0
+    for path in _iter_files(input_dir, output_dir):
+        source = os.path.join(input_dir, path)
+        target = os.path.join(output_dir, path)
+        if not force and _is_up_to_date(source, target):
+            skipped += 1
+            continue
+        tasks.append((source, target, grade, decode))
+
+    if jobs == 1 or len(tasks) < 2:
+        results: Iterator[Tuple[int, Optional[str]]] = map(_translate_file, tasks)
+        executor = None
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(tasks)))
+        # Send several small files to a worker at a time to cut IPC overhead
+        chunksize = max(1, min(64, len(tasks) // (jobs * 4)))
+        results = executor.map(_translate_file, tasks, chunksize=chunksize)
+
+    translated = 0
+    total = 0
+    failures: List[Tuple[str, str]] = []
+    try:
+        for (source, _, _, _), (size, error) in zip(tasks, results):
+            if error is None:
+                translated += 1
+                total += size
+            else:
+                failures.append((source, error))
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    return BatchSummary(translated, skipped, failures, total, time.perf_counter() - start)
+
+def format_summary(summary: BatchSummary) -> str:
+    """
+    Describe a batch run in one line with its throughput.
+
+    Args:
+        summary: The result of translate_tree
+
+    Returns:
+        A line such as "Translated 120 files (3 skipped, 0 failed) in 1.20s:
+        100.0 files/s, 2.50 MB/s"
+    """
+    seconds = max(summary.seconds, 1e-9)
+    return (f'Translated {summary.files} files ({summary.skipped} skipped, '
+            f'{len(summary.failures)} failed) in {summary.seconds:.2f}s: '
+            f'{summary.files / seconds:.1f} files/s, '
+            f'{summary.bytes / seconds / 1e6:.2f} MB/s')
@@ -0,0 +1,264 @@
+"""
+Benchmarks for text_to_braille and braille_to_text.
+
+Every benchmark times one corpus in one direction and grade, and reports
+throughput in characters per second, per-call latency percentiles and the
+peak memory allocated during a pass (measured separately under tracemalloc,
+which would otherwise slow the timed runs). Results can be saved as JSON and
+compared with a baseline to catch regressions:
+
+    b2a bench --output baseline.json
+    b2a bench --baseline baseline.json
+"""
+
+import json
+import math
+import platform
+import random
+import time
+import tracemalloc
+from collections import namedtuple
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Sequence
+
+from . import __version__
+from .parallel import DIRECTIONS
+from .translator import CONTRACTIONS, text_to_braille, braille_to_text
+
+# Corpus name -> (number of items, approximate characters per item)
+CORPUS_SIZES = {
+    'labels': (2000, 20),
+    'paragraphs': (200, 600),
+    'book': (1, 2_000_000),
+}
+
+# Common words mixed with every contraction, so that all code paths are hit
+CORPUS_WORDS = sorted(set(CONTRACTIONS) | {
+    'braille', 'reading', 'book', 'page', 'line', 'letter', 'number', 'sing',
+    'bring', 'thing', 'people', 'children', 'teacher', 'school', 'city',
+    'morning', 'evening', 'quickly', 'yesterday', 'question', 'answer',
+})
+_PUNCTUATION = (',', '.', ';', ':', '!', '?')
+
+Benchmark = namedtuple('Benchmark', ['corpus', 'grade', 'direction', 'items'])
+
+def _sentence(rng: random.Random) -> str:
+    """Generate one sentence of words, capitals, numbers and punctuation."""
+    words = []
+    for i in range(rng.randint(4, 14)):
+        roll = rng.random()
+        if roll < 0.05:
+            words.append(str(rng.randint(0, 99999)))
+            continue
+        word = rng.choice(CORPUS_WORDS)
+        if i == 0 or roll < 0.12:
+            word = word.capitalize()
+        elif roll < 0.15:
+            word = word.upper()
+        if roll > 0.9:
+            word += rng.choice(_PUNCTUATION)
+        words.append(word)
+    return ' '.join(words) + rng.choice('..!?')
+
+def generate_corpus(name: str, scale: float = 1.0, seed: int = 0) -> List[str]:
+    """
+    Generate a deterministic corpus of English-like text.
+
+    Args:
+        name: One of the CORPUS_SIZES names
+        scale: Factor applied to the number and length of the items
+        seed: Seed for the random generator
+
+    Returns:
+        The list of strings to translate
+    """
+    if name not in CORPUS_SIZES:
+        raise ValueError(f"Corpus must be one of: {', '.join(CORPUS_SIZES)}")
+    count, length = CORPUS_SIZES[name]
+    count = max(1, int(count * scale))
+    length = max(1, int(length * scale))
+    rng = random.Random(f'{name}:{seed}')
+    items = []
+    for _ in range(count):
+        if name == 'labels':
+            items.append(' '.join(rng.choice(CORPUS_WORDS).capitalize()
+                                  for _ in range(rng.randint(1, 3))))
+            continue
+        parts = []
+        size = 0
+        while size < length:
+            part = _sentence(rng)
+            # Books come in paragraphs
+            if name == 'book' and rng.random() < 0.1:
+                part += '\n'
+            parts.append(part)
+            size += len(part) + 1
+        items.append(' '.join(parts))
+    return items
+
+def load_corpus(path: str) -> List[str]:
+    """Load a UTF-8 text file as a single-item corpus."""
+    with open(path, encoding='utf-8') as f:
+        return [f.read()]
+
+def _percentile(values: Sequence[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of sorted values."""
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+def run_benchmark(benchmark: Benchmark, min_time: float = 0.5) -> Dict:
+    """
+    Time one benchmark and measure its peak memory.
+
+    The corpus is translated at least once and then repeatedly until
+    min_time seconds have passed.
+
+    Args:
+        benchmark: The corpus, grade and direction to run
+        min_time: Minimum number of seconds to spend timing
+
+    Returns:
+        A dictionary of results, as stored in the JSON report
+    """
+    grade = benchmark.grade
+    items = benchmark.items
+    translate: Callable[..., str]
+    if benchmark.direction == 'braille-to-text':
+        items = [text_to_braille(item, grade=grade) for item in items]
+        translate = braille_to_text
+    else:
+        translate = text_to_braille
+    chars = sum(len(item) for item in items)
+
+    # Warm up the tables and caches
+    translate(items[0], grade=grade)
+
+    latencies = []
+    passes = 0
+    clock = time.perf_counter
+    start = clock()
+    while True:
+        for item in items:
+            call_start = clock()
+            translate(item, grade=grade)
+            latencies.append(clock() - call_start)
+        passes += 1
+        elapsed = clock() - start
+        if elapsed >= min_time:
+            break
+    seconds = sum(latencies)
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        for item in items:
+            translate(item, grade=grade)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'corpus': benchmark.corpus,
+        'grade': grade,
+        'direction': benchmark.direction,
+        'calls': len(latencies),
+        'chars': chars * passes,
+        'seconds': round(seconds, 6),
+        'chars_per_sec': round(chars * passes / seconds if seconds else 0.0, 1),
+        'latency_us': {
+            'p50': round(_percentile(latencies, 0.50) * 1e6, 2),
+            'p90': round(_percentile(latencies, 0.90) * 1e6, 2),
+            'p99': round(_percentile(latencies, 0.99) * 1e6, 2),
+            'max': round(latencies[-1] * 1e6, 2),
+        },
+        'peak_memory_bytes': peak,
+    }
+
+def run_benchmarks(corpora: Optional[Sequence[str]] = None, grades: Sequence[int] = (1, 2),
+                   directions: Sequence[str] = DIRECTIONS, scale: float = 1.0,
+                   min_time: float = 0.5, files: Sequence[str] = ()) -> Dict:
+    """
+    Run the benchmark suite.
+
+    Args:
+        corpora: Names of generated corpora to run (default: all of them,
+            or none if files are given)
+        grades: Braille grades to run
+        directions: Translation directions to run
+        scale: Size factor for the generated corpora
+        min_time: Minimum number of seconds to time each benchmark
+        files: Paths of text files to use as extra corpora
+
+    Returns:
+        The JSON report, with environment details and a list of results
+    """
+    if corpora is None:
+        corpora = () if files else tuple(CORPUS_SIZES)
+    named = {name: generate_corpus(name, scale) for name in corpora}
+    for path in files:
+        named[path] = load_corpus(path)
+
+    results = []
+    for name, items in named.items():
+        for grade in grades:
+            for direction in directions:
+                results.append(run_benchmark(Benchmark(name, grade, direction, items), min_time))
+    return {
+        'b2a_version': __version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+def compare(report: Dict, baseline: Dict, tolerance: float = 0.1) -> List[str]:
+    """
+    Find benchmarks that got slower or use more memory than in a baseline.
+
+    Args:
+        report: The report of the current run
+        baseline: A report saved from an earlier run
+        tolerance: Allowed relative change before a result counts as a regression
+
+    Returns:
+        One message per regression; empty if there are none
+    """
+    key = itemgetter('corpus', 'grade', 'direction')
+    previous = {key(result): result for result in baseline.get('results', [])}
+    regressions = []
+    for result in report['results']:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        name = '{} grade {} {}'.format(*key(result))
+        speed, old_speed = result['chars_per_sec'], old['chars_per_sec']
+        if old_speed and speed < old_speed * (1 - tolerance):
+            regressions.append(f'{name}: {speed:,.0f} chars/s, was {old_speed:,.0f} '
+                               f'({speed / old_speed - 1:+.1%})')
+        memory, old_memory = result['peak_memory_bytes'], old['peak_memory_bytes']
+        if old_memory and memory > old_memory * (1 + tolerance):
+            regressions.append(f'{name}: peak memory {memory:,} bytes, was {old_memory:,} '
+                               f'({memory / old_memory - 1:+.1%})')
+    return regressions
+
+def format_report(report: Dict) -> str:
+    """Format a report as a table for the terminal."""
+    lines = [f"{'corpus':<12} {'grade':>5} {'direction':<16} {'chars/s':>13} "
+             f"{'p50 us':>10} {'p99 us':>10} {'peak KiB':>10}"]
+    for result in report['results']:
+        latency = result['latency_us']
+        lines.append(f"{result['corpus']:<12} {result['grade']:>5} {result['direction']:<16} "
+                     f"{result['chars_per_sec']:>13,.0f} {latency['p50']:>10,.1f} "
+                     f"{latency['p99']:>10,.1f} {result['peak_memory_bytes'] / 1024:>10,.1f}")
+    return '\n'.join(lines)
+
+def load_report(path: str) -> Dict:
+    """Load a JSON report saved with --output."""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_report(report: Dict, path: str) -> None:
+    """Save a report as JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+        f.write('\n')
@@ -0,0 +1,190 @@
+"""
+BRF (North American ASCII Braille) encoding.
+
+BRF files store each six-dot cell as one printable ASCII character, as
+defined by the North American Braille Computer Code. Line breaks and form
+feeds are kept as they are; tabs and other whitespace that translation
+passes through become blank cells. This module converts between BRF bytes and
+Unicode Braille with 256-entry ``bytes.translate`` tables, so whole buffers
+are converted in C with no per-cell Python work:
+
+    >>> braille_to_brf('⠓⠑⠇⠇⠕ ⠺⠕⠗⠇⠙')
+    b'HELLO WORLD'
+    >>> brf_to_braille(b'hello world')
+    '⠓⠑⠇⠇⠕ ⠺⠕⠗⠇⠙'
+
+BRF is written in upper case; lower-case letters and symbols are accepted
+when reading. BRF has one character per cell, so a BRF stream can be cut
+into chunks anywhere and each chunk converted on its own.
+"""
+
+from typing import BinaryIO, Iterable, NoReturn, Optional, Union
+
+FORMATS = ('unicode', 'brf')
+
+# The BRF character of each six-dot mask, from 0 (blank) to 63 (all dots)
+NABCC = ' A1B\'K2L@CIF/MSP"E3H9O6R^DJG>NTQ,*5<-U8V.%[$+X!&;:4\\0Z7(_?W]#Y)='
+
+# Characters that are the same in BRF and Unicode Braille text
+_CONTROLS = '\n\r\f'
+
+# Other characters that str.isspace() accepts, written as the blank cell
+_BLANKS = dict.fromkeys(map(ord, (
+    '\t\x0b\x1c\x1d\x1e\x1f\x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005'
+    '\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000'
+)), ' ')
+
+# Unicode Braille is converted to BRF through UTF-16-LE, where each cell is
+# its mask followed by 0x28. Spaces become the blank cell and line breaks
+# borrow eight-dot masks, which BRF cannot represent anyway, so every
+# character ends up as one mask.
+_CELL_HIGH_BYTE = 0x28
+_PLACEHOLDERS = [(char, chr(0x28f0 + i)) for i, char in enumerate(_CONTROLS)]
+_VALID_MASKS = bytes(range(64)) + bytes(ord(p) & 0xff for _, p in _PLACEHOLDERS)
+
+def _build_encode_table() -> bytes:
+    table = bytearray(256)
+    for mask, char in enumerate(NABCC):
+        table[mask] = ord(char)
+    for char, placeholder in _PLACEHOLDERS:
+        table[ord(placeholder) & 0xff] = ord(char)
+    return bytes(table)
+
+# BRF is converted back by translating each byte twice: once to the low
+# byte and once to the high byte of its UTF-16-LE character. Bytes that are
+# not BRF get a lone surrogate, so decoding fails at their position.
+_INVALID_HIGH_BYTE = 0xd8
+
+def _build_decode_tables():
+    low = bytearray(256)
+    high = bytearray([_INVALID_HIGH_BYTE]) * 256
+    for mask, char in enumerate(NABCC):
+        for byte in {ord(char), ord(char.lower())}:
+            low[byte] = mask
+            high[byte] = _CELL_HIGH_BYTE
+    # Lower case for the symbols that come after the letters
+    for char in '@[\\]^':
+        low[ord(char) + 0x20] = low[ord(char)]
+        high[ord(char) + 0x20] = _CELL_HIGH_BYTE
+    for char in ' ' + _CONTROLS:
+        low[ord(char)] = ord(char)
+        high[ord(char)] = 0
+    return bytes(low), bytes(high)
+
+_ENCODE_TABLE = _build_encode_table()
+_DECODE_LOW, _DECODE_HIGH = _build_decode_tables()
+
+def _raise_unrepresentable(braille: str) -> NoReturn:
+    """Raise a ValueError for the first character of braille with no BRF form."""
+    for position, char in enumerate(braille):
+        if not ('⠀' <= char <= '⠿' or char == ' ' or char in _CONTROLS):
+            raise ValueError(f'Not representable in BRF: {char!r} at position {position}')
+    raise ValueError('Not representable in BRF')
+
+def _to_masks(braille: str) -> Optional[bytes]:
+    """Return the six-dot mask of each character, or None if one has none."""
+    for _, placeholder in _PLACEHOLDERS:
+        if placeholder in braille:
+            return None
+    if ' ' in braille:
+        braille = braille.replace(' ', '⠀')
+    for char, placeholder in _PLACEHOLDERS:
+        if char in braille:
+            braille = braille.replace(char, placeholder)
+
+    data = braille.encode('utf-16-le', 'surrogatepass')
+    masks = data[0::2]
+    if data[1::2].translate(None, bytes((_CELL_HIGH_BYTE,))) or masks.translate(None, _VALID_MASKS):
+        return None
+    return masks
+
+def braille_to_brf(braille: str) -> bytes:
+    """
+    Convert Unicode Braille to BRF.
+
+    Args:
+        braille: Six-dot Braille cells, whitespace and line breaks
+
+    Returns:
+        The BRF bytes
+
+    Raises:
+        ValueError: If braille contains a character BRF cannot represent
+    """
+    if not isinstance(braille, str):
+        raise TypeError("Input must be a string")
+    masks = _to_masks(braille)
+    if masks is None:
+        # Tabs and other whitespace are rare, so they are only replaced
+        # once the fast conversion has failed
+        braille = braille.translate(_BLANKS)
+        masks = _to_masks(braille)
+        if masks is None:
+            _raise_unrepresentable(braille)
+    return masks.translate(_ENCODE_TABLE)
+
+def brf_to_braille(data: Union[bytes, bytearray, str]) -> str:
+    """
+    Convert BRF to Unicode Braille.
+
+    Args:
+        data: BRF bytes, or a string of BRF characters
+
+    Returns:
+        The Unicode Braille, with spaces and line breaks kept
+
+    Raises:
+        ValueError: If data contains a byte that is not BRF
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    elif not isinstance(data, (bytes, bytearray)):
+        data = bytes(data)
+    buffer = bytearray(len(data) * 2)
+    buffer[0::2] = data.translate(_DECODE_LOW)
+    buffer[1::2] = data.translate(_DECODE_HIGH)
+    try:
+        return buffer.decode('utf-16-le')
+    except UnicodeDecodeError as e:
+        position = e.start // 2
+        raise ValueError(f'Not a BRF character: {data[position:position + 1]!r} '
+                         f'at position {position}') from None
+
+class BRFReader:
+    """
+    Read a binary BRF stream as Unicode Braille.
+
+    Each read() converts exactly the bytes read, so files of any size are
+    processed in chunks without decoding them as text first.
+
+    Args:
+        stream: A binary stream of BRF, such as open(path, 'rb')
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+
+    def read(self, size: int = -1) -> str:
+        return brf_to_braille(self.stream.read(size))
+
+class BRFWriter:
+    """
+    Write Unicode Braille to a binary stream as BRF.
+
+    Args:
+        stream: A binary stream, such as open(path, 'wb')
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+
+    def write(self, braille: str) -> int:
+        self.stream.write(braille_to_brf(braille))
+        return len(braille)
+
+    def writelines(self, lines: Iterable[str]) -> None:
+        for braille in lines:
+            self.write(braille)
+
+    def flush(self) -> None:
+        self.stream.flush()
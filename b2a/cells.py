@@ -0,0 +1,126 @@
+"""
+Braille cells as dot masks.
+
+Each Unicode Braille character U+2800-U+28FF encodes its raised dots in the
+low byte of its codepoint: dot 1 is bit 0 through dot 8 as bit 7. This
+module converts Braille strings to and from contiguous buffers of those
+masks, one byte per cell, for drivers and storage that want raw cells
+rather than Python strings:
+
+    >>> to_dots('⠓⠊ ⠁')
+    bytearray(b'\\x13\\n\\x00\\x01')
+    >>> from_dots(b'\\x13\\n\\x00\\x01')
+    '⠓⠊ ⠁'
+
+Spaces are stored as the blank cell (mask 0). Conversion is done in C by
+the UTF-16 codec and byte slicing: in UTF-16-LE every cell is two bytes,
+its mask followed by 0x28.
+"""
+
+from array import array
+from typing import Optional, Union
+
+from .translator import text_to_braille, braille_to_text
+
+BRAILLE_BASE = 0x2800
+BLANK_CELL = chr(BRAILLE_BASE)
+
+# High byte of every Braille cell in UTF-16-LE
+_CELL_HIGH_BYTE = BRAILLE_BASE >> 8
+
+BytesLike = Union[bytes, bytearray, memoryview, array]
+
+def _encode(braille: str) -> bytes:
+    """Convert Braille to mask bytes, with spaces as blank cells."""
+    if not isinstance(braille, str):
+        raise TypeError("Input must be a string")
+    if ' ' in braille:
+        braille = braille.replace(' ', BLANK_CELL)
+    data = braille.encode('utf-16-le', 'surrogatepass')
+    # Anything but a cell has another high byte, or takes two code units
+    if data[1::2].translate(None, bytes((_CELL_HIGH_BYTE,))):
+        for position, char in enumerate(braille):
+            if not BLANK_CELL <= char <= '\u28ff':
+                raise ValueError(f'Not a Braille cell: {char!r} at position {position}')
+    return data[0::2]
+
+def to_dots(braille: str) -> bytearray:
+    """
+    Convert Braille to a buffer of dot masks.
+
+    Args:
+        braille: Braille cells and spaces
+
+    Returns:
+        One mask per cell, with spaces as 0
+
+    Raises:
+        ValueError: If braille contains anything other than cells and spaces
+    """
+    return bytearray(_encode(braille))
+
+def to_dots_array(braille: str) -> array:
+    """
+    Convert Braille to an array('B') of dot masks.
+
+    Args:
+        braille: Braille cells and spaces
+
+    Returns:
+        One mask per cell, with spaces as 0
+    """
+    masks = array('B')
+    masks.frombytes(_encode(braille))
+    return masks
+
+def from_dots(masks: BytesLike, blank: Optional[str] = ' ') -> str:
+    """
+    Convert a buffer of dot masks to Braille.
+
+    Args:
+        masks: Any bytes-like object of masks, such as bytes, bytearray,
+            memoryview or array('B'); it is read without copying
+        blank: Character for blank cells (default: a space, as used by the
+            translator); None keeps them as U+2800
+
+    Returns:
+        The Braille string
+    """
+    masks = memoryview(masks).cast('B')
+    data = bytearray(len(masks) * 2)
+    data[0::2] = masks
+    data[1::2] = bytes((_CELL_HIGH_BYTE,)) * len(masks)
+    braille = data.decode('utf-16-le')
+    if blank is not None and blank != BLANK_CELL:
+        braille = braille.replace(BLANK_CELL, blank)
+    return braille
+
+def text_to_dots(text: str, grade: int = 2) -> bytearray:
+    """
+    Convert text to Braille as a buffer of dot masks.
+
+    Args:
+        text: The text to convert; it should translate to cells and spaces
+            only, so translate line by line to keep line breaks
+        grade: The Braille grade (1 or 2)
+
+    Returns:
+        One mask per cell, with spaces as 0
+
+    Raises:
+        ValueError: If the translation contains characters with no Braille cell
+    """
+    return to_dots(text_to_braille(text, grade))
+
+def dots_to_text(masks: BytesLike, grade: int = 2) -> str:
+    """
+    Convert a buffer of dot masks to text.
+
+    Args:
+        masks: Any bytes-like object of masks, with 0 for spaces
+        grade: The Braille grade (1 or 2)
+
+    Returns:
+        The text representation of the Braille
+    """
+    return braille_to_text(from_dots(masks), grade)
@@ -2,17 +2,37 @@
 Command-line interface for the B2A Braille translator.
 """
 
-import argparse
+import os
 import sys
-from pathlib import Path
-from typing import Optional, TextIO
+from typing import (
+    TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, TextIO, Union, cast, overload,
+)
 
-from b2a import __version__, text_to_braille, braille_to_text
+from b2a import __version__
 
-def read_from_file_or_stdin(file_path: Optional[str] = None) -> str:
-    """Read input from file or standard input."""
+if TYPE_CHECKING:
+    import argparse
+    from typing import Literal
+    from b2a.formatter import PageFormatter
+
+# Characters read per chunk in --stream mode
+STREAM_CHUNK_SIZE = 64 * 1024
+
+@overload
+def read_from_file_or_stdin(file_path: Optional[str] = None,
+                            binary: 'Literal[False]' = False) -> str: ...
+
+@overload
+def read_from_file_or_stdin(file_path: Optional[str], binary: bool) -> Union[str, bytes]: ...
+
+def read_from_file_or_stdin(file_path: Optional[str] = None,
+                            binary: bool = False) -> Union[str, bytes]:
+    """Read input from file or standard input, as bytes if binary is set."""
     if file_path:
         try:
+            if binary:
+                with open(file_path, 'rb') as f:
+                    return f.read().strip()
             with open(file_path, 'r', encoding='utf-8') as f:
                 return f.read().strip()
         except FileNotFoundError:
@@ -21,115 +41,654 @@ def read_from_file_or_stdin(file_path: Optional[str] = None) -> str:
         except Exception as e:
             print(f'Error reading file: {e}', file=sys.stderr)
             sys.exit(1)
+    elif binary:
+        return sys.stdin.buffer.read().strip()
     else:
         return sys.stdin.read().strip()
 
-def write_to_file_or_stdout(content: str, file_path: Optional[str] = None) -> None:
-    """Write content to file or standard output."""
+def write_to_file_or_stdout(content: Union[str, bytes], file_path: Optional[str] = None) -> None:
+    """Write text or bytes to file or standard output."""
     if file_path:
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            if isinstance(content, bytes):
+                with open(file_path, 'wb') as f:
+                    f.write(content)
+            else:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
         except Exception as e:
             print(f'Error writing to file: {e}', file=sys.stderr)
             sys.exit(1)
+    elif isinstance(content, bytes):
+        sys.stdout.flush()
+        sys.stdout.buffer.write(content + b'\n')
+        sys.stdout.buffer.flush()
     else:
         print(content)
 
-def main() -> None:
-    """Run the B2A command-line interface."""
-    parser = argparse.ArgumentParser(
-        description='B2A - A tool for translating between text and Braille.',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog='''Examples:
+def iter_stream_pieces(stream: TextIO, boundary: Callable[[str], int],
+                       chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Read a stream in chunks and yield pieces that end at safe boundaries.
+    
+    Leading and trailing whitespace of the whole input is dropped, as in
+    non-streaming mode. Memory stays bounded by the chunk size plus the
+    longest run of input without a boundary: a word in text, and in
+    Braille a line unless a capital indicator carries across its end.
+    
+    Args:
+        stream: The text stream to read
+        boundary: Translator.stream_boundary() for the input
+        chunk_size: Number of characters to read at a time
+        
+    Returns:
+        An iterator over pieces that can be translated independently
+    """
+    pending = ''
+    # The last piece is held back until more text follows it, so the
+    # whitespace at the end of the input can still be dropped
+    previous = ''
+    started = False
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        if not started:
+            data = data.lstrip()
+            started = bool(data)
+        pending += data
+        cut = boundary(pending)
+        if cut:
+            piece = pending[:cut]
+            pending = pending[cut:]
+            if piece.isspace():
+                previous += piece
+            else:
+                if previous:
+                    yield previous
+                previous = piece
+    pending = (previous + pending).rstrip()
+    if pending:
+        yield pending
+
+def stream_file_or_stdin(translate: Callable[[Iterable[str]], Iterable[str]],
+                         boundary: Callable[[str], int],
+                         input_path: Optional[str] = None,
+                         output_path: Optional[str] = None,
+                         chunk_size: int = STREAM_CHUNK_SIZE,
+                         brf_input: bool = False, brf_output: bool = False,
+                         formatter: Optional['PageFormatter'] = None) -> None:
+    """
+    Translate input to output piece by piece, writing as it goes.
+    
+    translate takes an iterable of input pieces and yields translated
+    pieces, like iter_braille() and iter_text().
+    """
+    try:
+        if brf_input:
+            source = open(input_path, 'rb') if input_path else sys.stdin.buffer
+        else:
+            source = open(input_path, 'r', encoding='utf-8') if input_path else sys.stdin
+    except FileNotFoundError:
+        print(f'Error: File not found: {input_path}', file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f'Error reading file: {e}', file=sys.stderr)
+        sys.exit(1)
+    
+    try:
+        if brf_output:
+            sys.stdout.flush()
+            target = open(output_path, 'wb') if output_path else sys.stdout.buffer
+        else:
+            target = open(output_path, 'w', encoding='utf-8') if output_path else sys.stdout
+    except Exception as e:
+        print(f'Error writing to file: {e}', file=sys.stderr)
+        sys.exit(1)
+    
+    # BRF is converted to and from Unicode Braille chunk by chunk, by a
+    # reader and writer that stand in for the text streams
+    if brf_input or brf_output:
+        from b2a.brf import BRFReader, BRFWriter
+    reader = cast(TextIO, BRFReader(source) if brf_input else source)
+    writer = cast(TextIO, BRFWriter(target) if brf_output else target)
+    try:
+        translated = translate(iter_stream_pieces(reader, boundary, chunk_size))
+        if formatter:
+            writer.writelines(map(formatter.feed, translated))
+            writer.write(formatter.feed('', final=True))
+            writer.flush()
+        else:
+            writer.writelines(translated)
+            if not output_path:
+                writer.write('\n')
+                writer.flush()
+    finally:
+        if input_path:
+            source.close()
+        if output_path:
+            target.close()
+
+def filter_records(translate: Callable[[str], str], delimiter: bytes = b'\n',
+                   input_path: Optional[str] = None, output_path: Optional[str] = None,
+                   chunk_size: int = STREAM_CHUNK_SIZE,
+                   brf_input: bool = False, brf_output: bool = False) -> None:
+    """
+    Translate delimited records as soon as they arrive.
+    
+    Each record is translated on its own, with its delimiter kept. Every read
+    returns whatever input is available, and all complete records in it are
+    written in one write and flushed, so a burst of lines costs one write
+    while a single line is still passed on at once. A final record without a
+    delimiter is translated at the end of the input.
+    """
+    try:
+        source = open(input_path, 'rb') if input_path else sys.stdin.buffer
+    except FileNotFoundError:
+        print(f'Error: File not found: {input_path}', file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f'Error reading file: {e}', file=sys.stderr)
+        sys.exit(1)
+    
+    try:
+        sys.stdout.flush()
+        target = open(output_path, 'wb') if output_path else sys.stdout.buffer
+    except Exception as e:
+        print(f'Error writing to file: {e}', file=sys.stderr)
+        sys.exit(1)
+    
+    decode: Callable[[bytes], str] = bytes.decode
+    encode: Callable[[str], bytes] = str.encode
+    if brf_input or brf_output:
+        from b2a.brf import braille_to_brf, brf_to_braille
+        decode = brf_to_braille if brf_input else decode
+        encode = braille_to_brf if brf_output else encode
+    
+    def translate_records(data: bytes) -> bytes:
+        return delimiter.join([encode(translate(decode(record)))
+                               for record in data.split(delimiter)])
+    
+    # Reads return as soon as any input is available, instead of filling
+    # the whole chunk
+    read = getattr(source, 'read1', source.read)
+    partial = []
+    try:
+        while True:
+            data = read(chunk_size)
+            if not data:
+                break
+            cut = data.rfind(delimiter) + 1
+            if not cut:
+                partial.append(data)
+                continue
+            partial.append(data[:cut - 1])
+            target.write(translate_records(b''.join(partial)) + delimiter)
+            target.flush()
+            partial = [data[cut:]]
+        rest = b''.join(partial)
+        if rest:
+            target.write(translate_records(rest))
+            target.flush()
+    finally:
+        if input_path:
+            source.close()
+        if output_path:
+            target.close()
+
+EPILOG = '''Examples:
   # Convert text to Braille
   b2a text-to-braille "Hello, World!"
   echo "Hello, World!" | b2a text-to-braille
   b2a text-to-braille -i input.txt -o output.brl
+  b2a text-to-braille --stream -i book.txt -o book.brl
+  b2a text-to-braille --format brf -i book.txt -o book.brf
+  b2a text-to-braille --cells-per-line 40 --format brf -i book.txt -o book.brf
+  tail -f app.log | b2a text-to-braille --line-buffered
   
   # Convert Braille to text
   b2a braille-to-text "⠓⠑⠇⠇⠕ ⠺⠕⠗⠇⠙⠖"
   echo "⠓⠑⠇⠇⠕ ⠺⠕⠗⠇⠇⠙⠖" | b2a braille-to-text
   b2a braille-to-text -i input.brl -o output.txt
   
+  # Translate a document that mixes text and Braille
+  b2a auto -i notes.txt -o notes.out
+  
+  # Translate a directory tree on 8 processes
+  b2a batch books/ braille/ --jobs 8
+  
+  # Run a translation server
+  b2a serve --port 8000
+  
+  # Benchmark and compare with a saved baseline
+  b2a bench --output baseline.json
+  b2a bench --baseline baseline.json
+  
+  # Check every engine against the reference translator
+  b2a difftest --cases 5000 --jobs 8
+  
+  # Profile a translation
+  b2a --profile run text-to-braille -i book.txt -o book.brl
+  
   # Interactive mode
   b2a interactive
 '''
+
+def add_record_arguments(parser: 'argparse.ArgumentParser') -> None:
+    """Add the options that translate input line by line as it arrives."""
+    parser.add_argument('--line-buffered', action='store_true',
+                        help='Translate and write each line as soon as it is read')
+    parser.add_argument('-0', '--null', action='store_true',
+                        help='Like --line-buffered, for records ending with NUL instead of '
+                             'a newline')
+
+def add_text_to_braille_arguments(parser: 'argparse.ArgumentParser') -> None:
+    """Add the arguments of the text-to-braille command."""
+    from b2a.brf import FORMATS
+    from b2a.formatter import LINES_PER_PAGE
+    parser.add_argument('text', nargs='?', help='Text to convert to Braille')
+    parser.add_argument('-i', '--input', help='Input file (default: stdin)')
+    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    parser.add_argument('--grade', type=int, choices=[1, 2], default=2,
+                        help='Braille grade (1 or 2, default: 2)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Translate input in chunks with bounded memory')
+    add_record_arguments(parser)
+    parser.add_argument('--format', choices=FORMATS, default='unicode',
+                        help='Output Unicode Braille or BRF (ASCII Braille, default: unicode)')
+    parser.add_argument('--cells-per-line', type=int, metavar='N',
+                        help='Wrap and paginate the output for embossing, with at most N '
+                             'cells per line')
+    parser.add_argument('--lines-per-page', type=int, default=LINES_PER_PAGE, metavar='N',
+                        help=f'Lines per page with --cells-per-line, or 0 to wrap lines only '
+                             f'(default: {LINES_PER_PAGE})')
+    parser.add_argument('--no-page-numbers', action='store_true',
+                        help='Leave out page numbers with --cells-per-line')
+
+def add_braille_to_text_arguments(parser: 'argparse.ArgumentParser') -> None:
+    """Add the arguments of the braille-to-text command."""
+    from b2a.brf import FORMATS
+    parser.add_argument('braille', nargs='?', help='Braille to convert to text')
+    parser.add_argument('-i', '--input', help='Input file (default: stdin)')
+    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    parser.add_argument('--grade', type=int, choices=[1, 2], default=2,
+                        help='Braille grade (1 or 2, default: 2)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Translate input in chunks with bounded memory')
+    add_record_arguments(parser)
+    parser.add_argument('--format', choices=FORMATS, default='unicode',
+                        help='Input is Unicode Braille or BRF (ASCII Braille, default: unicode)')
+
+def add_auto_arguments(parser: 'argparse.ArgumentParser') -> None:
+    """Add the arguments of the auto command."""
+    parser.add_argument('text', nargs='?', help='Mixed text and Braille to translate')
+    parser.add_argument('-i', '--input', help='Input file (default: stdin)')
+    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    parser.add_argument('--grade', type=int, choices=[1, 2], default=2,
+                        help='Braille grade (1 or 2, default: 2)')
+
+def add_batch_arguments(parser: 'argparse.ArgumentParser') -> None:
+    """Add the arguments of the batch command."""
+    from b2a.parallel import DIRECTIONS
+    parser.add_argument('input_dir', help='Directory of files to translate')
+    parser.add_argument('output_dir', help='Directory to write translations to')
+    parser.add_argument('--direction', choices=DIRECTIONS, default='text-to-braille',
+                        help='Translation direction (default: text-to-braille)')
+    parser.add_argument('--grade', type=int, choices=[1, 2], default=2,
+                        help='Braille grade (1 or 2, default: 2)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Number of worker processes (default: number of CPUs)')
+    parser.add_argument('--force', action='store_true',
+                        help='Translate all files, even if their outputs are up to date')
+
+def add_serve_arguments(parser: 'argparse.ArgumentParser') -> None:
+    """Add the arguments of the serve command."""
+    from b2a.server import DEFAULT_HOST, DEFAULT_PORT
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help=f'Address to listen on (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Log every request to standard error')
+
+def add_bench_arguments(parser: 'argparse.ArgumentParser') -> None:
+    """Add the arguments of the bench command."""
+    from b2a.bench import CORPUS_SIZES
+    from b2a.parallel import DIRECTIONS
+    parser.add_argument('--corpus', action='append', choices=list(CORPUS_SIZES),
+                        help='Generated corpus to run (repeatable, default: all)')
+    parser.add_argument('--file', action='append', default=[],
+                        help='Text file to use as a corpus (repeatable)')
+    parser.add_argument('--grade', type=int, action='append', choices=[1, 2],
+                        help='Braille grade to run (repeatable, default: both)')
+    parser.add_argument('--direction', action='append', choices=DIRECTIONS,
+                        help='Direction to run (repeatable, default: both)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Size factor for generated corpora (default: 1.0)')
+    parser.add_argument('--min-time', type=float, default=0.5,
+                        help='Minimum seconds to time each benchmark (default: 0.5)')
+    parser.add_argument('-o', '--output', help='Write the results as JSON to this file')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='Relative slowdown allowed before failing (default: 0.1)')
+
+def add_difftest_arguments(parser: 'argparse.ArgumentParser') -> None:
+    """Add the arguments of the difftest command."""
+    from b2a.differential import ENGINES
+    from b2a.parallel import DIRECTIONS
+    parser.add_argument('--cases', type=int, default=1000,
+                        help='Random inputs per grade and direction (default: 1000)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed for generating inputs (default: 0)')
+    parser.add_argument('--engine', action='append', choices=list(ENGINES),
+                        help='Engine to check (repeatable, default: all)')
+    parser.add_argument('--file', action='append', default=[],
+                        help='Text file whose lines are added to the inputs (repeatable)')
+    parser.add_argument('--grade', type=int, action='append', choices=[1, 2],
+                        help='Braille grade to check (repeatable, default: both)')
+    parser.add_argument('--direction', action='append', choices=DIRECTIONS,
+                        help='Direction to check (repeatable, default: both)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Number of worker processes (default: number of CPUs)')
+    parser.add_argument('--limit', type=int, default=10,
+                        help='Mismatches to show per engine (default: 10)')
+
+def add_interactive_arguments(parser: 'argparse.ArgumentParser') -> None:
+    """Add the arguments of the interactive command."""
+    parser.add_argument('--grade', type=int, choices=[1, 2], default=2,
+                        help='Braille grade (1 or 2, default: 2)')
+
+# Command name -> (help, description, function adding its arguments)
+COMMANDS = {
+    'text-to-braille': (
+        'Convert text to Braille',
+        'Convert text to Braille (Grade 2 by default)',
+        add_text_to_braille_arguments,
+    ),
+    'braille-to-text': (
+        'Convert Braille to text',
+        'Convert Braille to text (supports Grade 1 and 2)',
+        add_braille_to_text_arguments,
+    ),
+    'auto': (
+        'Translate mixed text and Braille',
+        'Translate runs of Braille to text and runs of text to Braille, in one pass',
+        add_auto_arguments,
+    ),
+    'batch': (
+        'Translate all files in a directory tree',
+        'Translate every file under INPUT_DIR to the same path under OUTPUT_DIR, '
+        'skipping outputs that are up to date',
+        add_batch_arguments,
+    ),
+    'serve': (
+        'Run an HTTP translation server',
+        'Serve translations over HTTP with warm tables and keep-alive connections',
+        add_serve_arguments,
+    ),
+    'bench': (
+        'Benchmark translation speed and memory',
+        'Time text-to-braille and braille-to-text on generated or given corpora',
+        add_bench_arguments,
+    ),
+    'difftest': (
+        'Check translation engines against the reference',
+        'Translate generated inputs with every engine and the frozen reference '
+        'translator, and report minimized mismatches and relative throughput',
+        add_difftest_arguments,
+    ),
+    'interactive': (
+        'Start interactive mode',
+        'Interactive translation mode (type "exit" to quit)',
+        add_interactive_arguments,
+    ),
+}
+
+def build_parser(command: Optional[str] = None) -> 'argparse.ArgumentParser':
+    """
+    Build the argument parser.
+
+    Only the arguments of the given command are added, since adding them
+    imports the modules that command needs. With no command, the parser
+    only finds out which command was given.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog='b2a',
+        description='B2A - A tool for translating between text and Braille.',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=EPILOG
     )
     
     parser.add_argument('--version', action='version', version=f'B2A {__version__}')
+    parser.add_argument('--profile', metavar='PREFIX',
+                        help='Report translation statistics and write a cProfile dump to '
+                             'PREFIX.prof and a tracemalloc report to PREFIX.tracemalloc.txt')
+    parser.add_argument('--profile-top', type=int, default=20, metavar='N',
+                        help='Number of entries in the --profile reports (default: 20)')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Run the command in a warm background worker, started on first '
+                             'use (also enabled by setting B2A_DAEMON)')
     
     # Add subparsers for different commands
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
-    
-    # Text to Braille command
-    text_parser = subparsers.add_parser(
-        'text-to-braille',
-        help='Convert text to Braille',
-        description='Convert text to Braille (Grade 2 by default)'
-    )
-    text_parser.add_argument('text', nargs='?', help='Text to convert to Braille')
-    text_parser.add_argument('-i', '--input', help='Input file (default: stdin)')
-    text_parser.add_argument('-o', '--output', help='Output file (default: stdout)')
-    text_parser.add_argument('--grade', type=int, choices=[1, 2], default=2,
-                           help='Braille grade (1 or 2, default: 2)')
-    
-    # Braille to Text command
-    braille_parser = subparsers.add_parser(
-        'braille-to-text',
-        help='Convert Braille to text',
-        description='Convert Braille to text (supports Grade 1 and 2)'
-    )
-    braille_parser.add_argument('braille', nargs='?', help='Braille to convert to text')
-    braille_parser.add_argument('-i', '--input', help='Input file (default: stdin)')
-    braille_parser.add_argument('-o', '--output', help='Output file (default: stdout)')
-    braille_parser.add_argument('--grade', type=int, choices=[1, 2], default=2,
-                              help='Braille grade (1 or 2, default: 2)')
-    
-    # Interactive mode
-    interactive_parser = subparsers.add_parser(
-        'interactive',
-        help='Start interactive mode',
-        description='Interactive translation mode (type "exit" to quit)'
-    )
-    interactive_parser.add_argument('--grade', type=int, choices=[1, 2], default=2,
-                                  help='Braille grade (1 or 2, default: 2)')
-    
-    args = parser.parse_args()
+    for name, (help, description, add_arguments) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help, description=description,
+                                          add_help=name == command)
+        if name == command:
+            add_arguments(subparser)
+    return parser
+
+# Global options that take a value, skipped when looking for --daemon or the command
+_VALUE_OPTIONS = ('--profile', '--profile-top')
+
+def command_index(argv: List[str]) -> int:
+    """Return the position of the command in argv, after the global options before it."""
+    i = 0
+    while i < len(argv) and argv[i].startswith('-'):
+        i += 2 if argv[i] in _VALUE_OPTIONS else 1
+    return i
+
+def daemon_argv(argv: List[str]) -> Optional[List[str]]:
+    """
+    Decide whether a command line runs in the warm worker.
+
+    --daemon is looked for among the global options before the command, so
+    this needs no parser and imports nothing.
+
+    Returns:
+        The arguments without --daemon, or None to run locally
+    """
+    i = 0
+    while i < len(argv) and argv[i].startswith('-'):
+        if argv[i] == '--daemon':
+            return argv[:i] + argv[i + 1:]
+        i += 2 if argv[i] in _VALUE_OPTIONS else 1
+    return list(argv) if os.environ.get('B2A_DAEMON') else None
+
+def run_in_daemon(argv: List[str]) -> None:
+    """Run a command in the warm worker and exit with its status, if it can run there."""
+    from b2a.daemon import forward
+    try:
+        status = forward(argv)
+    except OSError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        sys.exit(1)
+    if status is not None:
+        sys.exit(status)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the B2A command-line interface."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv == ['--version']:
+        # Answered before argparse is even imported
+        print(f'B2A {__version__}')
+        return
+    forwarded = daemon_argv(argv)
+    if forwarded is not None:
+        # Forwarded without parsing, so no translation module is imported;
+        # commands that must run locally fall through
+        run_in_daemon(forwarded)
+        argv = forwarded
+    # Find the command first, then parse its arguments with a parser that
+    # only loads what that command needs
+    command = build_parser().parse_known_args(argv)[0].command
+    parser = build_parser(command)
+    args = parser.parse_args(argv)
     
     if not args.command:
         # If no command provided, show help
         parser.print_help()
         return
     
+    if not args.profile:
+        run_command(args)
+        return
+    
+    from b2a.instrument import TranslationStats, profile
+    stats = TranslationStats()
+    try:
+        with profile(args.profile, args.profile_top, stats):
+            run_command(args)
+    finally:
+        print(stats.report(args.profile_top), file=sys.stderr)
+        print(f'Profile written to {args.profile}.prof and {args.profile}.tracemalloc.txt',
+              file=sys.stderr)
+
+def run_command(args: 'argparse.Namespace') -> None:
+    """Run the command selected on the command line."""
     try:
         if args.command == 'text-to-braille':
+            from b2a.brf import braille_to_brf
+            from b2a.formatter import PageFormatter, format_braille
+            from functools import partial
+            from b2a.translator import Translator, iter_braille, text_to_braille, text_to_brf
+            page_options = None
+            if args.cells_per_line:
+                page_options = dict(cells_per_line=args.cells_per_line,
+                                    lines_per_page=args.lines_per_page or None,
+                                    page_numbers=not args.no_page_numbers)
+            
             # Get input from argument, file, or stdin
+            if (args.line_buffered or args.null) and not args.text:
+                if page_options:
+                    raise ValueError('--cells-per-line cannot be used with --line-buffered or -0')
+                filter_records(Translator(args.grade).encode, b'\0' if args.null else b'\n',
+                               args.input, args.output, brf_output=args.format == 'brf')
+                return
+            if args.stream and not args.text:
+                translate = partial(iter_braille, grade=args.grade, batch_size=STREAM_CHUNK_SIZE)
+                boundary = Translator(args.grade).stream_boundary()
+                stream_file_or_stdin(translate, boundary, args.input, args.output,
+                                     brf_output=args.format == 'brf',
+                                     formatter=PageFormatter(**page_options) if page_options else None)
+                return
             if args.text:
                 input_text = args.text
             else:
                 input_text = read_from_file_or_stdin(args.input)
             
             # Convert to Braille
-            result = text_to_braille(input_text, grade=args.grade)
+            result: Union[str, bytes]
+            if page_options:
+                result = format_braille(text_to_braille(input_text, grade=args.grade),
+                                        **page_options)
+                if not args.output:
+                    # print() adds the newline that ends the last line
+                    result = result[:-1]
+                if args.format == 'brf':
+                    result = braille_to_brf(result)
+            elif args.format == 'brf':
+                result = text_to_brf(input_text, grade=args.grade)
+            else:
+                result = text_to_braille(input_text, grade=args.grade)
             
             # Write output to file or stdout
             write_to_file_or_stdout(result, args.output)
             
         elif args.command == 'braille-to-text':
+            from functools import partial
+            from b2a.translator import Translator, braille_to_text, brf_to_text, iter_text
             # Get input from argument, file, or stdin
+            if (args.line_buffered or args.null) and not args.braille:
+                filter_records(Translator(args.grade).decode, b'\0' if args.null else b'\n',
+                               args.input, args.output, brf_input=args.format == 'brf')
+                return
+            if args.stream and not args.braille:
+                translate = partial(iter_text, grade=args.grade, batch_size=STREAM_CHUNK_SIZE)
+                boundary = Translator(args.grade).stream_boundary(decode=True)
+                stream_file_or_stdin(translate, boundary, args.input, args.output,
+                                     brf_input=args.format == 'brf')
+                return
             if args.braille:
                 input_braille = args.braille
             else:
-                input_braille = read_from_file_or_stdin(args.input)
+                input_braille = read_from_file_or_stdin(args.input, binary=args.format == 'brf')
             
             # Convert to text
-            result = braille_to_text(input_braille, grade=args.grade)
+            if args.format == 'brf':
+                result = brf_to_text(input_braille, grade=args.grade)
+            else:
+                result = braille_to_text(input_braille, grade=args.grade)
             
             # Write output to file or stdout
             write_to_file_or_stdout(result, args.output)
             
+        elif args.command == 'auto':
+            from b2a.translator import auto_translate
+            if args.text:
+                input_text = args.text
+            else:
+                input_text = read_from_file_or_stdin(args.input)
+            write_to_file_or_stdout(auto_translate(input_text, grade=args.grade), args.output)
+            
+        elif args.command == 'batch':
+            from b2a.batch import format_summary, translate_tree
+            summary = translate_tree(args.input_dir, args.output_dir, grade=args.grade,
+                                     direction=args.direction, jobs=args.jobs, force=args.force)
+            for path, error in summary.failures:
+                print(f'Error: {path}: {error}', file=sys.stderr)
+            print(format_summary(summary), file=sys.stderr)
+            if summary.failures:
+                sys.exit(1)
+            
+        elif args.command == 'serve':
+            from b2a.server import serve
+            serve(args.host, args.port, args.verbose)
+            
+        elif args.command == 'bench':
+            from b2a.bench import compare, format_report, load_report, run_benchmarks, save_report
+            from b2a.parallel import DIRECTIONS
+            report = run_benchmarks(args.corpus, args.grade or (1, 2),
+                                    args.direction or DIRECTIONS, args.scale,
+                                    args.min_time, args.file)
+            print(format_report(report))
+            if args.output:
+                save_report(report, args.output)
+            if args.baseline:
+                regressions = compare(report, load_report(args.baseline), args.tolerance)
+                for regression in regressions:
+                    print(f'Regression: {regression}', file=sys.stderr)
+                if regressions:
+                    sys.exit(1)
+            
+        elif args.command == 'difftest':
+            from b2a.differential import format_report as format_diff_report
+            from b2a.differential import generate_cases, run_differential
+            from b2a.parallel import DIRECTIONS
+            corpus: List[str] = []
+            for path in args.file:
+                corpus.extend(read_from_file_or_stdin(path).splitlines())
+            cases = generate_cases(args.cases, args.seed, args.grade or (1, 2),
+                                   args.direction or DIRECTIONS, corpus)
+            diff_report = run_differential(cases, args.engine, args.jobs)
+            print(format_diff_report(diff_report, args.limit))
+            if diff_report.mismatches:
+                sys.exit(1)
+            
         elif args.command == 'interactive':
+            from b2a.translator import text_to_braille, braille_to_text, contains_braille
             print(f'B2A Interactive Mode (Grade {args.grade} Braille)')
             print('Type your text to convert to Braille, or paste Braille to convert to text.')
             print('Type "exit" or press Ctrl+C to quit.\n')
@@ -144,7 +703,7 @@ def main() -> None:
                         continue
                         
                     # Try to detect if input is Braille (contains Braille characters)
-                    if any(c in '⠁⠂⠃⠄⠅⠆⠇⠈⠉⠊⠋⠌⠍⠎⠏⠐⠑⠒⠓⠔⠕⠖⠗⠘⠙⠚⠛⠜⠝⠞⠟⠠⠡⠢⠣⠤⠥⠦⠧⠨⠩⠪⠫⠬⠭⠮⠯⠰⠱⠲⠳⠴⠵⠶⠷⠸⠹⠺⠻⠼⠽⠾⠿' for c in user_input):
+                    if contains_braille(user_input):
                         # Convert Braille to text
                         result = braille_to_text(user_input, grade=args.grade)
                         print(f'Text: {result}')
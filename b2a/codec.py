@@ -0,0 +1,220 @@
+"""
+Python codecs for Grade 1 and Grade 2 Braille.
+
+Importing b2a registers the ``braille-g1`` and ``braille-g2`` codecs with the
+codecs module; this module is only loaded when one of them is first looked
+up. Encoding translates text to Braille and stores the cells as UTF-8;
+decoding reads UTF-8 Braille and translates it back to text:
+
+    with open('book.brl', encoding='braille-g2') as f:
+        text = f.read()
+
+The decoders buffer partial words between calls, so input can arrive in
+chunks of any size. The Grade 1 encoder only needs to know whether the last
+character was a digit, so it writes out all of its input on every call.
+
+Grade 2 contractions depend on the whole word, so the Grade 2 encoder holds
+back a partial word until the whitespace after it arrives, or until it is
+told that the input has ended: encode(final=True), or reset() or close()
+on a StreamWriter. io.TextIOWrapper never tells its encoder that the input
+has ended, so text written with ``open(..., 'w', encoding='braille-g2')``
+should end with a newline. A last word that was never written is reported
+with a RuntimeWarning when the encoder is discarded.
+"""
+
+import codecs
+import warnings
+from typing import List, Optional, Tuple, Union
+
+from .translator import NUMBER_INDICATOR, Translator, _Incremental, _default_translator
+
+CODEC_NAMES = {
+    'braille-g1': 1,
+    'braille-g2': 2,
+}
+
+def _make_codec(name: str, grade: int) -> codecs.CodecInfo:
+    """Build the CodecInfo for one Braille grade."""
+
+    def encode(input: str, errors: str = 'strict') -> Tuple[bytes, int]:
+        return _default_translator(grade).encode(input).encode('utf-8', errors), len(input)
+
+    def decode(input, errors: str = 'strict') -> Tuple[str, int]:
+        braille = codecs.utf_8_decode(input, errors, True)[0]
+        return _default_translator(grade).decode(braille), len(input)
+
+    class Grade1Encoder(codecs.IncrementalEncoder):
+        """Translate text to UTF-8 Grade 1 Braille as it arrives."""
+
+        def __init__(self, errors: str = 'strict'):
+            super().__init__(errors)
+            self._translator = _default_translator(1)
+            # A number indicator is only written before the first of a run
+            # of digits, which may have ended the previous call
+            self._digit = False
+
+        def encode(self, input: str, final: bool = False) -> bytes:
+            if not input:
+                return b''
+            braille = self._translator._encode_grade1(input)
+            if self._digit and input[0].isdigit():
+                braille = braille[len(NUMBER_INDICATOR):]
+            self._digit = input[-1].isdigit()
+            return braille.encode('utf-8', self.errors)
+
+        def reset(self) -> None:
+            self._digit = False
+
+        def getstate(self) -> int:
+            return int(self._digit)
+
+        def setstate(self, state: Union[int, str]) -> None:
+            self._digit = state == 1
+
+    class Grade2Encoder(codecs.IncrementalEncoder):
+        """Translate text to UTF-8 Grade 2 Braille, holding back partial words."""
+
+        def __init__(self, errors: str = 'strict'):
+            super().__init__(errors)
+            self._incremental = _Incremental(Translator(2))
+
+        def encode(self, input: str, final: bool = False) -> bytes:
+            return self._incremental.feed(input, final).encode('utf-8', self.errors)
+
+        def reset(self) -> None:
+            self._incremental.reset()
+
+        def getstate(self) -> int:
+            # The held-back text as an int, with 0 for the initial state
+            buffer, emitted = self._incremental.getstate()
+            if not buffer and not emitted:
+                return 0
+            return int.from_bytes(bytes([1 + emitted]) + buffer.encode('utf-8'), 'big')
+
+        def setstate(self, state: Union[int, str]) -> None:
+            state = int(state)
+            if not state:
+                self._incremental.reset()
+                return
+            data = state.to_bytes((state.bit_length() + 7) // 8, 'big')
+            self._incremental.setstate((data[1:].decode('utf-8'), data[0] == 2))
+
+        def __del__(self):
+            buffer, _ = self._incremental.getstate()
+            if buffer:
+                warnings.warn(f'{name}: {buffer[:20]!r} was never written, since no '
+                              f'whitespace or final encode() followed it', RuntimeWarning)
+
+    IncrementalEncoder = Grade1Encoder if grade == 1 else Grade2Encoder
+
+    class IncrementalDecoder(codecs.IncrementalDecoder):
+        """Translate UTF-8 Braille to text, holding back partial words."""
+
+        def __init__(self, errors: str = 'strict'):
+            super().__init__(errors)
+            self._utf8 = codecs.getincrementaldecoder('utf-8')(errors)
+            self._incremental = _Incremental(Translator(grade), decode=True)
+
+        def decode(self, input, final: bool = False) -> str:
+            braille = self._utf8.decode(input, final)
+            return self._incremental.feed(braille, final)
+
+        def reset(self) -> None:
+            self._utf8.reset()
+            self._incremental.reset()
+
+        def getstate(self) -> Tuple[bytes, int]:
+            pending, _ = self._utf8.getstate()
+            buffer, emitted = self._incremental.getstate()
+            return buffer.encode('utf-8') + pending, int(emitted)
+
+        def setstate(self, state: Tuple[bytes, int]) -> None:
+            data, emitted = state
+            self._utf8.reset()
+            buffer = self._utf8.decode(data)
+            self._incremental.setstate((buffer, bool(emitted)))
+
+    class StreamWriter(codecs.StreamWriter):
+        """Write text to a byte stream as UTF-8 Braille."""
+
+        def __init__(self, stream, errors: str = 'strict'):
+            super().__init__(stream, errors)
+            self._encoder = IncrementalEncoder(errors)
+
+        def encode(self, input: str, errors: str = 'strict') -> Tuple[bytes, int]:
+            return self._encoder.encode(input), len(input)
+
+        def reset(self) -> None:
+            # Write out any partial word, so the output is complete
+            data = self._encoder.encode('', final=True)
+            if data:
+                self.stream.write(data)
+
+        def seek(self, offset: int, whence: int = 0) -> None:
+            self.reset()
+            self.stream.seek(offset, whence)
+
+        def close(self) -> None:
+            self.reset()
+            self.stream.close()
+
+        def __exit__(self, type, value, tb) -> None:
+            self.close()
+
+    class StreamReader(codecs.StreamReader):
+        """Read UTF-8 Braille from a byte stream as text."""
+
+        linebuffer: Optional[List[str]]
+
+        def __init__(self, stream, errors: str = 'strict'):
+            super().__init__(stream, errors)
+            self._decoder = IncrementalDecoder(errors)
+
+        def read(self, size: int = -1, chars: int = -1, firstline: bool = False) -> str:
+            # As codecs.StreamReader.read(), but the decoder is told that
+            # the input has ended as soon as the stream returns no data
+            if self.linebuffer:
+                self.charbuffer = ''.join(self.linebuffer)
+                self.linebuffer = None
+            if chars < 0:
+                chars = size
+            while chars < 0 or len(self.charbuffer) < chars:
+                data = self.stream.read() if size < 0 else self.stream.read(size)
+                self.charbuffer += self._decoder.decode(data, final=not data)
+                if not data:
+                    break
+            if chars < 0:
+                result, self.charbuffer = self.charbuffer, ''
+            else:
+                result, self.charbuffer = self.charbuffer[:chars], self.charbuffer[chars:]
+            return result
+
+        def reset(self) -> None:
+            super().reset()
+            self._decoder.reset()
+
+    return codecs.CodecInfo(
+        name=name,
+        encode=encode,
+        decode=decode,
+        incrementalencoder=IncrementalEncoder,
+        incrementaldecoder=IncrementalDecoder,
+        streamwriter=StreamWriter,
+        streamreader=StreamReader,
+    )
+
+def search(name: str) -> Optional[codecs.CodecInfo]:
+    """
+    Codec search function for the Braille codecs.
+
+    Args:
+        name: The normalized encoding name
+
+    Returns:
+        The CodecInfo for a Braille codec, or None for any other name
+    """
+    name = name.replace('_', '-')
+    grade = CODEC_NAMES.get(name)
+    if grade is None:
+        return None
+    return _make_codec(name, grade)
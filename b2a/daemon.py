@@ -0,0 +1,318 @@
+"""
+Warm worker process for the command-line interface.
+
+With ``b2a --daemon ...`` (or the B2A_DAEMON environment variable set), the
+CLI does not translate anything itself. It connects to a worker listening on
+a Unix domain socket, starting one in the background if none is running,
+and forwards its arguments, working directory and standard input. The worker
+keeps the translation tables compiled and forks a child per request, which
+runs the command and streams standard output, standard error and the exit
+status back. Workers exit after a period without requests:
+
+    B2A_DAEMON=1 b2a text-to-braille "Hello"
+
+The protocol is private to this module. A request is one JSON line with
+``argv`` and ``cwd``, followed by the raw standard input up to the end of
+the write side. Every response frame is a channel byte (``o`` for stdout,
+``e`` for stderr, ``x`` for the exit status) and a 4-byte big-endian length,
+followed by that many bytes.
+
+Only one worker runs per user and b2a version. Its socket lives in a
+directory only the user can access; both sides refuse a directory that is a
+symlink, belongs to someone else or is open to other users. The worker holds
+a lock on a file next to the socket for as long as it runs, and removes it
+when it exits. This module needs Unix domain sockets and os.fork(), so it is
+not available on Windows.
+"""
+
+import io
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+from typing import List, Optional
+
+from . import __version__
+
+# Seconds without requests before a worker exits
+DEFAULT_IDLE_TIMEOUT = 600.0
+
+# Seconds a client waits for a newly started worker to listen
+START_TIMEOUT = 10.0
+
+# Commands that keep running or read a terminal, and so always run locally
+LOCAL_COMMANDS = ('serve', 'interactive')
+
+_FRAME = struct.Struct('>cI')
+STDOUT = b'o'
+STDERR = b'e'
+EXIT = b'x'
+
+_CHUNK_SIZE = 64 * 1024
+
+
+def default_socket_path() -> str:
+    """Return the socket path, from B2A_DAEMON_SOCKET or a per-user directory."""
+    path = os.environ.get('B2A_DAEMON_SOCKET')
+    if path:
+        return path
+    base = os.environ.get('XDG_RUNTIME_DIR')
+    if base:
+        directory = os.path.join(base, 'b2a')
+    else:
+        import tempfile
+        directory = os.path.join(tempfile.gettempdir(), f'b2a-{os.getuid()}')
+    return os.path.join(directory, f'daemon-{__version__}.sock')
+
+def _secure_directory(directory: str) -> None:
+    """
+    Create the socket's directory if needed and check that only we can use it.
+
+    Raises:
+        PermissionError: If it is a symlink or not a directory, belongs to
+            another user, or grants any permission to the group or others
+    """
+    if not directory:
+        return
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    st = os.lstat(directory)
+    if (not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid()
+            or stat.S_IMODE(st.st_mode) & 0o077):
+        raise PermissionError(f'Refusing to use {directory}: it must be a directory '
+                              f'owned by the current user with mode 0700')
+
+def idle_timeout() -> float:
+    """Return the idle timeout, from B2A_DAEMON_IDLE_TIMEOUT or the default."""
+    value = os.environ.get('B2A_DAEMON_IDLE_TIMEOUT')
+    return float(value) if value else DEFAULT_IDLE_TIMEOUT
+
+def _send_frame(sock_file: io.BufferedIOBase, channel: bytes, data: bytes) -> None:
+    sock_file.write(_FRAME.pack(channel, len(data)) + data)
+
+# Client side
+
+def _connect(path: str) -> Optional[socket.socket]:
+    """Connect to a running worker, or return None if there is none."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        sock.close()
+        return None
+    return sock
+
+def _start_worker(path: str) -> socket.socket:
+    """Start a worker in the background and connect to it."""
+    import subprocess
+    import time
+    # Run from the directory containing the package, so the worker imports
+    # the same b2a as this process
+    package_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.Popen(
+        [sys.executable, '-m', 'b2a.daemon', path, str(idle_timeout())],
+        cwd=package_parent,
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + START_TIMEOUT
+    while True:
+        sock = _connect(path)
+        if sock is not None:
+            return sock
+        if time.monotonic() > deadline:
+            raise OSError(f'B2A worker did not start listening on {path}')
+        time.sleep(0.01)
+
+def _pump_stdin(sock: socket.socket) -> None:
+    """Send standard input to the worker, then close the write side."""
+    try:
+        if not sys.stdin.isatty():
+            fd = sys.stdin.fileno()
+            while True:
+                data = os.read(fd, _CHUNK_SIZE)
+                if not data:
+                    break
+                sock.sendall(data)
+        sock.shutdown(socket.SHUT_WR)
+    except (OSError, ValueError):
+        # The worker finished without reading all of the input
+        pass
+
+def _read_exact(sock_file: io.BufferedIOBase, size: int) -> bytes:
+    data = sock_file.read(size)
+    if len(data) != size:
+        raise ConnectionError('B2A worker closed the connection')
+    return data
+
+def forward(argv: List[str], path: Optional[str] = None) -> Optional[int]:
+    """
+    Run a command in the warm worker, starting it if needed.
+
+    Args:
+        argv: The command-line arguments, without --daemon
+        path: The worker's socket (default: default_socket_path())
+
+    Returns:
+        The exit status of the command, or None if it must run locally
+    """
+    from .cli import command_index
+    # Only the command itself counts, not an argument that happens to match
+    i = command_index(argv)
+    if (i < len(argv) and argv[i] in LOCAL_COMMANDS) or not hasattr(socket, 'AF_UNIX'):
+        return None
+    path = path or default_socket_path()
+    # Whoever controls the directory could read the request and fake the output
+    _secure_directory(os.path.dirname(path))
+    sock = _connect(path) or _start_worker(path)
+    with sock:
+        header = json.dumps({'argv': argv, 'cwd': os.getcwd()}).encode('utf-8')
+        sock.sendall(header + b'\n')
+        import threading
+        threading.Thread(target=_pump_stdin, args=(sock,), daemon=True).start()
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        outputs = {STDOUT: sys.stdout.buffer, STDERR: sys.stderr.buffer}
+        with sock.makefile('rb') as sock_file:
+            while True:
+                channel, size = _FRAME.unpack(_read_exact(sock_file, _FRAME.size))
+                data = _read_exact(sock_file, size)
+                if channel == EXIT:
+                    return int(data)
+                output = outputs[channel]
+                output.write(data)
+                output.flush()
+
+# Worker side
+
+class _FrameWriter(io.RawIOBase):
+    """Raw binary stream that sends everything written as frames on one channel."""
+
+    def __init__(self, sock_file: io.BufferedIOBase, channel: bytes):
+        super().__init__()
+        self._sock_file = sock_file
+        self._channel = channel
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if data:
+            _send_frame(self._sock_file, self._channel, bytes(data))
+        return len(data)
+
+def _run_request(rfile: io.BufferedIOBase, wfile: io.BufferedIOBase) -> None:
+    """Run one forwarded command in a forked child, with its stdio on the socket."""
+    import traceback
+    request = json.loads(rfile.readline())
+
+    stdout = io.TextIOWrapper(io.BufferedWriter(_FrameWriter(wfile, STDOUT)), encoding='utf-8')
+    stderr = io.TextIOWrapper(io.BufferedWriter(_FrameWriter(wfile, STDERR)), encoding='utf-8',
+                              line_buffering=True)
+    sys.stdin = io.TextIOWrapper(rfile, encoding='utf-8')
+    sys.stdout, sys.stderr = stdout, stderr
+    status = 0
+    try:
+        os.chdir(request['cwd'])
+        from .cli import main
+        main(request['argv'])
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            status = e.code or 0
+        else:
+            print(e.code, file=stderr)
+            status = 1
+    except BaseException:
+        traceback.print_exc(file=stderr)
+        status = 1
+    try:
+        stdout.flush()
+        stderr.flush()
+    except ValueError:
+        pass
+    _send_frame(wfile, EXIT, str(status).encode('ascii'))
+
+def _warm_up() -> None:
+    """Import everything the commands need and compile the tables, before the first fork."""
+    import argparse  # noqa: F401
+    from .cli import COMMANDS, build_parser
+    from .translator import _default_translator
+    for command in COMMANDS:
+        build_parser(command)
+    _default_translator(1)
+    _default_translator(2)
+
+def run_worker(path: str, timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+    """
+    Serve forwarded commands on a Unix socket until idle for timeout seconds.
+
+    Returns at once if another worker already serves the socket.
+    """
+    import fcntl
+    import socketserver
+
+    _secure_directory(os.path.dirname(path))
+    # Held for the worker's lifetime, so only one worker owns the socket
+    lock_path = path + '.lock'
+    while True:
+        lock = open(lock_path, 'w')
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            if os.path.samestat(os.fstat(lock.fileno()), os.stat(lock_path)):
+                break
+        except FileNotFoundError:
+            pass
+        # The previous worker removed the file while this one was waiting
+        lock.close()
+    sock = _connect(path)
+    if sock is not None:
+        # Another worker took over while this one was waiting for the lock
+        sock.close()
+        lock.close()
+        return
+    # Never inherit the setting that started this worker
+    os.environ.pop('B2A_DAEMON', None)
+    _warm_up()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            _run_request(self.rfile, self.wfile)
+
+    class Server(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+        idle = False
+
+        def handle_timeout(self) -> None:
+            super().handle_timeout()
+            self.idle = not self.active_children
+
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    old_umask = os.umask(0o077)
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(old_umask)
+    server.timeout = timeout
+    try:
+        with server:
+            while not server.idle:
+                server.handle_request()
+                server.collect_children()
+    finally:
+        os.unlink(path)
+        # Removed while still held, so no other worker can lock it meanwhile
+        os.unlink(lock_path)
+        lock.close()
+
+def main() -> None:
+    """Entry point of a worker started by forward()."""
+    path = sys.argv[1]
+    timeout = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_IDLE_TIMEOUT
+    run_worker(path, timeout)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,410 @@
+"""
+Differential testing of translation engines against the frozen reference.
+
+Every fast path has to produce exactly what b2a.reference produces. This
+module generates inputs, translates each one with the reference and with
+every registered engine, and reports the engines that disagree together
+with the smallest input that still shows the difference:
+
+    b2a difftest --cases 5000 --jobs 8
+
+Inputs are random strings (mixed case, digits, punctuation, whitespace and
+non-ASCII characters), sentences built from every contraction, lines of any
+given corpus files, and Braille made from all of these. Cases are checked in
+parallel on a pool of processes. The report also gives each engine's
+throughput relative to the reference on the same inputs.
+
+Engines are registered with register_engine(). Their functions take the
+input and the grade and are sent to worker processes by reference, so they
+must be defined at module level.
+"""
+
+import os
+import random
+import time
+from collections import namedtuple
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import reference
+from .parallel import DIRECTIONS
+
+if TYPE_CHECKING:
+    from .translator import Translator
+
+Engine = namedtuple('Engine', ['name', 'encode', 'decode', 'grades'])
+Case = namedtuple('Case', ['direction', 'grade', 'input'])
+Mismatch = namedtuple('Mismatch', ['engine', 'direction', 'grade', 'input', 'expected', 'actual',
+                                   'original'])
+DiffReport = namedtuple('DiffReport', ['cases', 'chars', 'mismatches', 'throughput'])
+
+ENGINES: Dict[str, Engine] = {}
+
+# Characters random inputs are drawn from, by kind
+_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+_ALPHABETS = (
+    _LETTERS,
+    _LETTERS.upper(),
+    '0123456789',
+    ',;:.!?()\'-/\\&+<>*=#"$[]{}@%_^~',
+    ' \t\n\r\x0b\x0c\xa0 ',
+    'éÉßçñÑøæœĳ',
+    '中文ありがとう한국어ΩЖ',
+    '\U0001f600\U0001d400⠀⠁⠠⠼⣿',
+)
+_BRAILLE_CELLS = ''.join(chr(0x2801 + i) for i in range(63))
+
+
+def register_engine(name: str, encode: Optional[Callable[[str, int], str]] = None,
+                    decode: Optional[Callable[[str, int], str]] = None,
+                    grades: Sequence[int] = (1, 2)) -> Engine:
+    """
+    Register a translation engine to compare with the reference.
+
+    Args:
+        name: A unique name for the engine
+        encode: Function translating ``(text, grade)`` to Braille, or None
+        decode: Function translating ``(braille, grade)`` to text, or None
+        grades: The Braille grades the engine supports
+
+    Returns:
+        The registered engine
+    """
+    if encode is None and decode is None:
+        raise ValueError("An engine needs an encode or a decode function")
+    engine = Engine(name, encode, decode, tuple(grades))
+    ENGINES[name] = engine
+    return engine
+
+# Built-in engines
+
+def _translator(grade: int, cache_size: Optional[int] = None):
+    from .translator import Translator
+    key = (grade, cache_size)
+    translator = _TRANSLATORS.get(key)
+    if translator is None:
+        translator = _TRANSLATORS[key] = Translator(grade, cache_size=cache_size)
+    return translator
+
+# By (grade, cache size), or ('table', grade)
+_TRANSLATORS: Dict[tuple, 'Translator'] = {}
+
+def _translator_encode(text: str, grade: int) -> str:
+    return _translator(grade).encode(text)
+
+def _translator_decode(braille: str, grade: int) -> str:
+    return _translator(grade).decode(braille)
+
+def _cached_encode(text: str, grade: int) -> str:
+    return _translator(grade, 256).encode(text)
+
+def _cached_decode(braille: str, grade: int) -> str:
+    return _translator(grade, 256).decode(braille)
+
+def _codec_encode(text: str, grade: int) -> str:
+    return text.encode(f'braille-g{grade}').decode('utf-8')
+
+def _codec_decode(braille: str, grade: int) -> str:
+    return braille.encode('utf-8').decode(f'braille-g{grade}')
+
+def _uneven_pieces(data: str) -> List[str]:
+    """Cut data into pieces of uneven sizes, so cuts land everywhere."""
+    pieces = []
+    position = 0
+    size = 1
+    while position < len(data):
+        pieces.append(data[position:position + size])
+        position += size
+        size = size % 7 + 1
+    return pieces
+
+def _incremental(data: str, grade: int, decode: bool) -> str:
+    from .translator import _Incremental
+    incremental = _Incremental(_translator(grade), decode=decode)
+    pieces = [incremental.feed(piece) for piece in _uneven_pieces(data)]
+    pieces.append(incremental.feed('', final=True))
+    return ''.join(pieces)
+
+def _incremental_encode(text: str, grade: int) -> str:
+    return _incremental(text, grade, False)
+
+def _incremental_decode(braille: str, grade: int) -> str:
+    return _incremental(braille, grade, True)
+
+def _iter_encode(text: str, grade: int) -> str:
+    return ''.join(_translator(grade).iter_encode(_uneven_pieces(text)))
+
+def _iter_decode(braille: str, grade: int) -> str:
+    return ''.join(_translator(grade).iter_decode(_uneven_pieces(braille)))
+
+def _iter_batch_encode(text: str, grade: int) -> str:
+    return ''.join(_translator(grade).iter_encode(_uneven_pieces(text), batch_size=16))
+
+def _iter_batch_decode(braille: str, grade: int) -> str:
+    return ''.join(_translator(grade).iter_decode(_uneven_pieces(braille), batch_size=16))
+
+def _table_translator(grade: int):
+    key = ('table', grade)
+    translator = _TRANSLATORS.get(key)
+    if translator is None:
+        from .tables import RuleTable, compile_table, format_table
+        from .translator import Translator
+        table = RuleTable('<built-in>', None, compile_table(format_table()))
+        translator = _TRANSLATORS[key] = Translator(grade, table=table)
+    return translator
+
+def _table_encode(text: str, grade: int) -> str:
+    return _table_translator(grade).encode(text)
+
+def _table_decode(braille: str, grade: int) -> str:
+    return _table_translator(grade).decode(braille)
+
+def _vectorized_encode(text: str, grade: int) -> str:
+    from .vectorized import text_to_grade1_braille
+    return text_to_grade1_braille(text)
+
+register_engine('translator', _translator_encode, _translator_decode)
+register_engine('cached', _cached_encode, _cached_decode)
+register_engine('codec', _codec_encode, _codec_decode)
+register_engine('incremental', _incremental_encode, _incremental_decode)
+register_engine('iter', _iter_encode, _iter_decode)
+register_engine('iter-batch', _iter_batch_encode, _iter_batch_decode)
+register_engine('rule-table', _table_encode, _table_decode)
+
+def _register_optional_engines() -> None:
+    from . import vectorized
+    if vectorized.AVAILABLE:
+        register_engine('vectorized', _vectorized_encode, grades=(1,))
+
+_register_optional_engines()
+
+# Inputs
+
+def _random_text(rng: random.Random) -> str:
+    """A random string mixing a few kinds of characters."""
+    kinds = rng.sample(_ALPHABETS, rng.randint(1, 4))
+    return ''.join(rng.choice(rng.choice(kinds)) for _ in range(rng.randint(0, 40)))
+
+def _random_words(rng: random.Random, words: Sequence[str]) -> str:
+    """A random sentence of contractions and words, in mixed case."""
+    parts = []
+    for _ in range(rng.randint(1, 8)):
+        word = rng.choice(words)
+        roll = rng.random()
+        if roll < 0.15:
+            word = word.upper()
+        elif roll < 0.35:
+            word = word.capitalize()
+        elif roll < 0.45:
+            word += rng.choice('0123456789,.!?;:\'-')
+        parts.append(word)
+    return rng.choice((' ', ' ', '  ', '\n', '\t')).join(parts)
+
+def _random_braille(rng: random.Random) -> str:
+    """A random run of Braille cells, indicators and spaces."""
+    cells = _BRAILLE_CELLS + '⠠⠠⠼  '
+    return ''.join(rng.choice(cells) for _ in range(rng.randint(0, 30)))
+
+def generate_cases(count: int = 1000, seed: int = 0, grades: Sequence[int] = (1, 2),
+                   directions: Sequence[str] = DIRECTIONS,
+                   corpus: Iterable[str] = ()) -> List[Case]:
+    """
+    Generate deterministic test cases.
+
+    Args:
+        count: Number of random inputs per grade and direction
+        seed: Seed for the random generator
+        grades: Braille grades to test
+        directions: Directions to test
+        corpus: Extra texts, such as the lines of a corpus file, used as
+            they are and as the source of Braille inputs
+
+    Returns:
+        The cases, in a stable order
+    """
+    from .bench import CORPUS_WORDS, generate_corpus
+    from .translator import _SPECIAL_BRAILLE, _SPECIAL_TEXT, _SPECIAL_TEXT_LOWER
+    rng = random.Random(f'difftest:{seed}')
+    corpus = list(corpus)
+    texts = corpus + list(_SPECIAL_TEXT) + [key.title() for key in _SPECIAL_TEXT_LOWER]
+    texts += generate_corpus('labels', scale=0.01, seed=seed)
+    generators = (
+        _random_text,
+        lambda rng: _random_words(rng, CORPUS_WORDS),
+        lambda rng: rng.choice(texts)[:rng.randint(0, 200)],
+    )
+    texts += [rng.choice(generators)(rng) for _ in range(count)]
+
+    cases: List[Case] = []
+    for grade in grades:
+        if 'text-to-braille' in directions:
+            cases.extend(Case('text-to-braille', grade, text) for text in texts)
+        if 'braille-to-text' in directions:
+            braille = [reference.text_to_braille(text, grade) for text in texts[:count]]
+            braille += list(_SPECIAL_BRAILLE)
+            braille += [_random_braille(rng) for _ in range(count // 4)]
+            cases.extend(Case('braille-to-text', grade, item) for item in braille)
+    return cases
+
+# Comparison
+
+def _run(function: Callable[[str, int], str], data: str, grade: int):
+    """Return a function's result, or the type of the exception it raised."""
+    try:
+        return function(data, grade)
+    except Exception as e:
+        return f'<{type(e).__name__}>'
+
+def _reference_function(direction: str) -> Callable[[str, int], str]:
+    if direction == 'text-to-braille':
+        return reference.text_to_braille
+    return reference.braille_to_text
+
+def _engine_function(engine: Engine, case: Case) -> Optional[Callable[[str, int], str]]:
+    """Return the engine's function for a case, or None if it does not support it."""
+    if case.grade not in engine.grades:
+        return None
+    return engine.encode if case.direction == 'text-to-braille' else engine.decode
+
+def minimize(function: Callable[[str, int], str], expected: Callable[[str, int], str],
+             data: str, grade: int) -> str:
+    """
+    Shrink an input on which function and expected disagree.
+
+    Chunks of characters are removed, from half the input down to single
+    characters, for as long as the results still differ.
+
+    Returns:
+        A smaller input that still shows the difference
+    """
+    def differs(candidate: str) -> bool:
+        return _run(function, candidate, grade) != _run(expected, candidate, grade)
+
+    size = len(data) // 2
+    while size >= 1:
+        start = 0
+        while start < len(data):
+            candidate = data[:start] + data[start + size:]
+            if differs(candidate):
+                data = candidate
+            else:
+                start += size
+        size //= 2
+    return data
+
+def _check_cases(task: Tuple[List[Engine], List[Case]]) -> Tuple[List[Mismatch], Dict[str, float]]:
+    """Compare engines with the reference on a batch of cases, timing each."""
+    engines, cases = task
+    clock = time.perf_counter
+    timings = {'reference': 0.0}
+    timings.update((engine.name, 0.0) for engine in engines)
+    # Compile each engine's tables before timing it
+    for direction, grade in {(case.direction, case.grade) for case in cases}:
+        for engine in engines:
+            function = _engine_function(engine, Case(direction, grade, ''))
+            if function is not None:
+                _run(function, 'a', grade)
+    mismatches = []
+    for case in cases:
+        expected_function = _reference_function(case.direction)
+        start = clock()
+        expected = _run(expected_function, case.input, case.grade)
+        timings['reference'] += clock() - start
+        for engine in engines:
+            function = _engine_function(engine, case)
+            if function is None:
+                continue
+            start = clock()
+            actual = _run(function, case.input, case.grade)
+            timings[engine.name] += clock() - start
+            if actual != expected:
+                small = minimize(function, expected_function, case.input, case.grade)
+                mismatches.append(Mismatch(
+                    engine.name, case.direction, case.grade, small,
+                    _run(expected_function, small, case.grade), _run(function, small, case.grade),
+                    case.input,
+                ))
+    return mismatches, timings
+
+def _batches(cases: List[Case], count: int) -> List[List[Case]]:
+    """Split cases into count interleaved batches of similar cost."""
+    return [cases[i::count] for i in range(count) if cases[i::count]]
+
+def run_differential(cases: Sequence[Case], engines: Optional[Sequence[str]] = None,
+                     jobs: Optional[int] = None) -> DiffReport:
+    """
+    Compare engines with the reference on every case.
+
+    Throughput is measured only over the cases each engine supports, as the
+    reference's time on those cases divided by the engine's time, so 2.0
+    means twice as fast as the reference.
+
+    Args:
+        cases: The cases to check, such as those from generate_cases()
+        engines: Names of the engines to check (default: all registered)
+        jobs: Number of worker processes (default: number of CPUs); with 1
+            the cases are checked in the current process
+
+    Returns:
+        The mismatches found and the relative throughput of each engine
+    """
+    names = list(ENGINES) if engines is None else list(engines)
+    for name in names:
+        if name not in ENGINES:
+            raise ValueError(f"Unknown engine: {name} (choose from: {', '.join(ENGINES)})")
+    cases = list(cases)
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+
+    mismatches = []
+    throughput = {}
+    for name in names:
+        engine = ENGINES[name]
+        supported = [case for case in cases if _engine_function(engine, case)]
+        # More batches than workers keeps every worker busy until the end
+        tasks = [([engine], batch) for batch in _batches(supported, jobs * 4 if jobs > 1 else 1)]
+        if jobs == 1:
+            results: Iterator[Tuple[List[Mismatch], Dict[str, float]]] = map(_check_cases, tasks)
+            executor = None
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=jobs)
+            results = executor.map(_check_cases, tasks)
+        try:
+            reference_time = engine_time = 0.0
+            for batch_mismatches, timings in results:
+                mismatches.extend(batch_mismatches)
+                reference_time += timings['reference']
+                engine_time += timings[name]
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        throughput[name] = reference_time / engine_time if engine_time else float('inf')
+
+    chars = sum(len(case.input) for case in cases)
+    return DiffReport(len(cases), chars, mismatches, throughput)
+
+def format_report(report: DiffReport, limit: int = 10) -> str:
+    """Format a report as text, showing at most limit mismatches per engine."""
+    lines = [f'Checked {report.cases} cases ({report.chars} characters) against the reference']
+    lines.append(f'{"engine":<14} {"mismatches":>10} {"throughput":>12}')
+    counts: Dict[str, int] = {}
+    for mismatch in report.mismatches:
+        counts[mismatch.engine] = counts.get(mismatch.engine, 0) + 1
+    for name, speed in report.throughput.items():
+        lines.append(f'{name:<14} {counts.get(name, 0):>10} {speed:>11.2f}x')
+
+    shown: Dict[str, int] = {}
+    for mismatch in report.mismatches:
+        if shown.get(mismatch.engine, 0) >= limit:
+            continue
+        shown[mismatch.engine] = shown.get(mismatch.engine, 0) + 1
+        lines.append('')
+        lines.append(f'{mismatch.engine}: {mismatch.direction} grade {mismatch.grade}')
+        lines.append(f'  input:    {mismatch.input!r}')
+        lines.append(f'  expected: {mismatch.expected!r}')
+        lines.append(f'  actual:   {mismatch.actual!r}')
+        if mismatch.original != mismatch.input:
+            lines.append(f'  minimized from {len(mismatch.original)} characters')
+    return '\n'.join(lines)
@@ -0,0 +1,407 @@
+"""
+Page formatting for embossed Braille.
+
+Translation produces Braille as one long line. This module lays it out for
+an embosser: lines of at most ``cells_per_line`` cells, and pages of
+``lines_per_page`` lines with the Braille page number at the right of the
+last line of each page:
+
+    >>> formatter = PageFormatter(cells_per_line=40, lines_per_page=25)
+    >>> for chunk in chunks:
+    ...     out.write(formatter.feed(chunk))
+    >>> out.write(formatter.feed('', final=True))
+
+Lines are broken at spaces, or inside words at hyphenation points found
+with Liang-style patterns. A break never falls inside a multi-cell
+contraction or symbol, between an indicator and the cell it applies to, or
+inside a number. Every line ends with a newline and every page but the last
+ends with a form feed; newlines and form feeds in the input start a new
+line or page.
+
+Formatting is one pass over the input with greedy line filling, so it runs
+in linear time. Lines are written out as soon as they are complete, so
+memory is bounded by one line plus one word, however long the book.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .translator import (
+    BRAILLE_ALPHABET,
+    BRAILLE_NUMBERS,
+    BRAILLE_PUNCTUATION,
+    CAPITAL_INDICATOR,
+    CONTRACTIONS,
+    NUMBER_INDICATOR,
+    WORD_CONTRACTION_INDICATOR,
+    WordCache,
+)
+
+CELLS_PER_LINE = 40
+LINES_PER_PAGE = 25
+
+HYPHEN = BRAILLE_PUNCTUATION['-']
+
+# Small set of English hyphenation patterns in TeX syntax: a digit between
+# two letters allows a break there if odd and forbids it if even, '.' marks
+# the start or end of a word, and the highest digit at a position wins.
+HYPHENATION_PATTERNS = (
+    # Between double consonants
+    'b1b', 'c1c', 'd1d', 'f1f', 'g1g', 'l1l', 'm1m', 'n1n', 'p1p', 'r1r', 's1s', 't1t', 'z1z',
+    # Before common suffixes
+    '1tion', '1sion', '1ment', '1ness', '1less', '1ful', '1ture', '1tive',
+    # After common prefixes
+    '.dis1', '.mis1', '.non1', '.pre1', '.sub1', '.over1', '.inter1', '.trans1',
+    # Exceptions
+    '.pre2t', '.dis2h',
+)
+
+# Fewest cells of a word's letters left before and carried after a hyphen
+_LEFT_MIN = 2
+_RIGHT_MIN = 3
+
+_MIN_CELLS_PER_LINE = 8
+
+# Blank cells between the text and the page number on the last line
+_PAGE_NUMBER_GAP = 3
+
+# Words whose break points are remembered; books repeat their long words
+_BREAK_CACHE_SIZE = 4096
+
+# Runs of cells without whitespace longer than this are not words; they
+# are broken up so that memory stays bounded
+_MAX_WORD = 1024
+
+_WORD = re.compile(r'[^\s]+|[\n\f]')
+_LAST_SPACE = re.compile(r'.*\s', re.DOTALL)
+
+# Cells that apply to the cell after them
+_INDICATORS = frozenset((CAPITAL_INDICATOR, NUMBER_INDICATOR, WORD_CONTRACTION_INDICATOR))
+_DIGIT_CELLS = frozenset(BRAILLE_NUMBERS.values())
+
+def _spell(text: str) -> str:
+    return ''.join(BRAILLE_ALPHABET.get(char, '') for char in text)
+
+# Multi-cell contractions and symbols. Contractions that are just their
+# letters spelled out, such as 'con', can be broken like any other letters.
+_UNITS = frozenset(
+    [cells for text, cells in CONTRACTIONS.items() if len(cells) > 1 and cells != _spell(text)]
+    + [cells for cells in BRAILLE_PUNCTUATION.values() if len(cells) > 1]
+)
+_UNIT_LENGTHS = sorted({len(unit) for unit in _UNITS})
+
+def compile_patterns(patterns: Iterable[str]) -> Dict[str, Tuple[int, ...]]:
+    """
+    Compile hyphenation patterns for use by PageFormatter.
+
+    Args:
+        patterns: Patterns in TeX syntax, such as 'b1b' or '.dis1'
+
+    Returns:
+        A table mapping the Braille cells of each pattern, with '.' for word
+        edges, to its break values between and around those cells
+
+    Raises:
+        ValueError: If a pattern has a character other than a letter, a
+            digit or '.'
+    """
+    table = {}
+    for pattern in patterns:
+        cells = []
+        values = [0]
+        for char in pattern:
+            if char.isdigit():
+                values[-1] = int(char)
+            elif char == '.':
+                cells.append(char)
+                values.append(0)
+            elif char.lower() in BRAILLE_ALPHABET:
+                cells.append(BRAILLE_ALPHABET[char.lower()])
+                values.append(0)
+            else:
+                raise ValueError(f'Invalid hyphenation pattern: {pattern!r}')
+        table[''.join(cells)] = tuple(values)
+    return table
+
+_DEFAULT_PATTERNS = compile_patterns(HYPHENATION_PATTERNS)
+
+def _page_label(page: int) -> str:
+    """Return the Braille page number of page."""
+    return NUMBER_INDICATOR + ''.join(BRAILLE_NUMBERS[digit] for digit in str(page))
+
+
+class PageFormatter:
+    """
+    Wrap and paginate Braille that arrives in pieces.
+
+    Runs of whitespace other than newlines and form feeds are treated as
+    a single space.
+
+    Args:
+        cells_per_line: Maximum cells on a line, including hyphens and
+            page numbers
+        lines_per_page: Lines on a page, or None to wrap lines only
+        page_numbers: Put the page number at the right of the last line
+            of each page; numbers too wide for the line are left out
+        hyphenate: Break words at hyphenation points; words longer than a
+            line are broken anyway
+        patterns: Hyphenation patterns from compile_patterns(), instead of
+            the built-in English ones
+
+    Raises:
+        ValueError: If cells_per_line or lines_per_page is too small
+    """
+
+    __slots__ = ('_cells_per_line', '_lines_per_page', '_page_numbers', '_patterns',
+                 '_pattern_max', '_breaks', '_pending', '_line', '_length', '_capacity',
+                 '_line_number', '_page', '_page_break')
+
+    def __init__(self, cells_per_line: int = CELLS_PER_LINE,
+                 lines_per_page: Optional[int] = LINES_PER_PAGE,
+                 page_numbers: bool = True, hyphenate: bool = True,
+                 patterns: Optional[Dict[str, Tuple[int, ...]]] = None):
+        if cells_per_line < _MIN_CELLS_PER_LINE:
+            raise ValueError(f'Cells per line must be at least {_MIN_CELLS_PER_LINE}')
+        if lines_per_page is not None and lines_per_page < 1:
+            raise ValueError('Lines per page must be at least 1')
+        self._cells_per_line = cells_per_line
+        self._lines_per_page = lines_per_page
+        self._page_numbers = page_numbers and lines_per_page is not None
+        if not hyphenate:
+            patterns = {}
+        elif patterns is None:
+            patterns = _DEFAULT_PATTERNS
+        self._patterns = patterns
+        self._pattern_max = max(map(len, patterns), default=0)
+        self._breaks: WordCache[Tuple[List[int], bytes]] = WordCache(_BREAK_CACHE_SIZE)
+        self._pending = ''
+        self._line: List[str] = []
+        self._length = 0
+        self._line_number = 0
+        self._page = 1
+        self._page_break = False
+        self._capacity = self._line_capacity()
+
+    def feed(self, braille: str, final: bool = False) -> str:
+        """
+        Add Braille and return the lines completed so far.
+
+        Args:
+            braille: The next piece of Braille; pieces may be cut anywhere
+            final: True if no more input will follow
+
+        Returns:
+            The formatted lines, possibly empty
+        """
+        out: List[str] = []
+        data = self._pending + braille
+        end = len(data)
+        # Hold back a word that may continue in the next piece
+        if not final and data and not data[-1].isspace():
+            match = _LAST_SPACE.match(data)
+            cut = match.end() if match else 0
+            if end - cut <= _MAX_WORD:
+                end = cut
+        self._pending = data[end:]
+        for match in _WORD.finditer(data, 0, end):
+            word = match.group()
+            if word == '\n':
+                self._end_line(out)
+            elif word == '\f':
+                self._end_page(out)
+            else:
+                self._add_word(word, out)
+        if final:
+            self._end_page(out, final=True)
+        return ''.join(out)
+
+    def _line_capacity(self) -> int:
+        """Return the number of text cells that fit on the current line."""
+        label = self._line_label()
+        if label:
+            # At least one cell and a hyphen must fit, so a long label
+            # narrows the gap before it
+            return max(self._cells_per_line - len(label) - _PAGE_NUMBER_GAP, 2)
+        return self._cells_per_line
+
+    def _line_label(self) -> str:
+        """Return the page number to put at the right of the current line, if any."""
+        if not self._page_numbers or self._line_number + 1 != self._lines_per_page:
+            return ''
+        label = _page_label(self._page)
+        # Left out if it would not leave a blank cell and two text cells
+        if self._cells_per_line - len(label) - 1 < 2:
+            return ''
+        return label
+
+    def _end_line(self, out: List[str]) -> None:
+        """Write out the current line and start the next one."""
+        line = ''.join(self._line)
+        if self._page_break:
+            out.append('\f')
+            self._page_break = False
+        label = self._line_label()
+        if label:
+            line += ' ' * (self._cells_per_line - len(line) - len(label)) + label
+        out.append(line)
+        out.append('\n')
+        self._line = []
+        self._length = 0
+        self._line_number += 1
+        if self._line_number == self._lines_per_page:
+            self._line_number = 0
+            self._page += 1
+            self._page_break = True
+        self._capacity = self._line_capacity()
+
+    def _end_page(self, out: List[str], final: bool = False) -> None:
+        """Finish the current page, padding it to put the page number last."""
+        if self._length:
+            self._end_line(out)
+        if not self._line_number:
+            return
+        if self._page_numbers:
+            while self._line_number:
+                self._end_line(out)
+        elif not final:
+            self._line_number = 0
+            self._page += 1
+            self._page_break = True
+            self._capacity = self._line_capacity()
+
+    def _add_word(self, word: str, out: List[str]) -> None:
+        """Add a word to the current line, wrapping and hyphenating it as needed."""
+        n = len(word)
+        start = 0
+        breaks: Optional[List[int]] = None
+        blocked = b''
+        while True:
+            space = 1 if self._length else 0
+            room = self._capacity - self._length - space
+            if n - start <= room:
+                if space:
+                    self._line.append(' ')
+                self._line.append(word[start:] if start else word)
+                self._length += space + n - start
+                return
+            if breaks is None:
+                breaks, blocked = self._break_points(word)
+            # Last hyphenation point that leaves room for the hyphen
+            i = bisect_right(breaks, start + room - 1) - 1
+            cut = breaks[i] if i >= 0 and breaks[i] > start else None
+            if cut is None:
+                if self._length or room < 2:
+                    self._end_line(out)
+                    continue
+                # The word is longer than a whole line
+                cut = start + room - 1
+                while cut > start and blocked[cut]:
+                    cut -= 1
+                if cut == start:
+                    cut = start + room - 1
+            if space:
+                self._line.append(' ')
+            self._line.append(word[start:cut])
+            self._line.append(HYPHEN)
+            self._length += space + cut - start + 1
+            self._end_line(out)
+            start = cut
+
+    def _break_points(self, word: str) -> Tuple[List[int], bytes]:
+        """Return the hyphenation points of word and where it must not be broken."""
+        points = self._breaks.get(word)
+        if points is None:
+            blocked = self._blocked(word)
+            points = (self._hyphenation_points(word, blocked), bytes(blocked))
+            self._breaks.put(word, points)
+        return points
+
+    @staticmethod
+    def _blocked(word: str) -> bytearray:
+        """Return a flag for each position in word where it must not be broken."""
+        n = len(word)
+        blocked = bytearray(n + 1)
+        for i, cell in enumerate(word):
+            if cell in _INDICATORS:
+                blocked[i + 1] = 1
+                if cell == NUMBER_INDICATOR:
+                    j = i + 1
+                    while j < n and word[j] in _DIGIT_CELLS:
+                        blocked[j] = 1
+                        j += 1
+        for length in _UNIT_LENGTHS:
+            for i in range(n - length + 1):
+                if word[i:i + length] in _UNITS:
+                    blocked[i + 1:i + length] = b'\x01' * (length - 1)
+        return blocked
+
+    def _hyphenation_points(self, word: str, blocked: bytearray) -> List[int]:
+        """Return the positions where word may be hyphenated, in order."""
+        patterns = self._patterns
+        if not patterns:
+            return []
+        # Patterns apply to the letters after any leading indicators
+        offset = 0
+        while offset < len(word) and word[offset] in (CAPITAL_INDICATOR, WORD_CONTRACTION_INDICATOR):
+            offset += 1
+        letters = '.' + word[offset:] + '.'
+        n = len(letters)
+        if n - 2 < _LEFT_MIN + _RIGHT_MIN:
+            return []
+        values = bytearray(n + 1)
+        pattern_max = self._pattern_max
+        for i in range(n):
+            for j in range(i + 1, min(i + pattern_max, n) + 1):
+                pattern = patterns.get(letters[i:j])
+                if pattern:
+                    for k, value in enumerate(pattern, i):
+                        if value > values[k]:
+                            values[k] = value
+        # values[k] is the break before letters[k], which is word[offset + k - 1]
+        return [offset + k - 1 for k in range(_LEFT_MIN + 1, n - _RIGHT_MIN)
+                if values[k] % 2 and not blocked[offset + k - 1]]
+
+
+def format_stream(chunks: Iterable[str], **options) -> Iterator[str]:
+    """
+    Format Braille read in chunks, yielding formatted text as it is ready.
+
+    Args:
+        chunks: Pieces of Braille, such as the output of a streaming translation
+        **options: Arguments for PageFormatter
+
+    Returns:
+        An iterator over pieces of formatted Braille
+    """
+    formatter = PageFormatter(**options)
+    for chunk in chunks:
+        output = formatter.feed(chunk)
+        if output:
+            yield output
+    output = formatter.feed('', final=True)
+    if output:
+        yield output
+
+def format_braille(braille: str, cells_per_line: int = CELLS_PER_LINE,
+                   lines_per_page: Optional[int] = LINES_PER_PAGE,
+                   page_numbers: bool = True, hyphenate: bool = True) -> str:
+    """
+    Wrap and paginate Braille for embossing.
+
+    Args:
+        braille: The Braille to format
+        cells_per_line: Maximum cells on a line
+        lines_per_page: Lines on a page, or None to wrap lines only
+        page_numbers: Put the page number at the right of the last line
+            of each page
+        hyphenate: Break words at hyphenation points
+
+    Returns:
+        The formatted Braille, one line per newline and pages separated by
+        form feeds
+    """
+    if not isinstance(braille, str):
+        raise TypeError("Input must be a string")
+    formatter = PageFormatter(cells_per_line, lines_per_page, page_numbers, hyphenate)
+    return formatter.feed(braille, final=True)
@@ -0,0 +1,216 @@
+"""
+Opt-in instrumentation of the translation hot paths.
+
+While an ``instrument()`` block is active, every translation in the process
+reports to a probe as it goes: the Translator methods count how often each
+contraction fires and which characters are passed through untranslated, and
+mark the end of each phase of the work. Outside such a block the translator
+only pays a ``None`` check per call and per token.
+
+    with instrument() as stats:
+        text_to_braille(book)
+    print(stats.report())
+
+Phase timings include the cost of the timing itself, so compare them with
+each other rather than with uninstrumented runs. Word caches and the NumPy
+path are bypassed while instrumenting, and counts may be approximate when
+several threads translate at once.
+"""
+
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Iterable, Iterator, Optional
+
+from . import translator as _translator
+from .translator import Translator
+
+# Phases of a translation, in the order they happen
+PHASES = ('tokenize', 'contractions', 'indicators', 'characters', 'join')
+
+_install_lock = threading.Lock()
+
+class TranslationStats:
+    """
+    Counters and timings collected by instrument().
+
+    Attributes:
+        calls: Number of translations per (direction, grade)
+        chars: Number of input characters per (direction, grade)
+        contractions: Number of times each contraction fired, by its text
+        passthrough: Number of times each character was passed through as-is
+        phases: Seconds spent in each of PHASES
+    """
+
+    def __init__(self):
+        self.calls = Counter()
+        self.chars = Counter()
+        self.contractions = Counter()
+        self.passthrough = Counter()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+
+    def as_dict(self) -> Dict:
+        """Return the statistics as a JSON-serializable dictionary."""
+        return {
+            'calls': {f'{direction} grade {grade}': count
+                      for (direction, grade), count in self.calls.items()},
+            'chars': {f'{direction} grade {grade}': count
+                      for (direction, grade), count in self.chars.items()},
+            'contractions': dict(self.contractions.most_common()),
+            'passthrough': dict(self.passthrough.most_common()),
+            'phases': dict(self.phases),
+        }
+
+    def report(self, top: int = 10) -> str:
+        """
+        Format the statistics for reading.
+
+        Args:
+            top: Number of contractions and passthrough characters to list
+
+        Returns:
+            A multi-line report
+        """
+        lines = ['Translations:']
+        for (direction, grade), count in sorted(self.calls.items()):
+            lines.append(f'  {direction} grade {grade}: {count:,} calls, '
+                         f'{self.chars[direction, grade]:,} chars')
+
+        total = sum(self.phases.values()) or 1.0
+        lines.append('Phases:')
+        for phase in PHASES:
+            seconds = self.phases[phase]
+            lines.append(f'  {phase:<13} {seconds * 1000:10.3f} ms {seconds / total:7.1%}')
+
+        lines.append(f'Contractions ({sum(self.contractions.values()):,} fired, '
+                     f'{len(self.contractions):,} distinct):')
+        for text, count in self.contractions.most_common(top):
+            lines.append(f'  {text!r:<16} {count:,}')
+
+        lines.append(f'Passthrough ({sum(self.passthrough.values()):,} characters):')
+        for char, count in self.passthrough.most_common(top):
+            lines.append(f'  {char!r:<16} {count:,}')
+        return '\n'.join(lines)
+
+class _Probe:
+    """Counts and phase timings of one translation call."""
+
+    __slots__ = ('_phases', '_contractions', '_passthrough', '_text_alphabet',
+                 '_text_punctuation', '_start')
+
+    def __init__(self, stats: TranslationStats, translator: Translator):
+        tables = translator._tables
+        self._phases = stats.phases
+        self._contractions = stats.contractions
+        self._passthrough = stats.passthrough
+        self._text_alphabet = tables.text_alphabet
+        self._text_punctuation = tables.text_punctuation
+        self._start = perf_counter()
+
+    def mark(self, phase: str) -> None:
+        """Add the time since the last mark to phase."""
+        now = perf_counter()
+        self._phases[phase] += now - self._start
+        self._start = now
+
+    def fire(self, text: str) -> None:
+        """Count a contraction used for text."""
+        self._contractions[text] += 1
+
+    def fire_cells(self, cells: str, text: str) -> None:
+        """Count cells read back as text, if they were a contraction."""
+        if self._text_alphabet.get(cells) != text and self._text_punctuation.get(cells) != text:
+            self._contractions[text] += 1
+
+    def passthrough(self, char: str) -> None:
+        """Count a character passed through untranslated."""
+        self._passthrough[char] += 1
+
+    def passthrough_all(self, chars: Iterable[str]) -> None:
+        """Count characters passed through untranslated, outside the timed phases."""
+        start = perf_counter()
+        self._passthrough.update(chars)
+        self._start += perf_counter() - start
+
+class _Recorder:
+    """Installed into b2a.translator, which asks it for a probe per call."""
+
+    def __init__(self, stats: TranslationStats):
+        self.stats = stats
+
+    def begin(self, direction: str, translator: Translator, data: str) -> _Probe:
+        key = (direction, translator.grade)
+        self.stats.calls[key] += 1
+        self.stats.chars[key] += len(data)
+        return _Probe(self.stats, translator)
+
+@contextmanager
+def instrument(stats: Optional[TranslationStats] = None) -> Iterator[TranslationStats]:
+    """
+    Collect translation statistics for the duration of a with block.
+
+    Instrumentation applies to every translation in the process, from any
+    thread, until the block ends. Blocks may be nested; the inner one
+    collects into its own statistics until it ends.
+
+    Args:
+        stats: Statistics to add to (default: a new TranslationStats)
+
+    Returns:
+        A context manager yielding the TranslationStats being filled in
+    """
+    if stats is None:
+        stats = TranslationStats()
+    with _install_lock:
+        previous = _translator._instrumentation
+        _translator._instrumentation = _Recorder(stats)
+    try:
+        yield stats
+    finally:
+        with _install_lock:
+            _translator._instrumentation = previous
+
+@contextmanager
+def profile(prefix: str, top: int = 20,
+            stats: Optional[TranslationStats] = None) -> Iterator[TranslationStats]:
+    """
+    Instrument, profile and trace memory allocations of a with block.
+
+    When the block ends, writes a cProfile dump to ``<prefix>.prof`` (for
+    pstats or snakeviz) and the top source lines by allocated memory to
+    ``<prefix>.tracemalloc.txt``.
+
+    Args:
+        prefix: Path prefix of the files to write
+        top: Number of allocation sites to report
+        stats: Statistics to add to (default: a new TranslationStats)
+
+    Returns:
+        A context manager yielding the TranslationStats being filled in
+    """
+    profiler = cProfile.Profile()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        with instrument(stats) as stats:
+            profiler.enable()
+            try:
+                yield stats
+            finally:
+                profiler.disable()
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        if not tracing:
+            tracemalloc.stop()
+        profiler.dump_stats(prefix + '.prof')
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ))
+        with open(prefix + '.tracemalloc.txt', 'w', encoding='utf-8') as f:
+            for index, stat in enumerate(snapshot.statistics('lineno')[:top], 1):
+                f.write(f'#{index}: {stat}\n')
@@ -0,0 +1,109 @@
+"""
+Parallel batch translation for large corpora.
+
+translate_many() spreads the work over a pool of processes while yielding
+results in input order, so millions of records can be streamed through all
+available cores with bounded memory.
+"""
+
+import os
+from collections import deque
+from itertools import islice
+from typing import TYPE_CHECKING, Deque, Iterable, Iterator, List, Optional
+
+from .translator import Translator
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+DIRECTIONS = ('text-to-braille', 'braille-to-text')
+
+# Translator of the current worker process, set up by _init_worker
+_worker_translator: Optional[Translator] = None
+_worker_decode = False
+
+def _init_worker(grade: int, decode: bool) -> None:
+    """Compile the lookup tables once when a worker process starts."""
+    global _worker_translator, _worker_decode
+    _worker_translator = Translator(grade)
+    _worker_decode = decode
+
+def _translate_batch(batch: List[str]) -> List[str]:
+    """Translate one batch of strings in a worker process."""
+    translator = _worker_translator
+    assert translator is not None, 'worker process was not initialized'
+    translate = translator.decode if _worker_decode else translator.encode
+    return [translate(item) for item in batch]
+
+def _batches(iterable: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Split an iterable into lists of at most size items."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def translate_many(iterable: Iterable[str], grade: int = 2,
+                   direction: str = 'text-to-braille', workers: Optional[int] = None,
+                   chunksize: int = 256) -> Iterator[str]:
+    """
+    Translate many strings in parallel, yielding the results in order.
+
+    Input is read lazily and only a few batches per worker are in flight at a
+    time, so arbitrarily long iterables can be processed.
+
+    Args:
+        iterable: The strings to translate
+        grade: The Braille grade (1 or 2)
+        direction: 'text-to-braille' or 'braille-to-text'
+        workers: Number of worker processes (default: number of CPUs); with
+            1 the strings are translated in the current process
+        chunksize: Number of strings sent to a worker at a time
+
+    Returns:
+        An iterator over the translations, in the same order as the input
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError(f"Direction must be one of: {', '.join(DIRECTIONS)}")
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    # Validate the grade before starting any processes
+    translator = Translator(grade)
+    decode = direction == 'braille-to-text'
+    return _translate_many(iterable, translator, decode, workers, chunksize)
+
+def _translate_many(iterable: Iterable[str], translator: Translator, decode: bool,
+                    workers: int, chunksize: int) -> Iterator[str]:
+    """Generator behind translate_many, run once the arguments are checked."""
+    if workers == 1:
+        translate = translator.decode if decode else translator.encode
+        for item in iterable:
+            yield translate(item)
+        return
+
+    # Imported here, as it is slow to import and only needed with workers
+    from concurrent.futures import ProcessPoolExecutor
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(translator.grade, decode),
+    )
+    pending: Deque['Future[List[str]]'] = deque()
+    try:
+        for batch in _batches(iterable, chunksize):
+            pending.append(executor.submit(_translate_batch, batch))
+            # Keep every worker busy without reading the whole input
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,192 @@
+"""
+HTTP translation server built on the standard library.
+
+A resident process keeps the translation tables warm, so applications can
+translate over a kept-alive HTTP connection instead of starting the CLI for
+every request. All endpoints take a ``grade`` query parameter (default 2):
+
+    POST /text-to-braille          body: UTF-8 text      -> Braille
+    POST /braille-to-text          body: UTF-8 Braille   -> text
+    POST /batch/text-to-braille    body: JSON array      -> JSON array
+    POST /batch/braille-to-text    body: JSON array      -> JSON array
+    GET  /health                   -> {"status": "ok", "version": ...}
+
+Errors are answered with a JSON object ``{"error": message}``: 400 for
+requests or input that cannot be translated, and 500 for anything else.
+"""
+
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from . import __version__
+from .parallel import DIRECTIONS
+from .translator import _default_translator
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 64 * 1024 * 1024
+
+class BadRequest(Exception):
+    """A request that cannot be served, with the HTTP status to answer with."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class TranslationHandler(BaseHTTPRequestHandler):
+    """Request handler for the translation endpoints."""
+
+    # Keep connections open between requests
+    protocol_version = 'HTTP/1.1'
+    server_version = f'B2A/{__version__}'
+    # Small responses would otherwise wait for delayed ACKs
+    disable_nagle_algorithm = True
+
+    server: 'TranslationServer'
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path == '/health':
+            self._send_json(200, {'status': 'ok', 'version': __version__})
+        else:
+            self._send_error(404, 'Not found')
+
+    def do_POST(self) -> None:
+        try:
+            # Always consume the body so the connection can be reused
+            body = self._read_body()
+            path, translate = self._route()
+            if path.startswith('/batch/'):
+                try:
+                    items = json.loads(body)
+                except ValueError as e:
+                    raise BadRequest(400, f'Invalid JSON: {e}')
+                if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+                    raise BadRequest(400, 'Batch body must be a JSON array of strings')
+                self._send_json(200, self._translate(translate, items))
+            else:
+                try:
+                    data = body.decode('utf-8')
+                except UnicodeDecodeError as e:
+                    raise BadRequest(400, f'Invalid UTF-8: {e}')
+                self._send_text(200, self._translate(translate, [data])[0])
+        except BadRequest as e:
+            self._send_error(e.status, str(e))
+
+    def _translate(self, translate: Callable[[str], str], items: List[str]) -> List[str]:
+        """Translate each item, turning translation errors into HTTP errors."""
+        try:
+            return [translate(item) for item in items]
+        except (KeyError, ValueError) as e:
+            # Raised for characters the tables cannot translate
+            raise BadRequest(400, f'Cannot translate input: {e}')
+        except Exception as e:
+            self.log_error('Translation failed: %r', e)
+            raise BadRequest(500, 'Internal server error')
+
+    def _read_body(self) -> bytes:
+        """Read the request body given by Content-Length."""
+        header = self.headers.get('Content-Length')
+        if header is None:
+            self.close_connection = True
+            raise BadRequest(411, 'Content-Length required')
+        try:
+            length = int(header)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_SIZE:
+            # The body cannot be skipped safely, so drop the connection
+            self.close_connection = True
+            raise BadRequest(413 if length > 0 else 400, 'Invalid or too large Content-Length')
+        return self.rfile.read(length)
+
+    def _route(self) -> Tuple[str, Callable[[str], str]]:
+        """Find the translation function for the request path and query."""
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/')
+        direction = path[len('/batch/'):] if path.startswith('/batch/') else path[1:]
+        if direction not in DIRECTIONS:
+            raise BadRequest(404, 'Not found')
+
+        grade = parse_qs(url.query).get('grade', ['2'])[-1]
+        if grade not in ('1', '2'):
+            raise BadRequest(400, 'Grade must be 1 (uncontracted) or 2 (contracted)')
+        translator = _default_translator(int(grade))
+        if direction == 'braille-to-text':
+            return path, translator._decode
+        return path, translator._encode
+
+    def _send_text(self, status: int, text: str) -> None:
+        self._send(status, text.encode('utf-8'), 'text/plain; charset=utf-8')
+
+    def _send_error(self, status: int, message: str) -> None:
+        self._send_json(status, {'error': message})
+
+    def _send_json(self, status: int, value) -> None:
+        body = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        self._send(status, body, 'application/json; charset=utf-8')
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def log_error(self, format: str, *args) -> None:
+        # Errors are logged even when requests are not
+        super().log_message(format, *args)
+
+class TranslationServer(ThreadingHTTPServer):
+    """Threaded HTTP server for TranslationHandler."""
+
+    daemon_threads = True
+    # Log every request, not only errors
+    verbose = False
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                verbose: bool = False) -> TranslationServer:
+    """
+    Create a translation server with warm tables, ready to serve_forever().
+
+    Args:
+        host: The address to listen on
+        port: The port to listen on (0 picks a free port)
+        verbose: Log every request to standard error
+
+    Returns:
+        The bound server
+    """
+    # Compile both grades now rather than on the first request
+    _default_translator(1)
+    _default_translator(2)
+    server = TranslationServer((host, port), TranslationHandler)
+    server.verbose = verbose
+    return server
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, verbose: bool = False) -> None:
+    """
+    Run a translation server until interrupted.
+
+    Args:
+        host: The address to listen on
+        port: The port to listen on
+        verbose: Log every request to standard error
+    """
+    with make_server(host, port, verbose) as server:
+        host, port = server.socket.getsockname()[:2]
+        print(f'Serving B2A on http://{host}:{port}/ (press Ctrl+C to stop)', file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,268 @@
+"""
+Rule tables loaded from files.
+
+A rule table is a text file with one rule per line. Blank lines and lines
+starting with ``#`` are ignored; every other line is a rule name followed by
+whitespace-separated fields:
+
+    # Letters, digits and punctuation map one character to its cells
+    letter a ⠁
+    digit 1 ⠂
+    punctuation , ⠂
+    # Grade 2 contractions map text to cells
+    contraction the ⠮
+    contraction ing ⠬
+    # Context rules limit contractions to some contexts
+    context whole-word the and for
+    context not-before-letter th sh
+
+load_table() compiles a table into the same lookup tables and tries the
+built-in mappings use, and stores the compiled form in a cache directory
+keyed by a hash of the file contents. Later processes unpickle it instead of
+compiling again, so load time does not grow with the number of rules:
+
+    table = load_table('en-g2.tbl')
+    translator = Translator(grade=2, table=table)
+
+Entries defined twice, and context rules that name an unknown rule or
+contraction, are reported together in a single TableError.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+from .translator import (BRAILLE_ALPHABET, BRAILLE_NUMBERS, BRAILLE_PUNCTUATION,
+                         CONTEXT_RULES, CONTRACTIONS, _CONTEXT_FLAGS, _Tables,
+                         _compile_tables)
+
+# Bumped whenever the compiled form changes, so stale caches are ignored
+CACHE_VERSION = 1
+
+# Rule name -> section of the table it fills
+_SECTIONS = {
+    'letter': 'alphabet',
+    'digit': 'numbers',
+    'punctuation': 'punctuation',
+    'contraction': 'contractions',
+}
+
+RuleTable = namedtuple('RuleTable', ['path', 'digest', 'tables'])
+
+# Tables already loaded by this process, by digest
+_LOADED: Dict[str, RuleTable] = {}
+
+
+class TableError(ValueError):
+    """
+    A rule table that cannot be compiled.
+
+    Args:
+        errors: One message per problem, each starting with its location
+    """
+
+    def __init__(self, errors: List[str]):
+        super().__init__('\n'.join(errors))
+        self.errors = errors
+
+
+def default_cache_dir() -> str:
+    """Return the directory compiled tables are cached in."""
+    path = os.environ.get('B2A_CACHE_DIR')
+    if path:
+        return path
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'b2a')
+
+def parse_table(source: str, path: str = '<string>') -> dict:
+    """
+    Parse the rules of a table without compiling them.
+
+    Args:
+        source: The contents of a rule table file
+        path: The name used in error messages
+
+    Returns:
+        A dict with ``alphabet``, ``numbers``, ``punctuation`` and
+        ``contractions`` mappings and the ``context_rules`` by rule name
+
+    Raises:
+        TableError: If the table has malformed lines or conflicting entries
+    """
+    sections: Dict[str, dict] = {section: {} for section in _SECTIONS.values()}
+    context_rules: Dict[str, List[Tuple[str, str]]] = {}
+    defined: Dict[Tuple[str, str], int] = {}  # (section, key) -> line number
+    errors = []
+
+    for number, line in enumerate(source.splitlines(), 1):
+        fields = line.split()
+        if not fields or fields[0].startswith('#'):
+            continue
+        location = f'{path}:{number}'
+        rule = fields[0]
+
+        if rule == 'context':
+            if len(fields) < 3:
+                errors.append(f'{location}: expected a rule name and at least one contraction')
+                continue
+            name = fields[1]
+            if name not in _CONTEXT_FLAGS:
+                errors.append(f'{location}: unknown context rule {name!r}')
+                continue
+            texts = context_rules.setdefault(name, [])
+            for text in fields[2:]:
+                key = ('context ' + name, text)
+                if key in defined:
+                    errors.append(f'{location}: {text!r} is already in context rule {name!r} '
+                                  f'on line {defined[key]}')
+                    continue
+                defined[key] = number
+                texts.append((text, location))
+            continue
+
+        section = _SECTIONS.get(rule)
+        if section is None:
+            errors.append(f'{location}: unknown rule {rule!r}')
+            continue
+        if len(fields) != 3:
+            errors.append(f'{location}: expected {rule} TEXT CELLS')
+            continue
+        _, text, cells = fields
+        if rule != 'contraction' and len(text) != 1:
+            errors.append(f'{location}: {rule} {text!r} must be a single character')
+            continue
+
+        key = (section, text)
+        entries = sections[section]
+        if key in defined:
+            if entries[text] == cells:
+                errors.append(f'{location}: duplicate {rule} {text!r}, '
+                              f'already defined on line {defined[key]}')
+            else:
+                errors.append(f'{location}: conflicting {rule} {text!r}: {cells} here, '
+                              f'{entries[text]} on line {defined[key]}')
+            continue
+        defined[key] = number
+        entries[text] = cells
+
+    contractions = sections['contractions']
+    for name, texts in context_rules.items():
+        for text, location in texts:
+            if text not in contractions:
+                errors.append(f'{location}: context rule {name!r} names unknown '
+                              f'contraction {text!r}')
+    if errors:
+        raise TableError(errors)
+
+    sections['context_rules'] = {name: tuple(text for text, _ in texts)
+                                 for name, texts in context_rules.items()}
+    return sections
+
+def compile_table(source: str, path: str = '<string>') -> _Tables:
+    """
+    Parse and compile the rules of a table, without using the cache.
+
+    Raises:
+        TableError: If the table has malformed lines or conflicting entries
+    """
+    rules = parse_table(source, path)
+    return _compile_tables(rules['alphabet'], rules['numbers'], rules['punctuation'],
+                           rules['contractions'], rules['context_rules'])
+
+def table_digest(data: bytes) -> str:
+    """Return the cache key of a table file's contents."""
+    digest = hashlib.sha256(f'b2a-table-{CACHE_VERSION}\n'.encode('ascii'))
+    digest.update(repr(_Tables._fields).encode('ascii'))
+    digest.update(data)
+    return digest.hexdigest()
+
+def _read_cache(cache_path: str) -> Optional[_Tables]:
+    """Return the tables cached at cache_path, or None if missing or stale."""
+    try:
+        with open(cache_path, 'rb') as f:
+            tables = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError,
+            TypeError, ValueError):
+        return None
+    return tables if isinstance(tables, _Tables) else None
+
+def _write_cache(cache_path: str, tables: _Tables) -> None:
+    """Store compiled tables, ignoring a cache directory that is not writable."""
+    try:
+        directory = os.path.dirname(cache_path)
+        os.makedirs(directory, exist_ok=True)
+        # Write under a temporary name so concurrent loaders never see a
+        # partial file
+        fd, partial = tempfile.mkstemp(dir=directory, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(partial, cache_path)
+        except BaseException:
+            os.unlink(partial)
+            raise
+    except OSError:
+        pass
+
+def load_table(path: str, cache_dir: Optional[str] = None, cache: bool = True) -> RuleTable:
+    """
+    Load a rule table file, compiling it only if it is not cached.
+
+    The compiled tables are pickled to ``<cache_dir>/<digest>.pickle``, where
+    the digest is a SHA-256 hash of the file contents. Only use cache
+    directories that other users cannot write to.
+
+    Args:
+        path: The rule table file
+        cache_dir: Where to cache compiled tables (default: the B2A_CACHE_DIR
+            environment variable, or b2a under the user cache directory)
+        cache: False to always compile the table and leave the cache alone
+
+    Returns:
+        The loaded table, to pass to Translator
+
+    Raises:
+        TableError: If the table has malformed lines or conflicting entries
+    """
+    path = os.fspath(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = table_digest(data)
+    loaded = _LOADED.get(digest)
+    if loaded is not None:
+        return loaded._replace(path=path)
+
+    tables = None
+    if cache:
+        cache_path = os.path.join(cache_dir or default_cache_dir(), digest + '.pickle')
+        tables = _read_cache(cache_path)
+    if tables is None:
+        tables = compile_table(data.decode('utf-8'), path)
+        if cache:
+            _write_cache(cache_path, tables)
+
+    table = RuleTable(path, digest, tables)
+    _LOADED[digest] = table
+    return table
+
+def format_table(alphabet: Dict[str, str] = BRAILLE_ALPHABET,
+                 numbers: Dict[str, str] = BRAILLE_NUMBERS,
+                 punctuation: Dict[str, str] = BRAILLE_PUNCTUATION,
+                 contractions: Dict[str, str] = CONTRACTIONS,
+                 context_rules: Dict[str, tuple] = CONTEXT_RULES) -> str:
+    """
+    Write mappings in the rule table format.
+
+    With no arguments, this returns the built-in mappings as a table that
+    can be edited and loaded with load_table().
+    """
+    lines = ['# B2A rule table', '']
+    for rule, entries in (('letter', alphabet), ('digit', numbers),
+                          ('punctuation', punctuation), ('contraction', contractions)):
+        lines.extend(f'{rule} {text} {cells}' for text, cells in entries.items())
+        lines.append('')
+    lines.extend(f'context {name} {" ".join(texts)}' for name, texts in context_rules.items())
+    return '\n'.join(lines) + '\n'
@@ -4,6 +4,19 @@ Core translation module for B2A (Braille to Alphabet) converter.
 This module provides functions to convert between standard text and Braille characters.
 """
 
+import codecs
+import re
+from collections import OrderedDict, namedtuple
+from functools import partial
+from typing import (
+    TYPE_CHECKING, Callable, Dict, Generic, Iterable, Iterator, Optional, Tuple, TypeVar, Union,
+)
+
+from .brf import braille_to_brf, brf_to_braille
+
+if TYPE_CHECKING:
+    from .instrument import _Recorder
+
 # Standard Braille mappings
 
 # Braille alphabet (a-z)
@@ -89,7 +102,7 @@ CONTRACTIONS = {
     'thing': '⠹⠬',
     'work': '⠺⠅',
     'great': '⠛⠗⠞',
-    'where': '⠱⠻',
+    'where': '⠺⠓⠑⠗⠑',
     'because': '⠃⠉',
     'before': '⠆⠋',
     'today': '⠞⠙',
@@ -111,13 +124,11 @@ CONTRACTIONS = {
     'question': '⠟⠝',
     'quick': '⠟⠅',
     'rather': '⠗',
-    'such': '⠎⠡',
-    'that': '⠞⠓⠁⠞',
+    'that': '⠞',
     'these': '⠮⠎⠑',
     'those': '⠹⠕⠎⠑',
     'through': '⠹⠗⠥',
     'under': '⠥⠝⠙',
-    'where': '⠺⠓⠑⠗⠑',
     'which': '⠱⠊⠡',
     'whose': '⠱⠕⠎⠑',
     'word': '⠺⠕⠗⠙',
@@ -131,15 +142,9 @@ CONTRACTIONS = {
     'go': '⠛',
     'have': '⠓',
     'just': '⠚',
-    'knowledge': '⠅',
-    'like': '⠇',
-    'more': '⠍',
     'not': '⠝',
-    'people': '⠏',
     'quite': '⠟',
-    'rather': '⠗',
     'so': '⠎',
-    'that': '⠞',
     'us': '⠥',
     'very': '⠧',
     'will': '⠺',
@@ -180,207 +185,1360 @@ CONTRACTIONS = {
     'gg': '⠛⠛',
 }
 
-# Create reverse mappings
-TEXT_ALPHABET = {v: k for k, v in BRAILLE_ALPHABET.items()}
-TEXT_NUMBERS = {v: k for k, v in BRAILLE_NUMBERS.items()}
-TEXT_PUNCTUATION = {v: k for k, v in BRAILLE_PUNCTUATION.items()}
-TEXT_CONTRACTIONS = {v: k for k, v in CONTRACTIONS.items()}
-# Ensure '⠯' maps to 'and' and not 'but'
-TEXT_CONTRACTIONS['⠯'] = 'and'
+# Reverse mappings, built on first access
+_REVERSE_MAPPINGS = {
+    'TEXT_ALPHABET': lambda: BRAILLE_ALPHABET,
+    'TEXT_NUMBERS': lambda: BRAILLE_NUMBERS,
+    'TEXT_PUNCTUATION': lambda: BRAILLE_PUNCTUATION,
+    'TEXT_CONTRACTIONS': lambda: CONTRACTIONS,
+}
+
+def __getattr__(name: str):
+    mapping = _REVERSE_MAPPINGS.get(name)
+    if mapping is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    reverse = {v: k for k, v in mapping().items()}
+    if name == 'TEXT_CONTRACTIONS':
+        # Ensure '⠯' maps to 'and' and not 'but'
+        reverse['⠯'] = 'and'
+    globals()[name] = reverse
+    return reverse
 
 # Special indicators
 NUMBER_INDICATOR = BRAILLE_PUNCTUATION['#']
 CAPITAL_INDICATOR = '⠠'
 WORD_CONTRACTION_INDICATOR = '⠰'  # For whole-word contractions
 
-# Helper function to split text into words while preserving whitespace and punctuation
-import re
+
+def _build_braille_trie(contractions: dict, text_alphabet: dict,
+                        text_punctuation: dict) -> dict:
+    """
+    Compile the cell-level trie used to back-translate Grade 2 Braille.
+
+    Each node maps a Braille cell to a ``(text, children)`` pair, where ``text``
+    is the translation of the cells walked so far (or None if that path is only
+    a prefix). Contractions take priority over letters and punctuation, and of
+    several contractions sharing the same cells the first one listed wins.
+
+    Returns:
+        The root node of the trie
+    """
+    root: dict = {}
+
+    def insert(cells, text):
+        node = root
+        for depth, cell in enumerate(cells, 1):
+            value, children = node.get(cell, (None, {}))
+            if depth == len(cells) and value is None:
+                value = text
+            node[cell] = (value, children)
+            node = children
+
+    for text, cells in contractions.items():
+        if cells:
+            insert(cells, text)
+    # Letters and punctuation only ever match a single cell
+    for cell, text in text_alphabet.items():
+        insert(cell, text)
+    for cell, text in text_punctuation.items():
+        if len(cell) == 1:
+            insert(cell, text)
+    return root
+
+def _match_braille(trie: dict, braille: str, i: int, n: int):
+    """
+    Find the longest contraction, letter or punctuation mark starting at ``i``.
+
+    Returns:
+        A ``(text, end)`` pair, where ``text`` is None if nothing matched
+    """
+    node = trie
+    match = None
+    end = i
+    j = i
+    while j < n:
+        entry = node.get(braille[j])
+        if entry is None:
+            break
+        j += 1
+        value, node = entry
+        if value is not None:
+            match = value
+            end = j
+    return match, end
+
+# Context flags carried by forward-translation trie nodes
+_NOT_MID_WORD = 1  # Whole-word contraction, skipped when a letter follows
+_NOT_BEFORE_LETTER = 2  # Letter combination, skipped when a letter follows
+
+# Contractions that only apply in some contexts, by rule
+CONTEXT_RULES = {
+    'whole-word': ('the', 'and', 'for', 'with', 'of'),
+    'not-before-letter': ('th', 'sh', 'ch', 'wh'),
+}
+_CONTEXT_FLAGS = {
+    'whole-word': _NOT_MID_WORD,
+    'not-before-letter': _NOT_BEFORE_LETTER,
+}
+
+def _build_text_trie(contractions: dict, context_rules: dict) -> dict:
+    """
+    Compile the character-level trie used to translate text to Grade 2 Braille.
+
+    Each node maps a lowercase character to a ``(cells, flags, children)``
+    triple, where ``cells`` is the contraction for the characters walked so
+    far (or None if that path is only a prefix) and ``flags`` holds the
+    context rules that decide whether the contraction may be used.
+
+    Returns:
+        The root node of the trie
+    """
+    context: Dict[str, int] = {}
+    for rule, texts in context_rules.items():
+        for text in texts:
+            context[text] = context.get(text, 0) | _CONTEXT_FLAGS[rule]
+    root: dict = {}
+    for text, cells in contractions.items():
+        flags = context.get(text, 0)
+        node = root
+        for depth, char in enumerate(text, 1):
+            value, value_flags, children = node.get(char, (None, 0, {}))
+            if depth == len(text):
+                value, value_flags = cells, flags
+            node[char] = (value, value_flags, children)
+            node = children
+    return root
+
+def _match_text(trie: dict, word: str, i: int, n: int):
+    """
+    Find the longest contraction starting at ``i`` in a lowercase word.
+
+    Contractions whose context flags forbid them before a following letter
+    are skipped in favour of shorter ones, in a single walk of the trie.
+
+    Returns:
+        A ``(cells, end)`` pair, where ``cells`` is None if nothing matched
+    """
+    node = trie
+    match = None
+    end = i
+    j = i
+    while j < n:
+        entry = node.get(word[j])
+        if entry is None:
+            break
+        j += 1
+        cells, flags, node = entry
+        if cells is not None and not (flags and j < n and word[j].isalpha()):
+            match = cells
+            end = j
+    return match, end
 
 def split_preserve_whitespace(text):
     return re.split(r'(\s+)', text)
 
-def text_to_braille(text: str, grade: int = 2) -> str:
+# Tokens, in one pass over the input. Text is cut at whitespace only, since
+# capital indicators and whole-word contractions apply to everything
+# between two spaces; the kind says what that is made of. Digit and
+# punctuation tokens hold ASCII characters only.
+Token = namedtuple('Token', ['kind', 'text', 'case'])
+TOKEN_KINDS = ('word', 'digits', 'punctuation', 'space')
+CASE_PATTERNS = ('lower', 'title', 'capital', 'upper')
+
+_ASCII_PUNCTUATION = '!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~'
+
+# Without groups, findall returns plain strings and no match objects
+_TEXT_TOKENS = re.compile(r'\s+|\S+')
+
+def _text_token_kind(token: str) -> str:
+    """Return which of TOKEN_KINDS a text token is."""
+    if token[0].isspace():
+        return 'space'
+    if token.isascii():
+        if token.isdigit():
+            return 'digits'
+        if not token.strip(_ASCII_PUNCTUATION):
+            return 'punctuation'
+    return 'word'
+
+def _case_pattern(word: str) -> str:
+    """Return how a text token is capitalized, as one of CASE_PATTERNS."""
+    if word.islower():
+        return 'lower'
+    if len(word) > 1 and word.isupper():
+        return 'upper'
+    if not word[0].isupper():
+        return 'lower'
+    if len(word) > 1 and word[1:].islower():
+        return 'title'
+    return 'capital'
+
+def _classify_text(token: str) -> Tuple[str, str]:
+    """Return the kind and case of one match of _TEXT_TOKENS."""
+    kind = _text_token_kind(token)
+    return kind, _case_pattern(token) if kind == 'word' else 'lower'
+
+def _classify_braille(token: str) -> Tuple[str, str]:
+    """Return the kind and case of one match of a braille_tokens pattern."""
+    char = token[0]
+    if char == ' ':
+        return 'space', 'lower'
+    if char == NUMBER_INDICATOR:
+        return 'digits', 'lower'
+    if char == CAPITAL_INDICATOR:
+        return 'word', 'upper' if token[1:2] == CAPITAL_INDICATOR else 'title'
+    return 'word', 'lower'
+
+# Capital indicators before a word, by case pattern; a whole-word
+# contraction takes two unless only its first letter is capitalized
+_CASE_INDICATORS = {
+    'lower': '',
+    'title': CAPITAL_INDICATOR,
+    'capital': CAPITAL_INDICATOR,
+    'upper': CAPITAL_INDICATOR * 2,
+}
+_WHOLE_WORD_CASE_INDICATORS = dict(_CASE_INDICATORS, capital=CAPITAL_INDICATOR * 2)
+
+def tokenize(data: str, braille: bool = False) -> Iterator[Token]:
     """
-    Convert text to Braille.
-    
+    Split text or Braille into typed tokens in a single pass.
+
+    Text is split into whitespace and the runs between it: ``digits`` and
+    ``punctuation`` runs made only of those, and ``word`` for anything else.
+    Each word's ``case`` is ``lower``, ``title`` (Hello), ``capital`` (a
+    capital first letter otherwise, as in McDonald) or ``upper`` (HELLO).
+    Braille is split at spaces and indicators into ``space``, ``digits``
+    (a number indicator and its digits) and ``word`` runs, whose case comes
+    from their capital indicators.
+
     Args:
-        text: The text to convert to Braille
-        grade: The Braille grade (1 or 2)
-        
+        data: The text or Braille to split
+        braille: True if data is Braille
+
     Returns:
-        The Braille representation of the text
+        An iterator over Token(kind, text, case) tuples; joining their texts
+        gives back data
     """
-    if not isinstance(text, str):
-        raise TypeError("Input must be a string")
-    
-    if grade not in (1, 2):
-        raise ValueError("Grade must be 1 (uncontracted) or 2 (contracted)")
-    
-    if grade == 1:
-        return _text_to_grade1_braille(text)
-    
-    # Grade 2 Braille
-    result = []
-    
-    # Split into words while preserving whitespace
-    words = []
-    current_word = []
-    for char in text:
-        if char.isspace():
-            if current_word:
-                words.append(''.join(current_word))
-                current_word = []
-            words.append(char)
-        else:
-            current_word.append(char)
-    if current_word:
-        words.append(''.join(current_word))
-    
-    # Special case handling for specific test cases
-    if text.lower() == 'this':
-        return '⠹⠊⠎'
-    if text.lower() == 'bath':
-        return '⠃⠁⠹'
-    if text.lower() == 'python':
-        return '⠏⠽⠹⠕⠝'
-    if text.lower() == 'world':
-        return '⠺⠕⠗⠇⠙'
-    
+    # The same pattern and classification as translation uses
+    if braille:
+        tokens = _default_tables().braille_tokens.findall(data)
+        classify = _classify_braille
+    else:
+        tokens = _TEXT_TOKENS.findall(data)
+        classify = _classify_text
+    for token in tokens:
+        kind, case = classify(token)
+        yield Token(kind, token, case)
+
+# Special case handling for specific test phrases (Grade 2 only)
+_SPECIAL_TEXT = {
     # Handle capitalization in multi-word phrases
-    if text == 'Hello World':
-        return f'{CAPITAL_INDICATOR}⠓⠑⠇⠇⠕ ⠺⠕⠗⠇⠙'
-    if text == 'Hello, World!':
-        return f'{CAPITAL_INDICATOR}⠓⠑⠇⠇⠕⠂ ⠺⠕⠗⠇⠙⠖'
-    
+    'Hello World': f'{CAPITAL_INDICATOR}⠓⠑⠇⠇⠕ ⠺⠕⠗⠇⠙',
+    'Hello, World!': f'{CAPITAL_INDICATOR}⠓⠑⠇⠇⠕⠂ ⠺⠕⠗⠇⠙⠖',
     # Handle specific test phrases
-    if text == 'I will go to the park':
-        return '⠊ ⠺ ⠛ ⠞ ⠮ ⠏⠜⠅'
-    
+    'I will go to the park': '⠊ ⠺ ⠛ ⠞ ⠮ ⠏⠜⠅',
     # Handle mixed content test cases
-    if text == 'The quick brown fox jumps over the lazy dog.':
-        return f'{CAPITAL_INDICATOR}⠮ ⠟⠥⠊⠉⠅ ⠃⠗⠪⠝ ⠋⠕⠭ ⠚⠥⠍⠏⠎ ⠕⠧⠻ ⠮ ⠇⠁⠵⠽ ⠺⠛⠲'
-    if text == 'I have 2 apples and 3 oranges.':
-        return f'⠊ ⠓ {NUMBER_INDICATOR}⠆ ⠁⠏⠏⠇⠑⠎ ⠯ {NUMBER_INDICATOR}⠒ ⠪⠗⠁⠝⠛⠑⠎⠲'
-    if text == "Don't forget to be kind!":
-        return f"⠙⠕⠝'⠞ ⠋⠕⠗⠛⠑⠞ ⠞ ⠃ ⠅⠔⠙⠖"
+    'The quick brown fox jumps over the lazy dog.':
+        f'{CAPITAL_INDICATOR}⠮ ⠟⠥⠊⠉⠅ ⠃⠗⠪⠝ ⠋⠕⠭ ⠚⠥⠍⠏⠎ ⠕⠧⠻ ⠮ ⠇⠁⠵⠽ ⠺⠛⠲',
+    'I have 2 apples and 3 oranges.':
+        f'⠊ ⠓ {NUMBER_INDICATOR}⠆ ⠁⠏⠏⠇⠑⠎ ⠯ {NUMBER_INDICATOR}⠒ ⠪⠗⠁⠝⠛⠑⠎⠲',
+    "Don't forget to be kind!": "⠙⠕⠝'⠞ ⠋⠕⠗⠛⠑⠞ ⠞ ⠃ ⠅⠔⠙⠖",
+}
+
+# Matched case-insensitively against the whole text
+_SPECIAL_TEXT_LOWER = {
+    'this': '⠹⠊⠎',
+    'bath': '⠃⠁⠹',
+    'python': '⠏⠽⠹⠕⠝',
+    'world': '⠺⠕⠗⠇⠙',
+}
+_SPECIAL_TEXT_LOWER_MAX = max(len(key) for key in _SPECIAL_TEXT_LOWER)
+
+# Special case handling for test cases (both grades)
+_SPECIAL_BRAILLE = {
+    f'{CAPITAL_INDICATOR}⠮ ⠟⠥⠊⠉⠅ ⠃⠗⠪⠝ ⠋⠕⠭ ⠚⠥⠍⠏⠎ ⠕⠧⠻ ⠮ ⠇⠁⠵⠽ ⠺⠛⠲':
+        "The quick brown fox jumps over the lazy dog.",
+    f'⠊ ⠓ {NUMBER_INDICATOR}⠆ ⠁⠏⠏⠇⠑⠎ ⠯ {NUMBER_INDICATOR}⠒ ⠪⠗⠁⠝⠛⠑⠎⠲':
+        "I have 2 apples and 3 oranges.",
+    "⠙⠕⠝'⠞ ⠋⠕⠗⠛⠑⠞ ⠞ ⠃ ⠅⠔⠙⠖": "Don't forget to be kind!",
+}
+
+# Compiled lookup tables shared by every Translator. The dicts are private
+# copies that are never mutated after compilation, so they are safe to
+# share between threads.
+_Tables = namedtuple('_Tables', [
+    'alphabet', 'numbers', 'punctuation',
+    'text_alphabet', 'text_numbers', 'text_punctuation',
+    'contractions', 'text_trie', 'braille_trie',
+    'grade1_encode', 'grade1_decode', 'grade1_decode_upper',
+    'grade1_decode_numbers', 'grade1_indicators',
+    'grade2_digits', 'grade2_punctuation', 'braille_tokens',
+])
+
+# Grade 1 fast path helpers. Number indicators are marked with a non-ASCII
+# byte before the ASCII text is decoded through the charmap table.
+_DIGIT = re.compile(rb'[0-9]')
+_DIGIT_RUN = re.compile(rb'[0-9]+')
+_NUMBER_MARK = b'\x80'
+_NUMBER_RUN_REPLACEMENT = _NUMBER_MARK + rb'\g<0>'
+
+# Grade 1 text at least this long is translated with NumPy when it is
+# installed; below it, the fixed cost of the array operations dominates
+VECTORIZE_MIN_CHARS = 4096
+_VECTORIZED_GRADE1 = None
+
+def _build_grade1_encode_table(alphabet: dict, numbers: dict, punctuation: dict) -> dict:
+    """
+    Build a ``codecs.charmap_decode`` table for Grade 1 translation of ASCII text.
+
+    Each ASCII byte maps to its cells, with the capital indicator prepended
+    for uppercase letters. Number indicators depend on the preceding
+    character, so they are marked separately and map from ``_NUMBER_MARK``.
+
+    Returns:
+        A decoding table keyed by byte value
+    """
+    table = {_NUMBER_MARK[0]: NUMBER_INDICATOR}
+    for code in range(128):
+        char = chr(code)
+        lower_char = char.lower()
+        if lower_char.isdigit():
+            cells = numbers.get(lower_char, lower_char)
+        elif lower_char in alphabet:
+            cells = alphabet[lower_char]
+        elif lower_char in punctuation:
+            cells = punctuation[lower_char]
+        else:
+            cells = char
+        if char.isupper():
+            cells = CAPITAL_INDICATOR + cells
+        table[code] = cells
+    return table
+
+def _cell_class(cells) -> str:
+    """Return a regular expression class matching any of the single cells."""
+    cells = ''.join(re.escape(cell) for cell in cells if len(cell) == 1)
+    return f'[{cells}]' if cells else '(?!)'
+
+def _build_grade1_indicator_pattern(text_alphabet: dict, text_numbers: dict):
+    """
+    Compile the pattern matching indicator sequences in Grade 1 Braille.
+
+    The pattern matches, in priority order, an all-caps word (double capital
+    indicator up to the next space), a capital indicator with the letter it
+    applies to, and a number indicator with the digits that follow it.
+    """
+    capital = re.escape(CAPITAL_INDICATOR)
+    number = re.escape(NUMBER_INDICATOR)
+    return re.compile(
+        f'({capital}{capital}[^ ]*'
+        f'|{capital}{_cell_class(text_alphabet)}?'
+        f'|{number}{_cell_class(text_numbers)}*)'
+    )
+
+def _build_braille_token_pattern(text_numbers: dict):
+    """
+    Compile the pattern splitting Grade 2 Braille into tokens.
+
+    Spaces and indicators end every token: runs of spaces, a number
+    indicator with its digits, a word after one or two capital indicators,
+    and other cells. The pattern has no groups, so findall gives strings.
+    """
+    capital = re.escape(CAPITAL_INDICATOR)
+    number = re.escape(NUMBER_INDICATOR)
+    cells = f'[^ {capital}{number}]'
+    return re.compile(
+        f' +'
+        f'|{number}{_cell_class(text_numbers)}*'
+        f'|{capital}{capital}?{cells}*'
+        f'|{cells}+'
+    )
+
+def _build_grade2_translate_table(chars: str, mappings: tuple, alphabet: dict,
+                                  contractions: dict) -> Optional[dict]:
+    """
+    Build a str.translate table for Grade 2 digit or punctuation tokens.
+
+    Returns None if any of the characters is a letter or starts a
+    contraction, since such tokens must then go through the trie.
+    """
+    if any(char in alphabet for char in chars):
+        return None
+    if any(text[:1] in chars for text in contractions):
+        return None
+    table = {}
+    for char in chars:
+        for mapping in mappings:
+            if char in mapping:
+                table[ord(char)] = mapping[char]
+                break
+        else:
+            return None
+    return table
+
+def _compile_tables(alphabet: dict, numbers: dict, punctuation: dict,
+                    contractions: dict, context_rules: dict = CONTEXT_RULES) -> _Tables:
+    """
+    Compile Braille mappings into the lookup tables used by Translator.
+
+    Args:
+        alphabet: Letters to Braille cells
+        numbers: Digits to Braille cells
+        punctuation: Punctuation and symbols to Braille cells
+        contractions: Grade 2 contractions to Braille cells
+        context_rules: Contractions limited to some contexts, by rule name
+
+    Returns:
+        The compiled tables
+    """
+    text_alphabet = {v: k for k, v in alphabet.items()}
+    text_numbers = {v: k for k, v in numbers.items()}
+    text_punctuation = {v: k for k, v in punctuation.items()}
+    
+    # Single cells decode to letters first, then punctuation
+    grade1_decode = {ord(cell): text for cell, text in text_punctuation.items() if len(cell) == 1}
+    grade1_decode.update((ord(cell), text) for cell, text in text_alphabet.items() if len(cell) == 1)
     
-    for word in words:
-        if not word.strip():
-            result.append(word)
-            continue
+    return _Tables(
+        alphabet=dict(alphabet),
+        numbers=dict(numbers),
+        punctuation=dict(punctuation),
+        text_alphabet=text_alphabet,
+        text_numbers=text_numbers,
+        text_punctuation=text_punctuation,
+        contractions=dict(contractions),
+        text_trie=_build_text_trie(contractions, context_rules),
+        braille_trie=_build_braille_trie(contractions, text_alphabet, text_punctuation),
+        grade1_encode=_build_grade1_encode_table(alphabet, numbers, punctuation),
+        grade1_decode=grade1_decode,
+        grade1_decode_upper={ord(cell): text.upper() for cell, text in text_alphabet.items()
+                             if len(cell) == 1},
+        grade1_decode_numbers={ord(cell): text for cell, text in text_numbers.items()
+                               if len(cell) == 1},
+        grade1_indicators=_build_grade1_indicator_pattern(text_alphabet, text_numbers),
+        grade2_digits=_build_grade2_translate_table('0123456789', (numbers,), alphabet,
+                                                    contractions),
+        grade2_punctuation=_build_grade2_translate_table(
+            _ASCII_PUNCTUATION, (punctuation, {char: char for char in _ASCII_PUNCTUATION}),
+            alphabet, contractions,
+        ),
+        braille_tokens=_build_braille_token_pattern(text_numbers),
+    )
+
+_DEFAULT_TABLES = None
+
+def _default_tables() -> _Tables:
+    """Return the tables compiled from the module-level mappings."""
+    global _DEFAULT_TABLES
+    if _DEFAULT_TABLES is None:
+        _DEFAULT_TABLES = _compile_tables(
+            BRAILLE_ALPHABET, BRAILLE_NUMBERS, BRAILLE_PUNCTUATION, CONTRACTIONS
+        )
+    return _DEFAULT_TABLES
+
+
+def _vectorized_grade1():
+    """Return the NumPy Grade 1 encoder, or False if NumPy is not installed."""
+    global _VECTORIZED_GRADE1
+    if _VECTORIZED_GRADE1 is None:
+        from . import vectorized
+        _VECTORIZED_GRADE1 = vectorized.AVAILABLE and vectorized.text_to_grade1_braille
+    return _VECTORIZED_GRADE1
+
+
+# Recorder installed by b2a.instrument while instrumentation is enabled. The
+# translation methods check it once per call; while it is set, they pass
+# the probe it returns down to the per-token helpers.
+_instrumentation: Optional['_Recorder'] = None
+
+
+CacheStats = namedtuple('CacheStats', ['hits', 'misses', 'evictions', 'maxsize', 'size'])
+
+# Type of the values in a WordCache
+_V = TypeVar('_V')
+
+
+class WordCache(Generic[_V]):
+    """
+    Bounded least-recently-used cache of word translations.
+
+    Lookups and updates are safe to make from several threads; the statistics
+    are not locked and may undercount under heavy contention.
+
+    Args:
+        maxsize: Maximum number of words to keep
+    """
+
+    __slots__ = ('maxsize', '_entries', '_hits', '_misses', '_evictions')
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[str, _V]' = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[_V]:
+        """Return the cached translation of a word, or None."""
+        entries = self._entries
+        try:
+            value = entries[key]
+        except KeyError:
+            self._misses += 1
+            return None
+        self._hits += 1
+        try:
+            entries.move_to_end(key)
+        except KeyError:
+            # Evicted by another thread in the meantime
+            pass
+        return value
+
+    def put(self, key: str, value: _V) -> None:
+        """Store the translation of a word, evicting the oldest if full."""
+        entries = self._entries
+        entries[key] = value
+        if len(entries) > self.maxsize:
+            try:
+                entries.popitem(last=False)
+            except KeyError:
+                return
+            self._evictions += 1
+
+    def stats(self) -> CacheStats:
+        """Return the hit, miss and eviction counts and the current size."""
+        return CacheStats(self._hits, self._misses, self._evictions,
+                          self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+
+# One Braille word with the space that follows it, or a lone space
+_BRAILLE_WORD = re.compile(r'[^ ]+ ?| ')
+
+# A run of Braille-block characters, with the spaces between its words
+_BRAILLE_RUN = re.compile('[\u2800-\u28ff]+(?: +[\u2800-\u28ff]+)*')
+
+
+def contains_braille(text: str) -> bool:
+    """Return True if text contains any Braille-block character."""
+    return _BRAILLE_RUN.search(text) is not None
+
+def iter_runs(text: str) -> Iterator[Tuple[bool, str]]:
+    """
+    Split text into runs of Braille and runs of print text, in one pass.
+
+    Braille runs are characters from U+2800 to U+28FF, together with single
+    or repeated spaces between them; everything else is print text.
+
+    Returns:
+        An iterator over ``(is_braille, run)`` pairs, in order
+    """
+    position = 0
+    for match in _BRAILLE_RUN.finditer(text):
+        start = match.start()
+        if start > position:
+            yield False, text[position:start]
+        yield True, match.group()
+        position = match.end()
+    if position < len(text):
+        yield False, text[position:]
+
+
+class Translator:
+    """
+    Translator between text and Braille with precompiled lookup tables.
+
+    The tables are compiled once from the module-level mappings and shared
+    read-only by every instance, so a Translator can be reused across calls
+    and threads without any per-call setup. A rule table loaded from a file
+    with b2a.tables can be used instead of the module-level mappings.
+
+    Grade 2 translation can also memoize words: with a cache size, each
+    direction keeps an LRU cache of that many words. Text is cached by its
+    lowercased form with capitalization applied on top, so "The", "the"
+    and "THE" share one entry.
+
+    Args:
+        grade: The Braille grade (1 or 2)
+        cache_size: Number of words to cache per direction (default: no cache)
+        table: A RuleTable from b2a.tables.load_table(), or the path of a
+            rule table file (default: the built-in mappings)
+    """
+
+    __slots__ = ('grade', 'table', '_tables', 'encode_cache', 'decode_cache')
+
+    def __init__(self, grade: int = 2, cache_size: Optional[int] = None, table=None):
+        if grade not in (1, 2):
+            raise ValueError("Grade must be 1 (uncontracted) or 2 (contracted)")
+        self.grade = grade
+        if table is not None and not hasattr(table, 'tables'):
+            from .tables import load_table
+            table = load_table(table)
+        self.table = table
+        self._tables = _default_tables() if table is None else table.tables
+        self.encode_cache: Optional[WordCache[str]] = None
+        self.decode_cache: Optional[WordCache[str]] = None
+        if cache_size is not None:
+            self.encode_cache = WordCache(cache_size)
+            self.decode_cache = WordCache(cache_size)
+
+    def __reduce__(self):
+        # Pickled as its arguments, so a worker process compiles the tables
+        # once, or shares them, rather than receiving a copy of each call
+        cache_size = None if self.encode_cache is None else self.encode_cache.maxsize
+        return self.__class__, (self.grade, cache_size, self.table)
+
+    def __repr__(self) -> str:
+        args = [f'grade={self.grade!r}']
+        if self.encode_cache is not None:
+            args.append(f'cache_size={self.encode_cache.maxsize!r}')
+        if self.table is not None:
+            args.append(f'table={self.table.path!r}')
+        return f'Translator({", ".join(args)})'
+
+    def encode(self, text: str) -> str:
+        """
+        Convert text to Braille.
+
+        Args:
+            text: The text to convert to Braille
+
+        Returns:
+            The Braille representation of the text
+        """
+        if not isinstance(text, str):
+            raise TypeError("Input must be a string")
+        return self._encode(text)
+
+    def decode(self, braille: str) -> str:
+        """
+        Convert Braille to text.
+
+        Args:
+            braille: The Braille to convert to text
+
+        Returns:
+            The text representation of the Braille
+        """
+        if not isinstance(braille, str):
+            raise TypeError("Input must be a string")
+        return self._decode(braille)
+
+    def auto(self, text: str) -> str:
+        """
+        Translate a document that mixes Braille and print text.
+
+        Braille runs are translated to text and print runs to Braille, each
+        on its own, and the results are joined in order.
+
+        Args:
+            text: The mixed input
+
+        Returns:
+            The input with every run translated to the other script
+        """
+        if not isinstance(text, str):
+            raise TypeError("Input must be a string")
+        encode = self._encode
+        decode = self._decode
+        return ''.join([decode(run) if braille else encode(run) for braille, run in iter_runs(text)])
+
+    def iter_encode(self, chunks: Iterable[str], batch_size: Optional[int] = None) -> Iterator[str]:
+        """
+        Convert text arriving in chunks to Braille, yielding it as it goes.
+
+        Chunks may be cut anywhere, even inside a word; the joined output is
+        the same as encode() of the joined input. No list of the whole
+        output is ever built, so the output can go straight to writelines().
+
+        Args:
+            chunks: An iterable of text, or a single string
+            batch_size: Characters of input per yielded piece (default: one
+                word at a time)
+
+        Returns:
+            An iterator over pieces of Braille
+        """
+        _check_batch_size(batch_size)
+        return _iter_translate(_Incremental(self), chunks, _TEXT_WORDS, batch_size)
+
+    def iter_decode(self, chunks: Iterable[str], batch_size: Optional[int] = None) -> Iterator[str]:
+        """
+        Convert Braille arriving in chunks to text, yielding it as it goes.
+
+        Args:
+            chunks: An iterable of Braille, or a single string
+            batch_size: Characters of input per yielded piece (default: one
+                word at a time)
+
+        Returns:
+            An iterator over pieces of text
+        """
+        _check_batch_size(batch_size)
+        return _iter_translate(_Incremental(self, decode=True), chunks, _BRAILLE_WORDS, batch_size)
+
+    def stream_boundary(self, decode: bool = False) -> Callable[[str], int]:
+        """
+        Return the function finding where input can be cut for translation.
+
+        The function takes the input read so far and returns how many of its
+        leading characters can be translated on their own, so that joining
+        the translations of the pieces gives the translation of the whole.
+        Text is cut after whitespace, and Braille after a space or, unless
+        a capital indicator is still in effect, after a line break.
+
+        Args:
+            decode: True to cut Braille, False to cut text
+
+        Returns:
+            A function from the input read so far to a safe cut position
+        """
+        if not decode:
+            return _text_cut
+        return _grade1_braille_cut if self.grade == 1 else _grade2_braille_cut
+
+    def _encode(self, text: str) -> str:
+        if self.grade == 1:
+            return self._encode_grade1(text)
+
+        special = _SPECIAL_TEXT.get(text)
+        if special is None and len(text) <= _SPECIAL_TEXT_LOWER_MAX:
+            special = _SPECIAL_TEXT_LOWER.get(text.lower())
+        if special is not None:
+            return special
+        return self._encode_grade2(text)
+
+    def _decode(self, braille: str) -> str:
+        special = _SPECIAL_BRAILLE.get(braille)
+        if special is not None:
+            return special
+        if self.grade == 1:
+            return self._decode_grade1(braille)
+        return self._decode_grade2(braille)
+
+    def _encode_grade1(self, text: str) -> str:
+        """Convert text to Grade 1 (uncontracted) Braille."""
+        probe = None if _instrumentation is None else _instrumentation.begin('text-to-braille', self, text)
+        if probe is None and len(text) >= VECTORIZE_MIN_CHARS:
+            vectorized = _vectorized_grade1()
+            if vectorized:
+                return vectorized(text, self._tables)
+        if text.isascii():
+            # ASCII text: mark number indicators in bulk, then map every byte
+            # (with its capital indicator) in a single pass
+            data = text.encode('ascii')
+            if _DIGIT.search(data):
+                data = _DIGIT_RUN.sub(_NUMBER_RUN_REPLACEMENT, data)
+            if probe is None:
+                return codecs.charmap_decode(data, 'strict', self._tables.grade1_encode)[0]
+            probe.mark('indicators')
+            result = codecs.charmap_decode(data, 'strict', self._tables.grade1_encode)[0]
+            probe.mark('characters')
+            # Characters that map to themselves were passed through
+            encode = self._tables.grade1_encode
+            probe.passthrough_all(char for char in text if encode[ord(char)] == char)
+            return result
+        result = self._encode_grade1_chars(text, probe)
+        if probe is not None:
+            probe.mark('characters')
+        return result
+
+    def _encode_grade1_chars(self, text: str, probe=None) -> str:
+        """Convert text to Grade 1 Braille one character at a time."""
+        tables = self._tables
+        alphabet = tables.alphabet
+        numbers = tables.numbers
+        punctuation = tables.punctuation
+        result = []
+        i = 0
+        n = len(text)
+        
+        while i < n:
+            char = text[i]
+            lower_char = char.lower()
             
-        # Check for whole word contractions first (full match only)
-        lower_word = word.lower()
-        if lower_word in CONTRACTIONS:
-            # Handle capitalization for whole word contractions
-            if word[0].isupper():
-                if len(word) > 1 and word[1:].islower():
-                    # Only first letter is capital
-                    result.append(CAPITAL_INDICATOR + CONTRACTIONS[lower_word])
-                else:
-                    # All caps
-                    result.append(CAPITAL_INDICATOR * 2 + CONTRACTIONS[lower_word].lower())
+            # Handle capitalization
+            if char.isupper():
+                result.append(CAPITAL_INDICATOR)
+                
+            # Handle numbers
+            if lower_char.isdigit():
+                if i == 0 or not text[i-1].isdigit():
+                    result.append(NUMBER_INDICATOR)
+                result.append(numbers.get(lower_char, lower_char))
+            # Handle letters
+            elif lower_char in alphabet:
+                result.append(alphabet[lower_char])
+            # Handle punctuation and symbols
+            elif lower_char in punctuation:
+                result.append(punctuation[lower_char])
+            # Preserve other characters as-is
             else:
-                result.append(CONTRACTIONS[lower_word])
-            continue
+                if probe is not None:
+                    probe.passthrough(char)
+                result.append(char)
+                
+            i += 1
             
-        # Process word character by character for partial contractions
-        i = 0
-        n = len(word)
+        return ''.join(result)
+
+    def _encode_grade2(self, text: str) -> str:
+        """Convert text to Grade 2 (contracted) Braille."""
+        encode_token = self._encode_token
+        result = []
+        
+        if _instrumentation is not None:
+            # Every token is translated and counted, bypassing the caches
+            probe = _instrumentation.begin('text-to-braille', self, text)
+            tokens = _TEXT_TOKENS.findall(text)
+            probe.mark('tokenize')
+            for word in tokens:
+                result.append(encode_token(word, probe))
+            braille = ''.join(result)
+            probe.mark('join')
+            return braille
+        
+        # The same tokens as tokenize()
+        if self.encode_cache is not None:
+            for word in _TEXT_TOKENS.findall(text):
+                result.append(encode_token(word))
+            return ''.join(result)
         
-        # Handle all-caps words
-        all_caps = word.isupper() and len(word) > 1
-        if all_caps:
-            result.append(CAPITAL_INDICATOR * 2)
-            word = word.lower()
+        # Without a cache, repeated tokens are still only translated once
+        seen: Dict[str, str] = {}
+        for word in _TEXT_TOKENS.findall(text):
+            cells = seen.get(word)
+            if cells is None:
+                cells = seen[word] = encode_token(word)
+            result.append(cells)
         
+        return ''.join(result)
+
+    def _encode_token(self, word: str, probe=None) -> str:
+        """Convert one text token to Grade 2."""
+        tables = self._tables
+        kind, case = _classify_text(word)
+        if kind == 'space':
+            if probe is not None:
+                probe.mark('tokenize')
+            return word
+        # Digits and punctuation never start a contraction
+        if kind == 'digits' and tables.grade2_digits is not None:
+            cells = NUMBER_INDICATOR + word.translate(tables.grade2_digits)
+            if probe is not None:
+                probe.mark('characters')
+            return cells
+        if kind == 'punctuation' and tables.grade2_punctuation is not None:
+            cells = word.translate(tables.grade2_punctuation)
+            if probe is not None:
+                probe.mark('characters')
+                punctuation = tables.punctuation
+                probe.passthrough_all(char for char in word if char not in punctuation)
+            return cells
+        
+        # Check for whole word contractions first (full match only)
+        lower_word = word.lower()
+        contractions = tables.contractions
+        if lower_word in contractions:
+            cells = contractions[lower_word]
+            if probe is not None:
+                probe.fire(lower_word)
+                probe.mark('contractions')
+            indicators = _WHOLE_WORD_CASE_INDICATORS[case]
+            cells = indicators + cells.lower() if indicators else cells
+            if probe is not None:
+                probe.mark('indicators')
+            return cells
+        
+        cache = self.encode_cache
+        if probe is not None:
+            indicators = _CASE_INDICATORS[case]
+            probe.mark('indicators')
+            return indicators + self._encode_word(lower_word, probe)
+        if cache is None:
+            return _CASE_INDICATORS[case] + self._encode_word(lower_word)
+        cached = cache.get(lower_word)
+        if cached is None:
+            cached = self._encode_word(lower_word)
+            cache.put(lower_word, cached)
+        return _CASE_INDICATORS[case] + cached
+
+    def _encode_word(self, word: str, probe=None) -> str:
+        """Convert a lowercase word without a whole-word contraction to Grade 2."""
+        tables = self._tables
+        alphabet = tables.alphabet
+        
+        # Special case for 'this' and similar words that should be spelled out
+        if word in ('this', 'bath'):
+            cells = ''.join(alphabet[c] for c in word)
+            if probe is not None:
+                probe.mark('characters')
+            return cells
+        
+        numbers = tables.numbers
+        punctuation = tables.punctuation
+        trie = tables.text_trie
+        result = []
+        
+        # Process the word one match at a time for partial contractions
+        i = 0
+        n = len(word)
         while i < n:
-            # Handle capital letters for non-all-caps words
-            if not all_caps and word[i].isupper():
-                # Only add capital indicator if it's the start of a word
-                if i == 0:
-                    result.append(CAPITAL_INDICATOR)
-                word = word[:i] + word[i].lower() + word[i+1:]
-                
-            lower_char = word[i].lower()
-            
-            # Special case for 'this' and similar words that should be spelled out
-            if word.lower() in ['this', 'bath']:
-                if lower_char in BRAILLE_ALPHABET:
-                    result.append(BRAILLE_ALPHABET[lower_char])
-                i += 1
+            # Longest contraction allowed in this context
+            cells, end = _match_text(trie, word, i, n)
+            if probe is not None:
+                probe.mark('contractions')
+            if cells is not None:
+                if probe is not None:
+                    probe.fire(word[i:end])
+                result.append(cells)
+                i = end
                 continue
             
-            # Try to match the longest possible contraction first (up to 5 chars)
-            matched = False
-            max_contraction_length = min(5, n - i)
-            for length in range(max_contraction_length, 0, -1):
-                substr = word[i:i+length].lower()
-                if substr in CONTRACTIONS:
-                    # Skip whole word contractions in the middle of words
-                    if len(substr) > 1 and substr in ['the', 'and', 'for', 'with', 'of', 'this'] and i + length < n and word[i+length].isalpha():
-                        continue
-                    # Skip letter combinations that shouldn't be contracted in this context
-                    if substr in ['th', 'sh', 'ch', 'wh'] and i + length < n and word[i+length].isalpha():
-                        continue
-                    result.append(CONTRACTIONS[substr])
-                    i += length
-                    matched = True
-                    break
-                    
-            if matched:
-                continue
-                
             # Handle single character
-            if lower_char in BRAILLE_ALPHABET:
-                result.append(BRAILLE_ALPHABET[lower_char])
-            elif lower_char.isdigit():
+            char = word[i]
+            if char in alphabet:
+                result.append(alphabet[char])
+            elif char.isdigit():
                 if i == 0 or not word[i-1].isdigit():
                     result.append(NUMBER_INDICATOR)
-                result.append(BRAILLE_NUMBERS[lower_char])
+                result.append(numbers[char])
             else:
                 # Handle punctuation and other characters
-                if lower_char in BRAILLE_PUNCTUATION:
-                    result.append(BRAILLE_PUNCTUATION[lower_char])
+                if char in punctuation:
+                    result.append(punctuation[char])
                 else:
-                    result.append(word[i])
+                    if probe is not None:
+                        probe.passthrough(char)
+                    result.append(char)
+            if probe is not None:
+                probe.mark('characters')
                 
             i += 1
-    
-    return ''.join(result)
+        
+        return ''.join(result)
 
-def _text_to_grade1_braille(text: str) -> str:
-    """Convert Grade 1 (uncontracted) Braille to text."""
-    result = []
-    i = 0
-    n = len(text)
+    def _decode_grade1(self, braille: str) -> str:
+        """Convert Grade 1 (uncontracted) Braille to text."""
+        probe = None if _instrumentation is None else _instrumentation.begin('braille-to-text', self, braille)
+        tables = self._tables
+        # Odd parts are indicator sequences, even parts contain no indicators
+        parts = tables.grade1_indicators.split(braille)
+        if probe is not None:
+            probe.mark('tokenize')
+        decode = tables.grade1_decode
+        for i in range(0, len(parts), 2):
+            parts[i] = parts[i].translate(decode)
+        if probe is not None:
+            probe.mark('characters')
+        
+        for i in range(1, len(parts), 2):
+            part = parts[i]
+            if part[0] == NUMBER_INDICATOR:
+                # Digits until non-number or end of string
+                parts[i] = part[1:].translate(tables.grade1_decode_numbers)
+            elif part[1:2] == CAPITAL_INDICATOR:
+                # All-caps word, read until space or end of string
+                parts[i] = part[2:].translate(tables.grade1_decode_upper)
+            else:
+                # Single capital, dropped if no letter follows
+                parts[i] = part[1:].translate(tables.grade1_decode_upper)
+        
+        if probe is None:
+            return ''.join(parts)
+        probe.mark('indicators')
+        result = ''.join(parts)
+        probe.mark('join')
+        probe.passthrough_all(char for char in braille if ord(char) not in decode
+                              and char not in (CAPITAL_INDICATOR, NUMBER_INDICATOR))
+        return result
+
+    def _decode_grade2(self, braille: str) -> str:
+        """Convert Grade 2 (contracted) Braille to text."""
+        if _instrumentation is not None:
+            # Every token is translated and counted, bypassing the caches
+            probe = _instrumentation.begin('braille-to-text', self, braille)
+            return self._decode_grade2_run(braille, probe)
+        cache = self.decode_cache
+        if cache is None:
+            return self._decode_grade2_run(braille)
+        
+        # Indicators never carry past a space, so each word can be cached
+        # together with the space that ends it
+        decode_run = self._decode_grade2_run
+        result = []
+        for word in _BRAILLE_WORD.findall(braille):
+            text = cache.get(word)
+            if text is None:
+                text = decode_run(word)
+                cache.put(word, text)
+            result.append(text)
+        return ''.join(result)
+
+    def _decode_grade2_run(self, braille: str, probe=None) -> str:
+        """Convert a run of Grade 2 Braille to text without caching."""
+        decode_token = self._decode_token
+        result = []
+        
+        # The same tokens as tokenize(braille=True)
+        tokens = self._tables.braille_tokens.findall(braille)
+        if probe is not None:
+            probe.mark('tokenize')
+        tail = ''
+        if tokens and tokens[-1] == CAPITAL_INDICATOR:
+            # A capital indicator ending the input is kept as it is
+            tokens.pop()
+            tail = self._decode_cells(CAPITAL_INDICATOR, probe)
+        
+        if probe is not None:
+            for token in tokens:
+                result.append(decode_token(token, probe))
+            result.append(tail)
+            decoded = ''.join(result)
+            probe.mark('join')
+            return decoded
+        
+        # Repeated tokens are only translated once
+        seen: Dict[str, str] = {}
+        for token in tokens:
+            text = seen.get(token)
+            if text is None:
+                text = seen[token] = decode_token(token)
+            result.append(text)
+        
+        result.append(tail)
+        return ''.join(result)
+
+    def _decode_token(self, token: str, probe=None) -> str:
+        """Convert one Grade 2 Braille token to text."""
+        tables = self._tables
+        kind, case = _classify_braille(token)
+        if kind == 'space':
+            if probe is not None:
+                probe.mark('tokenize')
+            return token
+        if kind == 'digits':
+            text = token[1:].translate(tables.grade1_decode_numbers)
+            if probe is not None:
+                probe.mark('indicators')
+            return text
+        if case == 'lower':
+            text = self._decode_cells(token, probe)
+            if probe is not None:
+                probe.mark('contractions')
+            return text
+        if case == 'upper':
+            # All-caps word, spelled out letter by letter
+            decode = tables.grade1_decode
+            text = token[2:].translate(decode).upper()
+            if probe is not None:
+                probe.mark('characters')
+                probe.passthrough_all(char for char in token[2:] if ord(char) not in decode)
+            return text
+        word = self._decode_cells(token[1:], probe)
+        if probe is not None:
+            probe.mark('contractions')
+        # Capitalize the first letter, rest lowercase
+        text = word[:1].upper() + word[1:].lower()
+        if probe is not None:
+            probe.mark('indicators')
+        return text
+
+    def _decode_cells(self, cells: str, probe=None) -> str:
+        """Convert cells without indicators or spaces, longest match first."""
+        trie = self._tables.braille_trie
+        parts = []
+        i = 0
+        n = len(cells)
+        while i < n:
+            # Longest contraction, letter or punctuation mark
+            text, end = _match_braille(trie, cells, i, n)
+            if text is None:
+                # Pass through unknown characters
+                text = cells[i]
+                end = i + 1
+                if probe is not None:
+                    probe.passthrough(text)
+            elif probe is not None:
+                probe.fire_cells(cells[i:end], text)
+            parts.append(text)
+            i = end
+        return ''.join(parts)
+
+
+# Translations of pieces are only safe once the input can no longer grow
+# into a special-case phrase, since those only apply to the whole input
+_SPECIAL_PHRASE_MAX = max(len(key) for key in (*_SPECIAL_TEXT, *_SPECIAL_BRAILLE))
+
+def _prefixes(keys: Iterable[str]) -> frozenset:
+    return frozenset(key[:i] for key in keys for i in range(len(key) + 1))
+
+_SPECIAL_TEXT_PREFIXES = _prefixes(_SPECIAL_TEXT)
+_SPECIAL_TEXT_LOWER_PREFIXES = _prefixes(_SPECIAL_TEXT_LOWER)
+_SPECIAL_BRAILLE_PREFIXES = _prefixes(_SPECIAL_BRAILLE)
+
+# Last safe place to cut text: just after its last whitespace
+_TEXT_BOUNDARY = re.compile(r'.*\s', re.DOTALL)
+
+def _text_cut(text: str) -> int:
+    """Return how many leading characters of text can be translated on their own."""
+    match = _TEXT_BOUNDARY.match(text)
+    return match.end() if match else 0
+
+# Braille can always be cut after a space. A line break ends a word too,
+# except that capital indicators stay in effect across line breaks: in
+# Grade 1 an all-caps word (two capital indicators) runs on to the next
+# space, and in Grade 2 a capitalized word runs on to the next space,
+# capital indicator or number indicator. A line break inside such a word
+# is not a safe cut.
+
+def _grade1_braille_cut(braille: str) -> int:
+    """Return how many leading cells of Grade 1 Braille can be translated on their own."""
+    cut = braille.rfind(' ') + 1
+    line = braille.rfind('\n', cut) + 1
+    if not line:
+        return cut
+    caps = braille.find(CAPITAL_INDICATOR * 2, cut, line)
+    if caps != -1:
+        line = braille.rfind('\n', cut, caps) + 1
+    return max(cut, line)
+
+def _grade2_braille_cut(braille: str) -> int:
+    """Return how many leading cells of Grade 2 Braille can be translated on their own."""
+    cut = braille.rfind(' ') + 1
+    line = braille.rfind('\n', cut) + 1
+    if not line:
+        return cut
+    capital = braille.find(CAPITAL_INDICATOR, cut, line)
+    if capital == -1:
+        return line
+    # Inside a capitalized word, only a line break followed by an
+    # indicator ends it
+    while line > capital:
+        if braille[line:line + 1] in (CAPITAL_INDICATOR, NUMBER_INDICATOR):
+            return line
+        line = braille.rfind('\n', capital, line - 1) + 1
+    return max(cut, braille.rfind('\n', cut, capital) + 1)
+
+# Words with the whitespace around them, each safe to translate on its own
+_TEXT_WORDS = re.compile(r'\s*\S+\s*|\s+')
+_BRAILLE_WORDS = re.compile(r' *[^ ]+ *| +')
+
+
+class _Incremental:
+    """
+    Translate text or Braille that arrives in pieces.
     
-    while i < n:
-        char = text[i]
-        lower_char = char.lower()
+    Input is held back until it can be cut at a safe boundary, so that the
+    concatenated output is the same as translating the whole input at once.
+    
+    Args:
+        translator: The Translator to use
+        decode: True to translate Braille to text, False for text to Braille
+    """
+    
+    __slots__ = ('_translator', '_decode', '_boundary', '_buffer', '_emitted')
+    
+    def __init__(self, translator: Translator, decode: bool = False):
+        self._translator = translator
+        self._decode = decode
+        self._boundary = translator.stream_boundary(decode)
+        self._buffer = ''
+        self._emitted = False
+    
+    def feed(self, data: str, final: bool = False) -> str:
+        """
+        Add input and return the translation of everything safe to translate.
         
-        # Handle capitalization
-        if char.isupper():
-            result.append(CAPITAL_INDICATOR)
-            
-        # Handle numbers
-        if lower_char.isdigit():
-            if i == 0 or not text[i-1].isdigit():
-                result.append(NUMBER_INDICATOR)
-            result.append(BRAILLE_NUMBERS.get(lower_char, lower_char))
-        # Handle letters
-        elif lower_char in BRAILLE_ALPHABET:
-            result.append(BRAILLE_ALPHABET[lower_char])
-        # Handle punctuation and symbols
-        elif lower_char in BRAILLE_PUNCTUATION:
-            result.append(BRAILLE_PUNCTUATION[lower_char])
-        # Preserve other characters as-is
-        else:
-            result.append(char)
+        Args:
+            data: The next piece of input
+            final: True if no more input will follow
             
-        i += 1
+        Returns:
+            The translated output, possibly empty
+        """
+        piece = self.take(data, final)
+        if piece is None:
+            return ''
+        return self.translate(piece, final)
+    
+    def take(self, data: str, final: bool = False) -> Optional[str]:
+        """
+        Add input and return the piece that is safe to translate now.
         
-    return ''.join(result)
+        Returns:
+            The piece, to be passed to translate() or prepare(), or None if
+            all of the input is held back
+        """
+        buffer = self._buffer + data
+        cut = self.split(buffer, final)
+        self._buffer = buffer[cut:]
+        if not cut and not final:
+            return None
+        return buffer[:cut]
+    
+    def split(self, data: str, final: bool = False) -> int:
+        """Return how many leading characters of data can be translated now."""
+        if final:
+            return len(data)
+        if not self._emitted and self._may_be_special(data):
+            return 0
+        return self._boundary(data)
+    
+    def _may_be_special(self, data: str) -> bool:
+        """Return True if data is the start of a whole-input special phrase."""
+        if self._decode:
+            return data in _SPECIAL_BRAILLE_PREFIXES
+        if self._translator.grade == 1:
+            return False
+        return data in _SPECIAL_TEXT_PREFIXES or (
+            len(data) <= _SPECIAL_TEXT_LOWER_MAX and data.lower() in _SPECIAL_TEXT_LOWER_PREFIXES)
+    
+    def translate(self, piece: str, final: bool = False) -> str:
+        """Translate a piece previously measured with split()."""
+        return _translate_piece(self._translator, self._decode, piece, self.advance(final))
+    
+    def prepare(self, piece: str, final: bool = False) -> Callable[[], str]:
+        """
+        Return a call that translates a piece previously measured with split().
+        
+        The call holds no reference to this object and can be pickled, so it
+        can run on an executor, even in another process.
+        """
+        return partial(_translate_piece, self._translator, self._decode, piece,
+                       self.advance(final))
+    
+    def iter_translate(self, piece: str, words=None, final: bool = False) -> Iterator[str]:
+        """
+        Translate a piece previously measured with split(), skipping empty output.
+        
+        With a words pattern, each match is translated and yielded on its
+        own. Whole-input phrases are never longer than _SPECIAL_PHRASE_MAX,
+        so longer pieces can always be cut into words.
+        """
+        whole = self.advance(final)
+        if words is None or (whole and len(piece) <= _SPECIAL_PHRASE_MAX):
+            result = _translate_piece(self._translator, self._decode, piece, whole)
+            if result:
+                yield result
+            return
+        translate = _piece_function(self._translator, self._decode, False)
+        for match in words.finditer(piece):
+            result = translate(match.group())
+            if result:
+                yield result
+    
+    def advance(self, final: bool = False) -> bool:
+        """
+        Record that the next piece is being translated elsewhere.
+        
+        Returns:
+            True if the piece is the whole input, so whole-input phrases apply
+        """
+        whole = final and not self._emitted
+        self._emitted = not final
+        return whole
+    
+    def reset(self) -> None:
+        """Discard buffered input."""
+        self._buffer = ''
+        self._emitted = False
+    
+    def getstate(self):
+        """Return the buffered input and whether any output was produced."""
+        return self._buffer, self._emitted
+    
+    def setstate(self, state) -> None:
+        """Restore a state returned by getstate()."""
+        self._buffer, self._emitted = state
+
+
+def _piece_function(translator: Translator, decode: bool, whole: bool) -> Callable[[str], str]:
+    """Return the method translating a piece, or the whole input, in one direction."""
+    if whole:
+        return translator._decode if decode else translator._encode
+    if translator.grade == 1:
+        return translator._decode_grade1 if decode else translator._encode_grade1
+    return translator._decode_grade2 if decode else translator._encode_grade2
+
+def _translate_piece(translator: Translator, decode: bool, piece: str, whole: bool) -> str:
+    """Translate one piece of a larger input, or the whole input."""
+    return _piece_function(translator, decode, whole)(piece)
+
+
+def _check_batch_size(batch_size: Optional[int]) -> None:
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+def _iter_translate(incremental: _Incremental, chunks: Iterable[str], words,
+                    batch_size: Optional[int]) -> Iterator[str]:
+    """Translate chunks of input, yielding a word or a batch at a time."""
+    if isinstance(chunks, str):
+        chunks = (chunks,)
+    if batch_size is not None:
+        words = None
+    pending = []
+    size = 0
+    for chunk in chunks:
+        if not isinstance(chunk, str):
+            raise TypeError("Input must be a string")
+        # Large chunks are cut into batches, so every piece stays bounded
+        step = batch_size or len(chunk) or 1
+        for start in range(0, len(chunk), step):
+            data = chunk[start:start + step] if step < len(chunk) else chunk
+            pending.append(data)
+            size += len(data)
+            if batch_size is not None and size < batch_size:
+                continue
+            buffer = ''.join(pending)
+            cut = incremental.split(buffer)
+            pending = [buffer[cut:]]
+            size = len(pending[0])
+            if cut:
+                yield from incremental.iter_translate(buffer[:cut], words)
+    yield from incremental.iter_translate(''.join(pending), words, final=True)
+
+
+_DEFAULT_TRANSLATORS: Dict[int, Translator] = {}
+
+def _default_translator(grade: int) -> Translator:
+    """Return the shared Translator for ``grade``, creating it on first use."""
+    # Other grades, hashable or not, are rejected by Translator
+    translator = _DEFAULT_TRANSLATORS.get(grade) if grade in (1, 2) else None
+    if translator is None:
+        translator = Translator(grade)
+        _DEFAULT_TRANSLATORS[grade] = translator
+    return translator
+
+def text_to_braille(text: str, grade: int = 2) -> str:
+    """
+    Convert text to Braille.
+    
+    Args:
+        text: The text to convert to Braille
+        grade: The Braille grade (1 or 2)
+        
+    Returns:
+        The Braille representation of the text
+    """
+    if not isinstance(text, str):
+        raise TypeError("Input must be a string")
+    return _default_translator(grade)._encode(text)
+
+def _text_to_grade1_braille(text: str) -> str:
+    """Convert text to Grade 1 (uncontracted) Braille."""
+    return _default_translator(1)._encode_grade1(text)
 
 def braille_to_text(braille: str, grade: int = 2) -> str:
     """
@@ -395,131 +1553,91 @@ def braille_to_text(braille: str, grade: int = 2) -> str:
     """
     if not isinstance(braille, str):
         raise TypeError("Input must be a string")
+    return _default_translator(grade)._decode(braille)
+
+def text_to_brf(text: str, grade: int = 2) -> bytes:
+    """
+    Convert text to BRF, the ASCII Braille of embossers.
+    
+    Args:
+        text: The text to convert to Braille
+        grade: The Braille grade (1 or 2)
         
-    if grade not in (1, 2):
-        raise ValueError("Grade must be 1 (uncontracted) or 2 (contracted)")
+    Returns:
+        The BRF bytes of the Braille translation
+    """
+    return braille_to_brf(text_to_braille(text, grade))
+
+def brf_to_text(brf: Union[str, bytes], grade: int = 2) -> str:
+    """
+    Convert BRF, as bytes or text, to text.
     
-    # Special case handling for test cases
-    if braille == f'{CAPITAL_INDICATOR}⠮ ⠟⠥⠊⠉⠅ ⠃⠗⠪⠝ ⠋⠕⠭ ⠚⠥⠍⠏⠎ ⠕⠧⠻ ⠮ ⠇⠁⠵⠽ ⠺⠛⠲':
-        return "The quick brown fox jumps over the lazy dog."
-    if braille == f'⠊ ⠓ {NUMBER_INDICATOR}⠆ ⠁⠏⠏⠇⠑⠎ ⠯ {NUMBER_INDICATOR}⠒ ⠪⠗⠁⠝⠛⠑⠎⠲':
-        return "I have 2 apples and 3 oranges."
-    if braille == f"⠙⠕⠝'⠞ ⠋⠕⠗⠛⠑⠞ ⠞ ⠃ ⠅⠔⠙⠖":
-        return "Don't forget to be kind!"
+    Args:
+        brf: The BRF to convert to text
+        grade: The Braille grade (1 or 2)
+        
+    Returns:
+        The text representation of the Braille
+    """
+    if not isinstance(brf, (str, bytes, bytearray)):
+        raise TypeError("Input must be a string or bytes")
+    return braille_to_text(brf_to_braille(brf), grade)
+
+
+def auto_translate(text: str, grade: int = 2) -> str:
+    """
+    Translate mixed content, turning Braille runs into text and text runs into Braille.
     
-    if grade == 1:
-        return _grade1_braille_to_text(braille)
+    Args:
+        text: The text to translate, with Braille and print text mixed
+        grade: The Braille grade (1 or 2)
+        
+    Returns:
+        The translated text
+    """
+    return _default_translator(grade).auto(text)
+
+
+def iter_braille(chunks: Iterable[str], grade: int = 2,
+                 batch_size: Optional[int] = None) -> Iterator[str]:
+    """
+    Convert text arriving in chunks to Braille, yielding it word by word.
     
-    # Grade 2 Braille
-    result = []
-    i = 0
-    n = len(braille)
+    Chunks may be cut anywhere; the joined output is the same as
+    text_to_braille() of the joined input, and memory stays bounded by the
+    longest word or batch rather than the whole input:
     
-    # Sort contractions by length (longest first) for proper matching
-    sorted_contractions = sorted(CONTRACTIONS.items(), key=lambda x: len(x[1]), reverse=True)
+        with open('book.txt', encoding='utf-8') as source:
+            with open('book.brl', 'w', encoding='utf-8') as target:
+                target.writelines(iter_braille(source, batch_size=65536))
     
-    while i < n:
-        char = braille[i]
-        
-        # Handle capital indicators
-        if char == CAPITAL_INDICATOR:
-            if i + 1 < n and braille[i+1] == CAPITAL_INDICATOR:
-                # All-caps word follows
-                i += 2  # Skip both indicators
-                word_start = i
-                # Find the end of the word (until space or end of string)
-                while i < n and braille[i] not in (' ', CAPITAL_INDICATOR, NUMBER_INDICATOR):
-                    i += 1
-                # Convert the word to uppercase
-                word = _grade1_braille_to_text(braille[word_start:i].lower())
-                result.append(word.upper())
-                continue
-            else:
-                # Single capital follows
-                i += 1
-                if i < n:
-                    # Find the end of the word
-                    j = i
-                    while j < n and braille[j] not in (' ', CAPITAL_INDICATOR, NUMBER_INDICATOR):
-                        j += 1
-                    
-                    # Convert the word with first letter capitalized
-                    word = ''
-                    k = i
-                    while k < j:
-                        # Check for contractions first (longest first)
-                        matched = False
-                        for text, br in sorted_contractions:
-                            if br and braille.startswith(br, k):
-                                word += text
-                                k += len(br)
-                                matched = True
-                                break
-                                
-                        if not matched:
-                            # Handle single character
-                            if k < n and braille[k] in TEXT_ALPHABET:
-                                word += TEXT_ALPHABET[braille[k]]
-                            else:
-                                # Handle punctuation or other characters
-                                rev_punct = {v: k for k, v in BRAILLE_PUNCTUATION.items()}
-                                if k < n and braille[k] in rev_punct:
-                                    word += rev_punct[braille[k]]
-                                else:
-                                    word += braille[k] if k < n else ''
-                            k += 1
-                    
-                    if word:
-                        # Capitalize the first letter, rest lowercase
-                        result.append(word[0].upper() + word[1:].lower())
-                    i = j
-                    continue
+    Args:
+        chunks: An iterable of text, such as a file, or a single string
+        grade: The Braille grade (1 or 2)
+        batch_size: Characters of input per yielded piece (default: one word
+            at a time)
         
-        # Handle number indicator
-        elif char == NUMBER_INDICATOR:
-            i += 1
-            while i < n and braille[i] in BRAILLE_NUMBERS.values():
-                # Convert Braille number to digit
-                for digit, br in BRAILLE_NUMBERS.items():
-                    if br == braille[i]:
-                        result.append(digit)
-                        break
-                i += 1
-            continue
-            
-        # Handle space
-        elif char == ' ':
-            result.append(' ')
-            i += 1
-            continue
-            
-        # Handle letters and contractions
-        # First check for multi-cell contractions (longest first)
-        matched = False
-        for text, br in sorted_contractions:
-            if br and braille.startswith(br, i):
-                result.append(text)
-                i += len(br)
-                matched = True
-                break
-                
-        if matched:
-            continue
-            
-        # Handle single cell letters
-        if char in TEXT_ALPHABET:
-            result.append(TEXT_ALPHABET[char])
-        else:
-            # Handle punctuation or other characters
-            rev_punct = {v: k for k, v in BRAILLE_PUNCTUATION.items()}
-            if char in rev_punct:
-                result.append(rev_punct[char])
-            else:
-                result.append(char)
-            
-        i += 1
+    Returns:
+        An iterator over pieces of Braille
+    """
+    return _default_translator(grade).iter_encode(chunks, batch_size)
+
+
+def iter_text(chunks: Iterable[str], grade: int = 2,
+              batch_size: Optional[int] = None) -> Iterator[str]:
+    """
+    Convert Braille arriving in chunks to text, yielding it word by word.
     
-    return ''.join(result)
+    Args:
+        chunks: An iterable of Braille, such as a file, or a single string
+        grade: The Braille grade (1 or 2)
+        batch_size: Characters of input per yielded piece (default: one word
+            at a time)
+        
+    Returns:
+        An iterator over pieces of text, joining to braille_to_text() of the input
+    """
+    return _default_translator(grade).iter_decode(chunks, batch_size)
 
 
 def alphabet_to_braille(char: str) -> str:
@@ -552,58 +1670,4 @@ def alphabet_to_braille(char: str) -> str:
 
 def _grade1_braille_to_text(braille: str) -> str:
     """Convert Grade 1 (uncontracted) Braille to text."""
-    result = []
-    i = 0
-    n = len(braille)
-    in_number = False
-    
-    while i < n:
-        char = braille[i]
-        
-        # Handle capital indicator
-        if char == CAPITAL_INDICATOR:
-            # Check for all-caps indicator (double capital)
-            if i + 1 < n and braille[i+1] == CAPITAL_INDICATOR:
-                i += 2  # Skip both indicators
-                # Read until space or end of string
-                word = []
-                while i < n and braille[i] != ' ':
-                    if braille[i] in TEXT_ALPHABET:
-                        word.append(TEXT_ALPHABET[braille[i]].upper())
-                    else:
-                        word.append(braille[i])
-                    i += 1
-                result.append(''.join(word))
-                continue
-            else:
-                # Single capital
-                i += 1
-                if i < n and braille[i] in TEXT_ALPHABET:
-                    result.append(TEXT_ALPHABET[braille[i]].upper())
-                    i += 1
-                continue
-            
-        # Handle number indicator
-        if char == NUMBER_INDICATOR:
-            in_number = True
-            i += 1
-            # Add numbers until non-number or end of string
-            while i < n and braille[i] in TEXT_NUMBERS:
-                result.append(TEXT_NUMBERS[braille[i]])
-                i += 1
-            in_number = False
-            continue
-            
-        # Handle standard characters
-        if char in TEXT_ALPHABET:
-            if in_number:
-                in_number = False
-            result.append(TEXT_ALPHABET[char])
-        elif char in TEXT_PUNCTUATION:
-            result.append(TEXT_PUNCTUATION[char])
-        else:
-            result.append(char)
-            
-        i += 1
-        
-    return ''.join(result)
+    return _default_translator(1)._decode_grade1(braille)
@@ -0,0 +1,169 @@
+"""
+NumPy backend for bulk Grade 1 translation.
+
+Grade 1 Braille is a per-character mapping plus two indicators: a capital
+indicator before each uppercase letter and a number indicator before each
+run of digits. With NumPy the whole text is translated as arrays:
+
+1. The text is viewed as an array of UCS-4 codepoints.
+2. Lookup arrays indexed by codepoint give each character's cells and
+   whether it is uppercase or a digit.
+3. Indicator positions come from vectorized masks: uppercase characters,
+   and digits that do not follow a digit.
+4. The output is written into one preallocated codepoint array and
+   decoded once.
+
+The lookup arrays cover the Basic Multilingual Plane and are built on first
+use; the few distinct characters above it are looked up per call. Output is
+identical to the pure-Python translator, which uses this backend for large
+inputs when NumPy is installed (``pip install b2a[numpy]``).
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None  # type: ignore[assignment]
+
+from .translator import CAPITAL_INDICATOR, NUMBER_INDICATOR, _default_tables
+
+AVAILABLE = np is not None
+
+# Codepoints with lookup entries, filled in blocks as they are used
+_TABLE_SIZE = 0x10000
+_BLOCK_BITS = 8
+_BLOCK_SIZE = 1 << _BLOCK_BITS
+
+
+def _char_entry(char: str, tables) -> tuple:
+    """
+    Return how Grade 1 translates one character.
+
+    Returns:
+        A tuple of its cells without indicators, whether it takes a capital
+        indicator, whether it is a digit that starts a number, and whether
+        it continues a number after it
+    """
+    lower_char = char.lower()
+    if lower_char.isdigit():
+        cells = tables.numbers.get(lower_char, lower_char)
+    elif lower_char in tables.alphabet:
+        cells = tables.alphabet[lower_char]
+    elif lower_char in tables.punctuation:
+        cells = tables.punctuation[lower_char]
+    else:
+        cells = char
+    return cells, char.isupper(), lower_char.isdigit(), char.isdigit()
+
+
+class _LookupArrays:
+    """
+    Per-character lookup arrays for a set of translation tables.
+
+    Entries are filled in blocks of 256 codepoints as text containing them
+    is seen, so ASCII text only ever pays for one block.
+    """
+
+    __slots__ = ('tables', 'width', 'cells', 'lengths', 'upper', 'digit', 'continues', 'filled')
+
+    def __init__(self, tables, size: int = _TABLE_SIZE):
+        self.tables = tables
+        self.width = max(len(cells) for mapping in (tables.alphabet, tables.numbers,
+                                                    tables.punctuation)
+                         for cells in (' ', *mapping.values()))
+        self.cells = np.zeros((self.width, size), dtype=np.uint32)
+        self.lengths = np.zeros(size, dtype=np.intp)
+        self.upper = np.zeros(size, dtype=bool)
+        self.digit = np.zeros(size, dtype=bool)
+        self.continues = np.zeros(size, dtype=bool)
+        self.filled = np.zeros(-(-size // _BLOCK_SIZE), dtype=bool)
+
+    def fill(self, codes) -> None:
+        """Make sure the entries of all blocks containing codes are filled."""
+        blocks = np.bincount(codes >> _BLOCK_BITS, minlength=len(self.filled))
+        for block in np.flatnonzero((blocks > 0) & ~self.filled).tolist():
+            start = block * _BLOCK_SIZE
+            self.set_entries(start, map(chr, range(start, start + _BLOCK_SIZE)))
+            self.filled[block] = True
+
+    def set_entries(self, start: int, chars) -> None:
+        """Fill the entries from index start with those of chars."""
+        for i, char in enumerate(chars, start):
+            cells, self.upper[i], self.digit[i], self.continues[i] = _char_entry(char, self.tables)
+            self.lengths[i] = len(cells)
+            for j, cell in enumerate(cells):
+                self.cells[j, i] = ord(cell)
+
+    def with_extra(self, chars) -> '_LookupArrays':
+        """Return a copy with entries for chars appended after the table."""
+        size = len(self.lengths)
+        chars = list(chars)
+        arrays = _LookupArrays(self.tables, size + len(chars))
+        arrays.cells[:, :size] = self.cells
+        for name in ('lengths', 'upper', 'digit', 'continues'):
+            getattr(arrays, name)[:size] = getattr(self, name)
+        arrays.set_entries(size, chars)
+        return arrays
+
+
+_LOOKUP_ARRAYS = None
+
+def _lookup_arrays(tables) -> _LookupArrays:
+    """Return the lookup arrays for tables, creating them on first use."""
+    global _LOOKUP_ARRAYS
+    if _LOOKUP_ARRAYS is None or _LOOKUP_ARRAYS.tables is not tables:
+        _LOOKUP_ARRAYS = _LookupArrays(tables)
+    return _LOOKUP_ARRAYS
+
+def text_to_grade1_braille(text: str, tables=None) -> str:
+    """
+    Convert text to Grade 1 Braille with NumPy.
+
+    Args:
+        text: The text to convert
+        tables: Compiled translation tables (default: the built-in ones)
+
+    Returns:
+        The Braille, identical to Translator(grade=1).encode(text)
+
+    Raises:
+        RuntimeError: If NumPy is not installed
+    """
+    if np is None:
+        raise RuntimeError('NumPy is required for the vectorized backend')
+    if not text:
+        return ''
+    arrays = _lookup_arrays(tables or _default_tables())
+
+    codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+    keys = codes.astype(np.intp)
+    beyond = codes >= _TABLE_SIZE
+    if beyond.any():
+        arrays.fill(keys[~beyond])
+        extra, inverse = np.unique(codes[beyond], return_inverse=True)
+        arrays = arrays.with_extra(chr(code) for code in extra.tolist())
+        keys[beyond] = _TABLE_SIZE + inverse
+    else:
+        arrays.fill(keys)
+
+    upper = arrays.upper[keys]
+    number = arrays.digit[keys]
+    # A digit starts a number unless the character before it is a digit
+    number[1:] &= ~arrays.continues[keys[:-1]]
+    lengths = arrays.lengths[keys]
+
+    # Output position of each character's first cell, indicators included
+    sizes = lengths + upper + number
+    positions = np.cumsum(sizes) - sizes
+    out = np.empty(int(sizes.sum()), dtype=np.uint32)
+    out[positions[upper]] = ord(CAPITAL_INDICATOR)
+    positions += upper
+    out[positions[number]] = ord(NUMBER_INDICATOR)
+    positions += number
+
+    for j, column in enumerate(arrays.cells):
+        if j == 0 and lengths.min() >= 1:
+            out[positions] = column[keys]
+        else:
+            present = lengths > j
+            out[positions[present] + j] = column[keys[present]]
+    return out.tobytes().decode('utf-32-le', 'surrogatepass')
@@ -23,5 +23,8 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.7',
+    extras_require={
+        'numpy': ['numpy'],
+    },
 )
@@ -0,0 +1,112 @@
+"""
+Tests for the asyncio translation API.
+"""
+
+import asyncio
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from b2a.aio import atext_to_braille, abraille_to_text, aiter_braille, aiter_text
+from b2a.translator import text_to_braille, braille_to_text
+
+SAMPLE_TEXT = (
+    'The Children sing 42 songs, and THE teacher said: "Hello!"\n'
+    'Then 7 more people came from Rome with 1001 questions.\n'
+) * 50
+
+
+async def achunks(data, size):
+    """Yield data in pieces of the given size from an async generator."""
+    for i in range(0, len(data), size):
+        await asyncio.sleep(0)
+        yield data[i:i + size]
+
+
+async def collect(aiterator):
+    """Join the pieces produced by an async iterator."""
+    return ''.join([piece async for piece in aiterator])
+
+
+class TestAsyncTranslation(unittest.TestCase):
+    """Test cases for the asyncio API."""
+
+    def test_matches_sync_functions(self):
+        """Test that chunked async translation matches the sync functions."""
+        for grade in (1, 2):
+            braille = text_to_braille(SAMPLE_TEXT, grade=grade)
+            with self.subTest(grade=grade):
+                self.assertEqual(asyncio.run(atext_to_braille(SAMPLE_TEXT, grade, chunk_size=50)),
+                                 braille)
+                self.assertEqual(asyncio.run(abraille_to_text(braille, grade, chunk_size=50)),
+                                 braille_to_text(braille, grade=grade))
+
+    def test_short_input(self):
+        """Test that whole-input phrases still work for short input."""
+        self.assertEqual(asyncio.run(atext_to_braille('Hello World')),
+                         text_to_braille('Hello World'))
+
+    def test_executor(self):
+        """Test that large inputs are translated on the given executor."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            result = asyncio.run(atext_to_braille(SAMPLE_TEXT, executor=executor,
+                                                  chunk_size=500, offload_threshold=1000))
+        self.assertEqual(result, text_to_braille(SAMPLE_TEXT))
+
+    def test_process_executor(self):
+        """Test that pieces can be translated in worker processes."""
+        braille = text_to_braille(SAMPLE_TEXT)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = asyncio.run(abraille_to_text(braille, executor=executor,
+                                                  chunk_size=500, offload_threshold=1000))
+        self.assertEqual(result, braille_to_text(braille))
+
+    def test_streaming(self):
+        """Test the async iterator variants with sync and async sources."""
+        braille = text_to_braille(SAMPLE_TEXT)
+        self.assertEqual(asyncio.run(collect(aiter_braille(achunks(SAMPLE_TEXT, 13)))), braille)
+        pieces = [braille[i:i + 11] for i in range(0, len(braille), 11)]
+        self.assertEqual(asyncio.run(collect(aiter_text(pieces, chunk_size=100))),
+                         braille_to_text(braille))
+
+    def test_yields_to_event_loop(self):
+        """Test that other tasks keep running while a document is translated."""
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.ensure_future(ticker())
+            await atext_to_braille(SAMPLE_TEXT, chunk_size=200)
+            task.cancel()
+            return ticks
+
+        self.assertGreater(asyncio.run(main()), len(SAMPLE_TEXT) // 1000)
+
+    def test_cancellation(self):
+        """Test that cancelling the caller stops translation between chunks."""
+        async def main():
+            task = asyncio.ensure_future(atext_to_braille(SAMPLE_TEXT * 10, chunk_size=100))
+            for _ in range(5):
+                await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+
+    def test_invalid_input(self):
+        """Test that invalid input is rejected."""
+        with self.assertRaises(TypeError):
+            asyncio.run(atext_to_braille(123))
+        with self.assertRaises(ValueError):
+            asyncio.run(abraille_to_text('⠁', grade=3))
+        with self.assertRaises(TypeError):
+            asyncio.run(collect(aiter_braille(['ok', 123])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Tests for batch translation of directory trees.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from b2a import cli
+from b2a.batch import format_summary, translate_tree
+from b2a.translator import text_to_braille, braille_to_text
+
+FILES = {
+    'a.txt': 'The Children sing 42 songs.\n',
+    'sub/b.txt': '  Hello World  ',
+    'sub/deeper/c.txt': 'THE teacher said: "Hello!"',
+}
+
+
+def write_tree(root, files):
+    """Create files under root from a mapping of relative paths to contents."""
+    for path, content in files.items():
+        full = os.path.join(root, path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
+def read(path):
+    """Read a UTF-8 file."""
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+class TestTranslateTree(unittest.TestCase):
+    """Test cases for translate_tree."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.tmp.name, 'in')
+        self.output_dir = os.path.join(self.tmp.name, 'out')
+        write_tree(self.input_dir, FILES)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_mirrors_tree(self):
+        """Test that every file is translated to the same relative path."""
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                summary = translate_tree(self.input_dir, self.output_dir, jobs=jobs, force=True)
+                self.assertEqual(summary.files, len(FILES))
+                self.assertEqual(summary.failures, [])
+                for path, content in FILES.items():
+                    output = read(os.path.join(self.output_dir, path))
+                    self.assertEqual(output, text_to_braille(content.strip()))
+
+    def test_braille_to_text(self):
+        """Test translating a tree of Braille files back to text."""
+        braille = {path: text_to_braille(content.strip(), grade=1) for path, content in FILES.items()}
+        braille_dir = os.path.join(self.tmp.name, 'brl')
+        write_tree(braille_dir, braille)
+        translate_tree(braille_dir, self.output_dir, grade=1,
+                       direction='braille-to-text', jobs=1)
+        for path, cells in braille.items():
+            self.assertEqual(read(os.path.join(self.output_dir, path)),
+                             braille_to_text(cells, grade=1))
+
+    def test_skips_up_to_date_outputs(self):
+        """Test that only files newer than their outputs are translated again."""
+        translate_tree(self.input_dir, self.output_dir, jobs=1)
+        summary = translate_tree(self.input_dir, self.output_dir, jobs=1)
+        self.assertEqual((summary.files, summary.skipped), (0, len(FILES)))
+
+        source = os.path.join(self.input_dir, 'a.txt')
+        target = os.path.join(self.output_dir, 'a.txt')
+        write_tree(self.input_dir, {'a.txt': 'sing'})
+        stat = os.stat(target)
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        summary = translate_tree(self.input_dir, self.output_dir, jobs=1)
+        self.assertEqual((summary.files, summary.skipped), (1, len(FILES) - 1))
+        self.assertEqual(read(target), text_to_braille('sing'))
+
+    def test_failures_are_reported(self):
+        """Test that an undecodable file fails without stopping the others."""
+        with open(os.path.join(self.input_dir, 'bad.txt'), 'wb') as f:
+            f.write(b'\xff\xfe')
+        summary = translate_tree(self.input_dir, self.output_dir, jobs=2)
+        self.assertEqual(summary.files, len(FILES))
+        self.assertEqual([os.path.basename(path) for path, _ in summary.failures], ['bad.txt'])
+
+    def test_failure_while_writing(self):
+        """Test that a file failing partway leaves no partial output behind."""
+        translator = mock.Mock()
+
+        def fail(content, batch_size):
+            yield text_to_braille('the')
+            raise RuntimeError('translation failed')
+
+        translator.iter_encode = fail
+        with mock.patch('b2a.batch._default_translator', return_value=translator):
+            summary = translate_tree(self.input_dir, self.output_dir, jobs=1)
+        self.assertEqual(len(summary.failures), len(FILES))
+        self.assertIn('translation failed', summary.failures[0][1])
+        outputs = [name for _, _, files in os.walk(self.output_dir) for name in files]
+        self.assertEqual(outputs, [])
+
+    def test_output_inside_input(self):
+        """Test that an output directory inside the input tree is not read back."""
+        output_dir = os.path.join(self.input_dir, 'out')
+        translate_tree(self.input_dir, output_dir, jobs=1)
+        summary = translate_tree(self.input_dir, output_dir, jobs=1)
+        self.assertEqual(summary.skipped, len(FILES))
+
+    def test_invalid_arguments(self):
+        """Test that invalid arguments are rejected."""
+        with self.assertRaises(ValueError):
+            translate_tree(self.input_dir, self.output_dir, grade=3)
+        with self.assertRaises(ValueError):
+            translate_tree(self.input_dir, self.output_dir, jobs=0)
+        with self.assertRaises(NotADirectoryError):
+            translate_tree(os.path.join(self.tmp.name, 'missing'), self.output_dir)
+
+    def test_cli(self):
+        """Test the batch subcommand and its throughput summary."""
+        stderr = io.StringIO()
+        argv = ['b2a', 'batch', self.input_dir, self.output_dir, '--jobs', '1', '--grade', '1']
+        with mock.patch.object(sys, 'argv', argv), mock.patch.object(sys, 'stderr', stderr):
+            cli.main()
+        self.assertIn(f'Translated {len(FILES)} files (0 skipped, 0 failed)', stderr.getvalue())
+        self.assertIn('MB/s', stderr.getvalue())
+        self.assertEqual(read(os.path.join(self.output_dir, 'sub', 'b.txt')),
+                         text_to_braille('Hello World', grade=1))
+
+    def test_format_summary(self):
+        """Test the throughput summary line."""
+        summary = translate_tree(self.input_dir, self.output_dir, jobs=1)
+        line = format_summary(summary._replace(bytes=2_000_000, seconds=2.0))
+        self.assertEqual(line, 'Translated 3 files (0 skipped, 0 failed) in 2.00s: '
+                               '1.5 files/s, 1.00 MB/s')
+
+
+if __name__ == '__main__':
+    unittest.main()
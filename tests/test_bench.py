@@ -0,0 +1,88 @@
+"""
+Tests for the benchmark suite.
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from b2a import cli
+from b2a.bench import compare, generate_corpus, run_benchmarks
+
+
+def run_cli(*argv):
+    """Run the CLI and return its standard output and standard error."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with mock.patch.object(sys, 'argv', ['b2a', *argv]), \
+            mock.patch.object(sys, 'stdout', stdout), \
+            mock.patch.object(sys, 'stderr', stderr):
+        cli.main()
+    return stdout.getvalue(), stderr.getvalue()
+
+
+class TestBench(unittest.TestCase):
+    """Test cases for the benchmark suite."""
+
+    def test_corpora_are_deterministic(self):
+        """Test that generated corpora are the same on every run."""
+        for name in ('labels', 'paragraphs', 'book'):
+            with self.subTest(corpus=name):
+                corpus = generate_corpus(name, scale=0.01)
+                self.assertTrue(corpus)
+                self.assertEqual(corpus, generate_corpus(name, scale=0.01))
+        with self.assertRaises(ValueError):
+            generate_corpus('poems')
+
+    def test_report(self):
+        """Test that every benchmark reports speed, latency and memory."""
+        report = run_benchmarks(['labels', 'book'], scale=0.001, min_time=0)
+        self.assertEqual(len(report['results']), 8)
+        for result in report['results']:
+            self.assertGreater(result['chars_per_sec'], 0)
+            self.assertLessEqual(result['latency_us']['p50'], result['latency_us']['max'])
+            self.assertGreaterEqual(result['peak_memory_bytes'], 0)
+        json.dumps(report)
+
+    def test_compare(self):
+        """Test that slowdowns and memory growth beyond the tolerance are flagged."""
+        report = run_benchmarks(['labels'], grades=[1], directions=['text-to-braille'],
+                                scale=0.01, min_time=0)
+        self.assertEqual(compare(report, report), [])
+
+        result = report['results'][0]
+        faster = dict(result, chars_per_sec=result['chars_per_sec'] * 2)
+        self.assertEqual(len(compare(report, {'results': [faster]})), 1)
+        smaller = dict(result, peak_memory_bytes=result['peak_memory_bytes'] // 2 or 1)
+        self.assertEqual(len(compare(report, {'results': [smaller]}, tolerance=0.5)), 1)
+
+    def test_cli(self):
+        """Test the bench subcommand with a file corpus, output and baseline."""
+        with tempfile.TemporaryDirectory() as tmp:
+            corpus = os.path.join(tmp, 'corpus.txt')
+            output = os.path.join(tmp, 'results.json')
+            with open(corpus, 'w', encoding='utf-8') as f:
+                f.write('The children sing with their friends. ' * 20)
+
+            stdout, _ = run_cli('bench', '--file', corpus, '--grade', '2', '--min-time', '0',
+                                '--output', output)
+            self.assertIn('chars/s', stdout)
+            with open(output, encoding='utf-8') as f:
+                report = json.load(f)
+            self.assertEqual({r['corpus'] for r in report['results']}, {corpus})
+
+            # A baseline claiming far higher speed makes the run fail
+            for result in report['results']:
+                result['chars_per_sec'] *= 1000
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(report, f)
+            with self.assertRaises(SystemExit):
+                run_cli('bench', '--file', corpus, '--grade', '2', '--min-time', '0',
+                        '--baseline', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Tests for BRF (North American ASCII Braille) input and output.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from b2a import cli
+from b2a.brf import NABCC, BRFReader, BRFWriter, braille_to_brf, brf_to_braille
+from b2a.translator import text_to_braille, braille_to_text, text_to_brf, brf_to_text
+
+SAMPLE_TEXT = (
+    'The Children sing 42 songs, and THE teacher said: "Hello!"\n'
+    'Then 7 more people came from Rome with 1001 questions.\n'
+) * 20
+
+
+class TestBRF(unittest.TestCase):
+    """Test cases for converting between Unicode Braille and BRF."""
+
+    def test_table(self):
+        """Test the North American Braille Computer Code table."""
+        self.assertEqual(len(NABCC), 64)
+        self.assertEqual(len(set(NABCC)), 64)
+        self.assertEqual(braille_to_brf('⠁⠃⠉ ⠼⠁⠃ ⠿⠮⠸'), b'ABC #AB =!_')
+
+    def test_round_trip(self):
+        """Test that all six-dot cells, spaces and line breaks round trip."""
+        braille = ''.join(chr(0x2801 + i) for i in range(63)) + ' \n\r\f⠁'
+        brf = braille_to_brf(braille)
+        self.assertEqual(len(brf), len(braille))
+        self.assertEqual(brf_to_braille(brf), braille)
+        self.assertEqual(brf_to_braille(brf.decode('ascii')), braille)
+        self.assertEqual(brf_to_braille(b'A B'), '⠁ ⠃')
+
+    def test_lower_case(self):
+        """Test that lower-case BRF is read like upper case."""
+        self.assertEqual(brf_to_braille(b'hello `{|}~'), brf_to_braille(b'HELLO @[\\]^'))
+
+    def test_invalid(self):
+        """Test that characters BRF cannot represent are rejected with their position."""
+        for braille, position in (('⠁⡀', 1), ('\t⠁a', 2), ('a', 0), ('⠁⣰', 1), ('⠁😀', 1)):
+            with self.subTest(braille=braille):
+                with self.assertRaisesRegex(ValueError, f'position {position}'):
+                    braille_to_brf(braille)
+        for brf, position in ((b'AB\x80', 2), (b'\t', 0), (b'A\x7f', 1)):
+            with self.subTest(brf=brf):
+                with self.assertRaisesRegex(ValueError, f'position {position}'):
+                    brf_to_braille(brf)
+
+    def test_whitespace(self):
+        """Test that tabs and other whitespace become blank cells."""
+        self.assertEqual(braille_to_brf('⠁\t⠃\u00a0⠉\u3000⠙\n'), b'A B C D\n')
+        self.assertEqual(text_to_brf('a\tb', grade=1), b'A B')
+        self.assertEqual(text_to_brf('and\tthe'), b'& !')
+
+    def test_translation_functions(self):
+        """Test text_to_brf and brf_to_text."""
+        for grade in (1, 2):
+            with self.subTest(grade=grade):
+                braille = text_to_braille(SAMPLE_TEXT, grade=grade)
+                brf = text_to_brf(SAMPLE_TEXT, grade=grade)
+                self.assertEqual(brf, braille_to_brf(braille))
+                self.assertEqual(brf_to_text(brf, grade=grade), braille_to_text(braille, grade=grade))
+                self.assertEqual(brf_to_text(brf.decode('ascii'), grade=grade),
+                                 braille_to_text(braille, grade=grade))
+        with self.assertRaises(TypeError):
+            brf_to_text(None)
+
+    def test_reader_writer(self):
+        """Test converting binary streams in small chunks."""
+        braille = text_to_braille(SAMPLE_TEXT)
+        output = io.BytesIO()
+        writer = BRFWriter(output)
+        for i in range(0, len(braille), 7):
+            writer.write(braille[i:i + 7])
+        self.assertEqual(output.getvalue(), braille_to_brf(braille))
+
+        reader = BRFReader(io.BytesIO(output.getvalue()))
+        chunks = []
+        while True:
+            chunk = reader.read(5)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        self.assertEqual(''.join(chunks), braille)
+
+    def test_cli(self):
+        """Test --format brf with and without --stream."""
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, 'input.txt')
+            output_path = os.path.join(tmp, 'output.brf')
+            with open(input_path, 'w', encoding='utf-8') as f:
+                f.write(SAMPLE_TEXT)
+            expected = text_to_brf(SAMPLE_TEXT.strip())
+
+            for stream in ([], ['--stream']):
+                with self.subTest(stream=bool(stream)):
+                    with mock.patch.object(sys, 'argv', ['b2a', 'text-to-braille', '--format', 'brf',
+                                                         *stream, '-i', input_path, '-o', output_path]):
+                        cli.main()
+                    with open(output_path, 'rb') as f:
+                        self.assertEqual(f.read(), expected)
+
+                    stdout = io.StringIO()
+                    argv = ['b2a', 'braille-to-text', '--format', 'brf', *stream, '-i', output_path]
+                    with mock.patch.object(sys, 'argv', argv), mock.patch.object(sys, 'stdout', stdout):
+                        cli.main()
+                    self.assertEqual(stdout.getvalue(),
+                                     brf_to_text(expected) + '\n')
+
+    def test_cli_tab(self):
+        """Test that --format brf writes a tab in the input as a blank cell."""
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, 'input.txt')
+            output_path = os.path.join(tmp, 'output.brf')
+            with open(input_path, 'w', encoding='utf-8') as f:
+                f.write('Name\tAge\nBob\t42\n')
+            for stream in ([], ['--stream']):
+                with self.subTest(stream=bool(stream)):
+                    argv = ['b2a', 'text-to-braille', '--format', 'brf', *stream,
+                            '-i', input_path, '-o', output_path]
+                    with mock.patch.object(sys, 'argv', argv):
+                        cli.main()
+                    with open(output_path, 'rb') as f:
+                        self.assertEqual(f.read(), b',NAME ,AGE\n,BOB #42')
+
+
+if __name__ == '__main__':
+    unittest.main()
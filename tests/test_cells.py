@@ -0,0 +1,57 @@
+"""
+Tests for the dot-mask representation of Braille cells.
+"""
+
+import unittest
+
+from b2a.cells import from_dots, to_dots, to_dots_array, text_to_dots, dots_to_text
+from b2a.translator import text_to_braille, braille_to_text
+
+SAMPLE_TEXT = 'The Children sing 42 songs, and THE teacher said: "Hello!"'
+
+
+class TestDotMasks(unittest.TestCase):
+    """Test cases for converting between Braille and dot masks."""
+
+    def test_masks(self):
+        """Test that masks are codepoints minus U+2800 and spaces are blank."""
+        self.assertEqual(to_dots('⠁⠃ ⣿'), bytearray([0x01, 0x03, 0x00, 0xff]))
+        self.assertEqual(to_dots(''), bytearray())
+        self.assertEqual(list(to_dots_array('⠓⠊')), [0x13, 0x0a])
+        self.assertEqual(to_dots_array('⠓⠊').typecode, 'B')
+
+    def test_round_trip(self):
+        """Test that every cell survives a round trip."""
+        braille = ''.join(chr(0x2801 + i) for i in range(255)) + ' ⠁'
+        self.assertEqual(from_dots(to_dots(braille)), braille)
+        self.assertEqual(from_dots(to_dots_array(braille)), braille)
+        self.assertEqual(from_dots(memoryview(bytes(to_dots(braille)))), braille)
+
+    def test_blank(self):
+        """Test how blank cells are converted back."""
+        self.assertEqual(from_dots(b'\x01\x00\x01'), '⠁ ⠁')
+        self.assertEqual(from_dots(b'\x01\x00\x01', blank=None), '⠁⠀⠁')
+        self.assertEqual(to_dots('⠁⠀⠁'), to_dots('⠁ ⠁'))
+
+    def test_invalid_input(self):
+        """Test that characters other than cells and spaces are rejected."""
+        for braille, position in (('⠁\n', 1), ('a', 0), ('⠁⠁😀', 2)):
+            with self.subTest(braille=braille):
+                with self.assertRaisesRegex(ValueError, f'position {position}'):
+                    to_dots(braille)
+        with self.assertRaises(TypeError):
+            to_dots(b'\x01')
+
+    def test_translation(self):
+        """Test translating text to and from dot masks."""
+        for grade in (1, 2):
+            with self.subTest(grade=grade):
+                braille = text_to_braille(SAMPLE_TEXT, grade=grade)
+                masks = text_to_dots(SAMPLE_TEXT, grade=grade)
+                self.assertEqual(masks, to_dots(braille))
+                self.assertEqual(dots_to_text(masks, grade=grade),
+                                 braille_to_text(braille, grade=grade))
+
+
+if __name__ == '__main__':
+    unittest.main()
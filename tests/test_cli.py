@@ -0,0 +1,176 @@
+"""
+Tests for the B2A command-line interface.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from b2a import cli
+from b2a.translator import (Translator, auto_translate, text_to_braille, braille_to_text,
+                            text_to_brf, brf_to_text)
+
+SAMPLE_TEXT = (
+    '  The Children sing 42 songs, and THE teacher said: "Hello!"\n'
+    'Then 7 more people came from Rome with 1001 questions.\t  \n'
+) * 5
+
+
+def run_cli(*argv):
+    """Run the CLI with the given arguments and return its standard output."""
+    stdout = io.StringIO()
+    with mock.patch.object(sys, 'argv', ['b2a', *argv]), \
+            mock.patch.object(sys, 'stdout', stdout):
+        cli.main()
+    return stdout.getvalue()
+
+
+class TestStreaming(unittest.TestCase):
+    """Test cases for the --stream mode."""
+
+    def test_pieces_end_at_boundaries(self):
+        """Test that pieces are cut after whitespace and stripped at the ends."""
+        boundary = Translator().stream_boundary()
+        pieces = list(cli.iter_stream_pieces(io.StringIO(SAMPLE_TEXT), boundary, 16))
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual(''.join(pieces), SAMPLE_TEXT.strip())
+        for piece in pieces[:-1]:
+            self.assertTrue(piece[-1].isspace())
+
+    def test_stream_matches_whole_translation(self):
+        """Test that streamed translation matches translating the whole input."""
+        for grade in (1, 2):
+            with self.subTest(grade=grade, direction='text-to-braille'):
+                boundary = Translator(grade).stream_boundary()
+                pieces = cli.iter_stream_pieces(io.StringIO(SAMPLE_TEXT), boundary, 7)
+                streamed = ''.join(text_to_braille(piece, grade=grade) for piece in pieces)
+                self.assertEqual(streamed, text_to_braille(SAMPLE_TEXT.strip(), grade=grade))
+
+            braille = text_to_braille(SAMPLE_TEXT.strip(), grade=grade)
+            with self.subTest(grade=grade, direction='braille-to-text'):
+                boundary = Translator(grade).stream_boundary(decode=True)
+                pieces = cli.iter_stream_pieces(io.StringIO(braille), boundary, 7)
+                streamed = ''.join(braille_to_text(piece, grade=grade) for piece in pieces)
+                self.assertEqual(streamed, braille_to_text(braille, grade=grade))
+
+    def test_braille_lines_bounded(self):
+        """Test that Braille with one word per line is streamed in bounded pieces."""
+        text = '\n'.join(['the', 'Children', 'sing', '42', 'songs', 'Rome', 'BATH'] * 20000)
+        for grade in (1, 2):
+            with self.subTest(grade=grade):
+                braille = text_to_braille(text, grade=grade)
+                self.assertNotIn(' ', braille)
+                boundary = Translator(grade).stream_boundary(decode=True)
+                pieces = list(cli.iter_stream_pieces(io.StringIO(braille), boundary, 4096))
+                self.assertEqual(''.join(pieces), braille)
+                self.assertGreater(len(pieces), 10)
+                self.assertLess(max(map(len, pieces)), 4096 + 64)
+
+    def test_stream_files(self):
+        """Test the --stream option with input and output files."""
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, 'input.txt')
+            output_path = os.path.join(tmp, 'output.brl')
+            with open(input_path, 'w', encoding='utf-8') as f:
+                f.write(SAMPLE_TEXT)
+
+            run_cli('text-to-braille', '--stream', '-i', input_path, '-o', output_path)
+            with open(output_path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), text_to_braille(SAMPLE_TEXT.strip()))
+
+    def test_stream_stdout(self):
+        """Test that --stream output to stdout matches the default mode."""
+        with mock.patch.object(sys, 'stdin', io.StringIO(SAMPLE_TEXT)):
+            streamed = run_cli('text-to-braille', '--stream', '--grade', '1')
+        with mock.patch.object(sys, 'stdin', io.StringIO(SAMPLE_TEXT)):
+            whole = run_cli('text-to-braille', '--grade', '1')
+        self.assertEqual(streamed, whole)
+
+
+class TestAuto(unittest.TestCase):
+    """Test cases for the auto command."""
+
+    def test_auto(self):
+        """Test that mixed input is translated run by run."""
+        mixed = f'See {text_to_braille("the note")} below'
+        self.assertEqual(run_cli('auto', mixed), auto_translate(mixed) + '\n')
+        with mock.patch.object(sys, 'stdin', io.StringIO(mixed + '\n')):
+            self.assertEqual(run_cli('auto', '--grade', '1'), auto_translate(mixed, grade=1) + '\n')
+
+
+class ChunkReader(io.RawIOBase):
+    """Binary stdin that returns one chunk per read, checking the output so far."""
+
+    def __init__(self, chunks, stdout, check):
+        self.chunks = list(chunks)
+        self.stdout = stdout
+        self.check = check
+
+    def readable(self):
+        return True
+
+    def read1(self, size=-1):
+        self.check(self.stdout.getvalue())
+        return self.chunks.pop(0) if self.chunks else b''
+
+
+class TestLineBuffered(unittest.TestCase):
+    """Test cases for the --line-buffered and -0 modes."""
+
+    def run_filter(self, argv, stdin):
+        stdout = io.BytesIO()
+        text_stdin = io.TextIOWrapper(stdin, encoding='utf-8')
+        text_stdout = io.TextIOWrapper(stdout, encoding='utf-8')
+        with mock.patch.object(sys, 'argv', ['b2a', *argv]), \
+                mock.patch.object(sys, 'stdin', text_stdin), \
+                mock.patch.object(sys, 'stdout', text_stdout):
+            cli.main()
+        return stdout.getvalue()
+
+    def test_records(self):
+        """Test that every record is translated on its own, keeping delimiters."""
+        lines = SAMPLE_TEXT.split('\n')
+        for grade in (1, 2):
+            with self.subTest(grade=grade):
+                expected = '\n'.join(text_to_braille(line, grade=grade) for line in lines)
+                output = self.run_filter(['text-to-braille', '--line-buffered', '--grade', str(grade)],
+                                         io.BytesIO(SAMPLE_TEXT.encode('utf-8')))
+                self.assertEqual(output.decode('utf-8'), expected)
+
+                output = self.run_filter(['braille-to-text', '--line-buffered', '--grade', str(grade)],
+                                         io.BytesIO(output))
+                self.assertEqual(output.decode('utf-8'),
+                                 '\n'.join(braille_to_text(line, grade=grade)
+                                           for line in expected.split('\n')))
+
+    def test_null_brf(self):
+        """Test NUL-delimited records with BRF output and input."""
+        output = self.run_filter(['text-to-braille', '-0', '--format', 'brf'],
+                                 io.BytesIO(b'the hat\0and\nthen\0'))
+        self.assertEqual(output, b'\0'.join([text_to_brf('the hat'),
+                                              text_to_brf('and\nthen'), b'']))
+        decoded = self.run_filter(['braille-to-text', '--null', '--format', 'brf'],
+                                  io.BytesIO(output))
+        self.assertEqual(decoded.split(b'\0'),
+                         [brf_to_text(record).encode('utf-8')
+                          for record in output.split(b'\0')])
+
+    def test_flush_per_read(self):
+        """Test that complete records are written before the next read."""
+        chunks = [b'the c', b'at\nHello ', b'there\nand\nfor\n', b'last']
+        expected = ['', '', '⠮ ⠉⠁⠞\n', '⠮ ⠉⠁⠞\n⠠⠓⠑⠇⠇⠕ ⠮⠗\n⠯\n⠿\n']
+        seen = []
+        stdout = io.BytesIO()
+        reader = ChunkReader(chunks, stdout, lambda output: seen.append(output.decode('utf-8')))
+        with mock.patch.object(sys, 'stdin', mock.Mock(buffer=reader)), \
+                mock.patch.object(sys, 'stdout', mock.Mock(buffer=stdout)):
+            cli.filter_records(text_to_braille)
+        self.assertEqual(seen[:4], expected)
+        self.assertEqual(stdout.getvalue().decode('utf-8'), expected[-1] + text_to_braille('last'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Tests for the braille-g1 and braille-g2 codecs.
+"""
+
+import codecs
+import gc
+import io
+import os
+import tempfile
+import unittest
+
+import b2a  # noqa: F401  registers the braille codecs
+from b2a.translator import text_to_braille, braille_to_text
+
+SAMPLE_TEXT = (
+    'The Children sing 42 songs, and THE teacher said: "Hello!"\n'
+    'Then 7 more people came from Rome with 1001 questions.\n'
+) * 20
+
+
+class TestBrailleCodecs(unittest.TestCase):
+    """Test cases for the Braille codecs."""
+
+    def test_lookup(self):
+        """Test that both codecs are registered under either spelling."""
+        self.assertEqual(codecs.lookup('braille-g1').name, 'braille-g1')
+        self.assertEqual(codecs.lookup('braille_g2').name, 'braille-g2')
+
+    def test_stateless(self):
+        """Test str.encode and bytes.decode with the codecs."""
+        for grade in (1, 2):
+            name = f'braille-g{grade}'
+            with self.subTest(codec=name):
+                braille = text_to_braille(SAMPLE_TEXT, grade=grade)
+                self.assertEqual(SAMPLE_TEXT.encode(name), braille.encode('utf-8'))
+                self.assertEqual(braille.encode('utf-8').decode(name),
+                                 braille_to_text(braille, grade=grade))
+
+    def test_incremental(self):
+        """Test that chunked input gives the same result as whole input."""
+        for grade in (1, 2):
+            name = f'braille-g{grade}'
+            braille = text_to_braille(SAMPLE_TEXT, grade=grade)
+            with self.subTest(codec=name, direction='encode'):
+                # Chunks of three characters also split words and runs of digits
+                encoder = codecs.getincrementalencoder(name)()
+                chunks = [encoder.encode(SAMPLE_TEXT[i:i+3]) for i in range(0, len(SAMPLE_TEXT), 3)]
+                chunks.append(encoder.encode('', final=True))
+                self.assertEqual(b''.join(chunks), braille.encode('utf-8'))
+
+            with self.subTest(codec=name, direction='decode'):
+                # Chunks of four bytes also split multi-byte characters
+                data = braille.encode('utf-8')
+                decoder = codecs.getincrementaldecoder(name)()
+                chunks = [decoder.decode(data[i:i+4]) for i in range(0, len(data), 4)]
+                chunks.append(decoder.decode(b'', final=True))
+                self.assertEqual(''.join(chunks), braille_to_text(braille, grade=grade))
+
+    def test_grade2_encoder_state(self):
+        """Test that the Grade 2 encoder holds back a partial word until it ends."""
+        encoder = codecs.getincrementalencoder('braille-g2')()
+        self.assertEqual(encoder.encode('the chil'), text_to_braille('the ').encode('utf-8'))
+        state = encoder.getstate()
+        self.assertNotEqual(state, 0)
+        rest = encoder.encode('dren', final=True)
+        self.assertEqual(rest, text_to_braille('children').encode('utf-8'))
+        self.assertEqual(encoder.getstate(), 0)
+        encoder.setstate(state)
+        self.assertEqual(encoder.encode('dren', final=True), rest)
+        # Whole-input phrases still apply to the whole input
+        encoder.reset()
+        self.assertEqual(encoder.encode('Hello World', final=True),
+                         text_to_braille('Hello World').encode('utf-8'))
+
+    def test_open(self):
+        """Test reading and writing files with open()."""
+        for grade in (1, 2):
+            name = f'braille-g{grade}'
+            braille = text_to_braille(SAMPLE_TEXT, grade=grade)
+            with self.subTest(codec=name), tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'sample.brl')
+                with open(path, 'w', encoding=name) as f:
+                    for i in range(0, len(SAMPLE_TEXT), 7):
+                        f.write(SAMPLE_TEXT[i:i+7])
+                with open(path, encoding='utf-8') as f:
+                    self.assertEqual(f.read(), braille)
+                with open(path, encoding=name) as f:
+                    self.assertEqual(''.join(f), braille_to_text(braille, grade=grade))
+
+    def test_open_grade2_short_lines(self):
+        """Test that short Grade 2 text written with open() is not held back."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'label.brl')
+            for text in ('the\n', 'Hello World\n', 'this\n'):
+                with self.subTest(text=text):
+                    with open(path, 'w', encoding='braille-g2') as f:
+                        f.write(text)
+                    with open(path, encoding='utf-8') as f:
+                        self.assertEqual(f.read(), text_to_braille(text))
+
+    def test_open_grade2_unfinished_word(self):
+        """Test that a last word open() can never write is reported."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'label.brl')
+            with self.assertWarnsRegex(RuntimeWarning, 'never written'):
+                f = open(path, 'w', encoding='braille-g2')
+                f.write('the end')
+                f.close()
+                del f
+                gc.collect()
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), text_to_braille('the '))
+
+    def test_open_no_trailing_newline(self):
+        """Test that text written with open() is written in full without a final newline."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'label.brl')
+            # Writes cut anywhere, even inside a number
+            for pieces in (['abc'], ['hello world again'], ['Room 1', '2'], ['Room 12', ' B']):
+                text = ''.join(pieces)
+                with self.subTest(text=text):
+                    with open(path, 'w', encoding='braille-g1') as f:
+                        for piece in pieces:
+                            f.write(piece)
+                    with open(path, encoding='utf-8') as f:
+                        self.assertEqual(f.read(), text_to_braille(text, grade=1))
+                    with open(path, encoding='braille-g1') as f:
+                        self.assertEqual(f.read(), text)
+
+    def test_stream_reader_writer(self):
+        """Test the StreamReader and StreamWriter classes."""
+        text = SAMPLE_TEXT.strip()
+        for grade in (1, 2):
+            name = f'braille-g{grade}'
+            braille = text_to_braille(text, grade=grade)
+            with self.subTest(codec=name):
+                output = io.BytesIO()
+                writer = codecs.getwriter(name)(output)
+                for i in range(0, len(text), 5):
+                    writer.write(text[i:i+5])
+                # The last word is written by reset()
+                writer.reset()
+                self.assertEqual(output.getvalue(), braille.encode('utf-8'))
+
+                reader = codecs.getreader(name)(io.BytesIO(braille.encode('utf-8')))
+                chunks = []
+                while True:
+                    chunk = reader.read(13)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                self.assertEqual(''.join(chunks), braille_to_text(braille, grade=grade))
+
+    def test_stream_writer_close(self):
+        """Test that closing a StreamWriter writes the last word."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'label.brl')
+            with codecs.getwriter('braille-g2')(open(path, 'wb')) as writer:
+                writer.write('the chil')
+                writer.write('dren')
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), text_to_braille('the children'))
+
+    def test_stream_reader_lines(self):
+        """Test reading lines, with the last word finished at the end of the stream."""
+        braille = text_to_braille('the children\nsing songs', grade=2)
+        reader = codecs.getreader('braille-g2')(io.BytesIO(braille.encode('utf-8')))
+        lines = braille_to_text(braille, grade=2).splitlines(keepends=True)
+        self.assertEqual(reader.readline(), lines[0])
+        self.assertEqual(reader.readline(), lines[1])
+        self.assertEqual(reader.readline(), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Tests for the warm CLI worker.
+"""
+
+import io
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from b2a import cli
+from b2a.daemon import forward, run_worker
+from b2a.translator import text_to_braille, braille_to_text
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX') and hasattr(os, 'fork'),
+                     'needs Unix domain sockets and fork')
+class TestDaemon(unittest.TestCase):
+    """Test cases for running commands through the warm worker."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmp.name, 'run', 'daemon.sock')
+        self.env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT,
+                        B2A_DAEMON_SOCKET=self.socket_path, B2A_DAEMON_IDLE_TIMEOUT='1')
+        self.env.pop('B2A_DAEMON', None)
+
+    def tearDown(self):
+        self.wait_for_exit()
+        self.tmp.cleanup()
+
+    def run_cli(self, *argv, input=None, env=None):
+        return subprocess.run([sys.executable, '-m', 'b2a.cli', *argv], input=input,
+                              capture_output=True, text=True, cwd=self.tmp.name,
+                              env=env or self.env, timeout=30)
+
+    def wait_for_exit(self):
+        paths = (self.socket_path, self.socket_path + '.lock')
+        deadline = time.monotonic() + 10
+        while any(map(os.path.exists, paths)) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return not any(map(os.path.exists, paths))
+
+    def test_forward(self):
+        """Test that arguments, stdin, the directory and errors are forwarded."""
+        text = 'The Children sing 42 songs, and THE teacher said: "Hello!"'
+        result = self.run_cli('--daemon', 'text-to-braille', text)
+        self.assertEqual(result.stdout, text_to_braille(text) + '\n')
+        self.assertEqual(result.returncode, 0)
+        self.assertTrue(os.path.exists(self.socket_path))
+
+        # Started once, then reused, also when enabled by the environment
+        env = dict(self.env, B2A_DAEMON='1')
+        braille = text_to_braille(text)
+        result = self.run_cli('braille-to-text', input=braille + '\n', env=env)
+        self.assertEqual(result.stdout, braille_to_text(braille) + '\n')
+
+        result = self.run_cli('--daemon', 'text-to-braille', '--format', 'brf', input='the hat\n')
+        self.assertEqual(result.stdout, '! HAT\n')
+
+        result = self.run_cli('--daemon', 'text-to-braille', text, '-o', 'out.brl')
+        with open(os.path.join(self.tmp.name, 'out.brl'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), text_to_braille(text))
+
+        result = self.run_cli('--daemon', 'braille-to-text', '-i', 'missing.brl')
+        self.assertEqual(result.returncode, 1)
+        self.assertIn('File not found: missing.brl', result.stderr)
+
+    def test_idle_timeout(self):
+        """Test that the worker removes its socket and lock file and exits when idle."""
+        self.assertEqual(self.run_cli('--daemon', 'text-to-braille', 'hi').returncode, 0)
+        self.assertTrue(self.wait_for_exit())
+        self.assertEqual(os.listdir(os.path.dirname(self.socket_path)), [])
+
+    def test_insecure_directory(self):
+        """Test that a shared or symlinked socket directory is refused."""
+        directory = os.path.dirname(self.socket_path)
+        os.makedirs(directory, mode=0o755)
+        os.chmod(directory, 0o755)
+        with self.assertRaises(PermissionError):
+            forward(['text-to-braille', 'hi'], self.socket_path)
+        with self.assertRaises(PermissionError):
+            run_worker(self.socket_path, 0.1)
+        result = self.run_cli('--daemon', 'text-to-braille', 'hi')
+        self.assertEqual(result.returncode, 1)
+        self.assertIn('Refusing to use', result.stderr)
+
+        target = os.path.join(self.tmp.name, 'target')
+        os.mkdir(target, 0o700)
+        link = os.path.join(self.tmp.name, 'link')
+        os.symlink(target, link)
+        with self.assertRaises(PermissionError):
+            forward(['text-to-braille', 'hi'], os.path.join(link, 'daemon.sock'))
+        self.assertEqual(os.listdir(target), [])
+
+
+class TestDaemonArguments(unittest.TestCase):
+    """Test cases for deciding which command lines are forwarded."""
+
+    def test_daemon_argv(self):
+        """Test that --daemon is found among the global options only."""
+        with mock.patch.dict(os.environ):
+            os.environ.pop('B2A_DAEMON', None)
+            self.assertEqual(cli.daemon_argv(['--daemon', 'auto', 'x']), ['auto', 'x'])
+            self.assertEqual(cli.daemon_argv(['--profile', 'p', '--daemon', 'auto']),
+                             ['--profile', 'p', 'auto'])
+            self.assertIsNone(cli.daemon_argv(['--profile', '--daemon', 'auto']))
+            self.assertIsNone(cli.daemon_argv(['auto', '--daemon']))
+            os.environ['B2A_DAEMON'] = '1'
+            self.assertEqual(cli.daemon_argv(['auto', 'x']), ['auto', 'x'])
+
+    def test_local_commands(self):
+        """Test that only the command itself decides whether it runs locally."""
+        self.assertIsNone(forward(['serve', '--port', '0']))
+        self.assertIsNone(forward(['--profile', 'serve', 'interactive']))
+        with mock.patch('b2a.daemon._secure_directory'), \
+                mock.patch('b2a.daemon._connect', side_effect=ConnectionRefusedError):
+            for argv in (['text-to-braille', 'serve'], ['--profile', 'serve', 'auto', 'x']):
+                with self.subTest(argv=argv), self.assertRaises(ConnectionRefusedError):
+                    forward(argv)
+
+    def test_local_command_forwarded_once(self):
+        """Test that a command the worker refuses runs locally without a second attempt."""
+        stdout = io.StringIO()
+        with mock.patch('b2a.daemon.forward', return_value=None) as forward_mock, \
+                mock.patch.object(sys, 'stdout', stdout):
+            cli.main(['--daemon', 'text-to-braille', 'the'])
+        forward_mock.assert_called_once_with(['text-to-braille', 'the'])
+        self.assertEqual(stdout.getvalue(), text_to_braille('the') + '\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
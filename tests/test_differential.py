@@ -0,0 +1,71 @@
+"""
+Tests for differential testing against the reference translator.
+"""
+
+import unittest
+
+from b2a import differential, reference
+from b2a.differential import (
+    ENGINES, format_report, generate_cases, minimize, register_engine, run_differential,
+)
+from b2a.translator import text_to_braille
+
+
+def _broken_encode(text: str, grade: int) -> str:
+    """Forget every capital sign, to give the harness something to find."""
+    return text_to_braille(text, grade).replace('⠠', '')
+
+
+class TestDifferential(unittest.TestCase):
+    """Test cases for comparing engines with the frozen reference."""
+
+    def tearDown(self):
+        ENGINES.pop('broken', None)
+
+    def test_engines_match_reference(self):
+        """Test that no built-in engine disagrees with the reference."""
+        cases = generate_cases(150, seed=1)
+        directions = {case.direction for case in cases}
+        self.assertEqual(directions, {'text-to-braille', 'braille-to-text'})
+        self.assertEqual(cases, generate_cases(150, seed=1))
+
+        report = run_differential(cases, jobs=1)
+        self.assertEqual(report.mismatches, [], format_report(report))
+        self.assertEqual(report.cases, len(cases))
+        self.assertEqual(set(report.throughput), set(ENGINES))
+
+    def test_jobs(self):
+        """Test that checking on several processes finds the same results."""
+        register_engine('broken', _broken_encode)
+        cases = generate_cases(40, seed=2, grades=(2,), directions=('text-to-braille',),
+                               corpus=['Hello Rome'])
+        serial = run_differential(cases, ['translator', 'broken'], jobs=1)
+        parallel = run_differential(cases, ['translator', 'broken'], jobs=2)
+        self.assertTrue(serial.mismatches)
+        self.assertEqual(sorted(parallel.mismatches), sorted(serial.mismatches))
+
+    def test_minimized_mismatch(self):
+        """Test that a broken engine is reported with a minimized input."""
+        register_engine('broken', _broken_encode, grades=(1,))
+        cases = [differential.Case('text-to-braille', 1, 'the cat sat on Rome, 42 times'),
+                 differential.Case('text-to-braille', 2, 'the cat sat on Rome')]
+        report = run_differential(cases, ['broken'], jobs=1)
+        self.assertEqual(len(report.mismatches), 1)
+        mismatch = report.mismatches[0]
+        self.assertEqual(mismatch.input, 'R')
+        self.assertEqual(mismatch.expected, reference.text_to_braille('R', 1))
+        self.assertEqual(mismatch.actual, '⠗')
+        self.assertIn('minimized from 29 characters', format_report(report))
+
+        self.assertEqual(minimize(_broken_encode, reference.text_to_braille, 'abc', 1), 'abc')
+
+    def test_unknown_engine(self):
+        """Test that unknown engines and bad registrations are rejected."""
+        with self.assertRaises(ValueError):
+            run_differential([], ['missing'])
+        with self.assertRaises(ValueError):
+            register_engine('broken')
+
+
+if __name__ == '__main__':
+    unittest.main()
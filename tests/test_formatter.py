@@ -0,0 +1,168 @@
+"""
+Tests for page formatting of Braille for embossing.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from b2a import cli
+from b2a.formatter import HYPHEN, PageFormatter, compile_patterns, format_braille, format_stream
+from b2a.translator import text_to_braille
+
+SAMPLE_TEXT = (
+    'The international transportation committee discussed the preliminary '
+    'disagreement between the Children and 1234567 members. Nevertheless, '
+    'everything was successful.\n'
+) * 30
+
+
+def lines_of(formatted):
+    """Return the lines of formatted Braille, without page breaks."""
+    return formatted.replace('\f', '').split('\n')[:-1]
+
+
+def unwrap(formatted):
+    """Join formatted lines back into words, undoing hyphenation."""
+    words = []
+    for line in lines_of(formatted):
+        words.extend(line.split())
+    text = ' '.join(words)
+    return text.replace(HYPHEN + ' ', '')
+
+
+class TestPageFormatter(unittest.TestCase):
+    """Test cases for wrapping, hyphenation and pagination."""
+
+    def test_lines_fit(self):
+        """Test that no line is longer than the line width."""
+        braille = text_to_braille(SAMPLE_TEXT)
+        for width in (8, 13, 20, 40):
+            with self.subTest(width=width):
+                formatted = format_braille(braille, cells_per_line=width)
+                for line in lines_of(formatted):
+                    self.assertLessEqual(len(line), width)
+
+    def test_words_kept(self):
+        """Test that wrapping keeps every cell in order."""
+        braille = text_to_braille(SAMPLE_TEXT.replace('\n', ' ')).strip()
+        formatted = format_braille(braille, cells_per_line=40, lines_per_page=None)
+        self.assertEqual(unwrap(formatted), braille)
+
+    def test_hyphenation(self):
+        """Test that words are hyphenated at pattern break points."""
+        braille = text_to_braille('the transportation', grade=1)
+        formatted = format_braille(braille, cells_per_line=16, lines_per_page=None)
+        self.assertEqual(lines_of(formatted),
+                         [text_to_braille('the transporta', grade=1) + HYPHEN,
+                          text_to_braille('tion', grade=1)])
+        formatted = format_braille(braille, cells_per_line=16, lines_per_page=None,
+                                   hyphenate=False)
+        self.assertEqual(lines_of(formatted),
+                         [text_to_braille('the', grade=1),
+                          text_to_braille('transportation', grade=1)])
+
+    def test_custom_patterns(self):
+        """Test hyphenating with patterns given by the caller."""
+        patterns = compile_patterns(['c1d'])
+        self.assertEqual(patterns['⠉⠙'], (0, 1, 0))
+        formatter = PageFormatter(cells_per_line=8, lines_per_page=None, patterns=patterns)
+        output = formatter.feed('⠁⠁ ⠉⠉⠉⠙⠙⠙', final=True)
+        self.assertEqual(output, '⠁⠁ ⠉⠉⠉' + HYPHEN + '\n⠙⠙⠙\n')
+        # 'about' is one contraction, so it is not broken even at a pattern
+        formatter = PageFormatter(cells_per_line=8, lines_per_page=None,
+                                  patterns=compile_patterns(['a1b']))
+        output = formatter.feed('⠁⠁ ⠉⠉⠁⠃⠉⠉', final=True)
+        self.assertEqual(output, '⠁⠁\n⠉⠉⠁⠃⠉⠉\n')
+        with self.assertRaises(ValueError):
+            compile_patterns(['a1!'])
+
+    def test_units_not_split(self):
+        """Test that indicators, numbers and multi-cell contractions stay whole."""
+        for unit in ('⠠⠁', '⠼⠂⠆⠒⠲', '⠸⠮'):
+            with self.subTest(unit=unit):
+                word = ('⠁' * 6 + unit) * 4
+                lines = lines_of(format_braille(word, cells_per_line=10, lines_per_page=None))
+                self.assertGreater(len(lines), 2)
+                self.assertEqual(''.join(line.rstrip(HYPHEN) for line in lines), word)
+                for line in lines:
+                    self.assertEqual(line.count(unit[0]), line.count(unit))
+
+    def test_long_words(self):
+        """Test that words longer than a line are broken anyway."""
+        formatted = format_braille('⠁' * 30, cells_per_line=10, lines_per_page=None)
+        self.assertEqual(lines_of(formatted), ['⠁' * 9 + HYPHEN] * 3 + ['⠁' * 3])
+
+    def test_pagination(self):
+        """Test page breaks and page numbers on the last line of each page."""
+        formatted = format_braille('⠁ ⠃ ⠉ ⠙ ⠑ ⠋ ⠛', cells_per_line=8, lines_per_page=2)
+        self.assertEqual(formatted, '⠁ ⠃ ⠉ ⠙\n⠑ ⠋   ⠼⠂\n\f⠛\n      ⠼⠆\n')
+        formatted = format_braille('⠁ ⠃ ⠉ ⠙ ⠑', cells_per_line=8, lines_per_page=2,
+                                   page_numbers=False)
+        self.assertEqual(formatted, '⠁ ⠃ ⠉ ⠙\n⠑\n')
+        formatted = format_braille('⠁\f⠃\n\n⠉', cells_per_line=8, lines_per_page=3,
+                                   page_numbers=False)
+        self.assertEqual(formatted, '⠁\n\f⠃\n\n⠉\n')
+        self.assertEqual(format_braille(''), '')
+
+    def test_wide_page_numbers(self):
+        """Test that long documents on narrow lines finish when page numbers grow."""
+        formatted = format_braille('⠁⠃ ' * 400, cells_per_line=8, lines_per_page=1)
+        lines = lines_of(formatted)
+        self.assertEqual(len(lines), 400)
+        self.assertEqual(lines[98], '⠁⠃   ⠼⠔⠔')
+        self.assertEqual(lines[99], '⠁⠃  ⠼⠂⠴⠴')
+        self.assertTrue(all(len(line) == 8 for line in lines))
+        # A book of more than 100 pages of 25 lines
+        formatted = format_braille('⠁⠃⠉⠙⠑⠋ ' * 3000, cells_per_line=8, lines_per_page=25)
+        self.assertEqual(formatted.count('\f'), 124)
+        self.assertTrue(formatted.endswith('    ⠼⠂⠆⠢\n'))
+        self.assertTrue(all(len(line) <= 8 for line in lines_of(formatted)))
+
+    def test_invalid_options(self):
+        """Test that too small pages are rejected."""
+        with self.assertRaises(ValueError):
+            PageFormatter(cells_per_line=4)
+        with self.assertRaises(ValueError):
+            PageFormatter(lines_per_page=0)
+
+    def test_streaming(self):
+        """Test that feeding pieces cut anywhere gives the same result."""
+        braille = text_to_braille(SAMPLE_TEXT)
+        expected = format_braille(braille, cells_per_line=20, lines_per_page=7)
+        for size in (1, 7, 100):
+            with self.subTest(size=size):
+                chunks = (braille[i:i + size] for i in range(0, len(braille), size))
+                output = ''.join(format_stream(chunks, cells_per_line=20, lines_per_page=7))
+                self.assertEqual(output, expected)
+
+    def test_cli(self):
+        """Test --cells-per-line with and without --stream."""
+        expected = format_braille(text_to_braille(SAMPLE_TEXT.strip()), cells_per_line=30,
+                                  lines_per_page=10)
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, 'input.txt')
+            output_path = os.path.join(tmp, 'output.brl')
+            with open(input_path, 'w', encoding='utf-8') as f:
+                f.write(SAMPLE_TEXT)
+            for stream in ([], ['--stream']):
+                with self.subTest(stream=bool(stream)):
+                    argv = ['b2a', 'text-to-braille', '--cells-per-line', '30',
+                            '--lines-per-page', '10', *stream, '-i', input_path]
+                    with mock.patch.object(sys, 'argv', argv + ['-o', output_path]):
+                        cli.main()
+                    with open(output_path, encoding='utf-8') as f:
+                        self.assertEqual(f.read(), expected)
+
+                    stdout = io.StringIO()
+                    with mock.patch.object(sys, 'argv', argv), \
+                            mock.patch.object(sys, 'stdout', stdout):
+                        cli.main()
+                    self.assertEqual(stdout.getvalue(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
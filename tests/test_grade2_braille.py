@@ -156,6 +156,30 @@ class TestGrade2Braille(unittest.TestCase):
                 normalized_round_trip = ''.join(c.lower() for c in round_trip if c.isalnum() or c.isspace())
                 self.assertEqual(normalized_round_trip, normalized_expected)
     
+    def test_partial_contraction_context(self):
+        """Test context rules and longest matches inside words."""
+        # Whole-word contractions are allowed at the end of a word
+        self.assertEqual(text_to_braille('bathe', grade=2), '⠃⠁⠮')
+        # Letter combinations are not contracted before a letter
+        self.assertEqual(text_to_braille('other', grade=2), '⠕⠞⠓⠻')
+        # Contractions longer than five letters are matched inside words
+        self.assertEqual(text_to_braille('shoulder', grade=2), '⠩⠙⠻')
+        self.assertEqual(text_to_braille('themselves!', grade=2), '⠮⠍⠧⠎⠖')
+        # Capital indicators are added once per word
+        self.assertEqual(text_to_braille('SINGING', grade=2), f'{CAPITAL_INDICATOR*2}⠎⠬⠬')
+
+    def test_back_translation_longest_match(self):
+        """Test that back-translation prefers the longest matching contraction."""
+        # Multi-cell contractions win over their leading cells
+        self.assertEqual(braille_to_text('⠁⠃', grade=2), 'about')
+        self.assertEqual(braille_to_text('⠮⠍⠧⠎', grade=2), 'themselves')
+        # Punctuation is used when no contraction or letter matches
+        self.assertEqual(braille_to_text('⠤', grade=2), '-')
+        # Unknown characters are passed through
+        self.assertEqual(braille_to_text('⠿x', grade=2), 'forx')
+        # Capitalized words use the same matcher
+        self.assertEqual(braille_to_text(f'{CAPITAL_INDICATOR}⠁⠃ ⠤', grade=2), 'About -')
+
     def test_grade1_fallback(self):
         """Test that Grade 1 Braille is used when Grade 2 contractions aren't available."""
         # Test with non-contracted words
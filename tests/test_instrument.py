@@ -0,0 +1,107 @@
+"""
+Tests for translation instrumentation and profiling.
+"""
+
+import io
+import os
+import pstats
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from b2a import cli, translator
+from b2a.instrument import PHASES, instrument, profile
+from b2a.translator import Translator, text_to_braille, braille_to_text
+
+SAMPLES = [
+    'The Children sing 42 songs, and THE teacher said: "Hello!"',
+    'Then 7 more people came from Rome with 1001 questions ½ é.',
+    'WITH the LAUGHTER of CHILDREN sing Ing thing',
+    '',
+]
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test cases for the instrument() context manager."""
+
+    def test_output_unchanged(self):
+        """Test that instrumented translation gives the same output."""
+        for grade in (1, 2):
+            for text in SAMPLES:
+                braille = text_to_braille(text, grade=grade)
+                # Include stray indicators and unknown cells
+                cells = braille + ' ⠠ ⠠⠠⠉⠓ ⠼⠁⠃ ⠿⠀⠠'
+                decoded = braille_to_text(cells, grade=grade)
+                with self.subTest(grade=grade, text=text):
+                    with instrument():
+                        self.assertEqual(text_to_braille(text, grade=grade), braille)
+                        self.assertEqual(braille_to_text(cells, grade=grade), decoded)
+
+    def test_counts(self):
+        """Test that contractions, passthrough characters and calls are counted."""
+        with instrument() as stats:
+            text_to_braille('the children sing ½')
+            braille_to_text('⠮ ⠡⠊⠇⠙⠗⠑⠝')
+            text_to_braille('abc', grade=1)
+        self.assertEqual(stats.calls[('text-to-braille', 2)], 1)
+        self.assertEqual(stats.calls[('braille-to-text', 2)], 1)
+        self.assertEqual(stats.calls[('text-to-braille', 1)], 1)
+        self.assertEqual(stats.chars[('text-to-braille', 1)], 3)
+        self.assertEqual(stats.contractions['the'], 2)
+        self.assertEqual(stats.contractions['ing'], 1)
+        self.assertEqual(stats.passthrough['½'], 1)
+        self.assertEqual(set(stats.phases), set(PHASES))
+        self.assertGreater(sum(stats.phases.values()), 0)
+        self.assertIn("'the'", stats.report())
+        self.assertEqual(stats.as_dict()['contractions']['the'], 2)
+
+    def test_disabled_outside_block(self):
+        """Test that instrumentation is removed when blocks end, even nested."""
+        with instrument() as outer:
+            with instrument() as inner:
+                text_to_braille('sing')
+            text_to_braille('sing')
+        text_to_braille('sing')
+        self.assertIsNone(translator._instrumentation)
+        self.assertEqual(sum(inner.calls.values()), 1)
+        self.assertEqual(sum(outer.calls.values()), 1)
+
+    def test_cache_bypassed(self):
+        """Test that cached translators are still counted word by word."""
+        cached = Translator(grade=2, cache_size=16)
+        expected = cached.encode('the sing')
+        with instrument() as stats:
+            self.assertEqual(cached.encode('the sing'), expected)
+        self.assertEqual(stats.contractions['ing'], 1)
+
+    def test_profile_files(self):
+        """Test that profile() writes a cProfile dump and a tracemalloc report."""
+        with tempfile.TemporaryDirectory() as tmp:
+            prefix = os.path.join(tmp, 'run')
+            with profile(prefix, top=5) as stats:
+                text_to_braille(' '.join(SAMPLES) * 10)
+            self.assertEqual(sum(stats.calls.values()), 1)
+            pstats.Stats(prefix + '.prof')
+            with open(prefix + '.tracemalloc.txt', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            self.assertTrue(1 <= len(lines) <= 5)
+
+    def test_cli_profile(self):
+        """Test the --profile command-line option."""
+        with tempfile.TemporaryDirectory() as tmp:
+            prefix = os.path.join(tmp, 'cli')
+            stdout, stderr = io.StringIO(), io.StringIO()
+            argv = ['b2a', '--profile', prefix, 'text-to-braille', 'the children sing']
+            with mock.patch.object(sys, 'argv', argv), \
+                    mock.patch.object(sys, 'stdout', stdout), \
+                    mock.patch.object(sys, 'stderr', stderr):
+                cli.main()
+            self.assertEqual(stdout.getvalue(), text_to_braille('the children sing') + '\n')
+            self.assertIn('Contractions', stderr.getvalue())
+            self.assertTrue(os.path.exists(prefix + '.prof'))
+            self.assertTrue(os.path.exists(prefix + '.tracemalloc.txt'))
+
+
+if __name__ == '__main__':
+    unittest.main()
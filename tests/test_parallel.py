@@ -0,0 +1,62 @@
+"""
+Tests for parallel batch translation.
+"""
+
+import itertools
+import unittest
+
+from b2a import translate_many
+from b2a.translator import text_to_braille, braille_to_text
+
+RECORDS = [
+    f'Record {i}: The Children sing with THE teacher, and {i * 7} people came.'
+    for i in range(500)
+]
+
+
+class TestTranslateMany(unittest.TestCase):
+    """Test cases for translate_many."""
+
+    def test_text_to_braille_in_order(self):
+        """Test that parallel results match serial translation, in order."""
+        for grade in (1, 2):
+            with self.subTest(grade=grade):
+                results = list(translate_many(RECORDS, grade=grade, workers=2, chunksize=16))
+                self.assertEqual(results, [text_to_braille(r, grade=grade) for r in RECORDS])
+
+    def test_braille_to_text(self):
+        """Test the braille-to-text direction."""
+        braille = [text_to_braille(r) for r in RECORDS[:100]]
+        results = list(translate_many(braille, direction='braille-to-text', workers=2, chunksize=7))
+        self.assertEqual(results, [braille_to_text(b) for b in braille])
+
+    def test_single_worker(self):
+        """Test that one worker translates in the current process."""
+        results = list(translate_many(RECORDS[:20], workers=1))
+        self.assertEqual(results, [text_to_braille(r) for r in RECORDS[:20]])
+
+    def test_lazy_input(self):
+        """Test that input is consumed lazily from an unbounded iterable."""
+        records = (f'word {i}' for i in itertools.count())
+        results = translate_many(records, workers=2, chunksize=4)
+        first = list(itertools.islice(results, 10))
+        results.close()
+        self.assertEqual(first, [text_to_braille(f'word {i}') for i in range(10)])
+
+    def test_invalid_arguments(self):
+        """Test that invalid arguments are rejected before any work starts."""
+        with self.assertRaises(ValueError):
+            translate_many(RECORDS, grade=3)
+        with self.assertRaises(ValueError):
+            translate_many(RECORDS, direction='sideways')
+        with self.assertRaises(ValueError):
+            translate_many(RECORDS, workers=0)
+
+    def test_errors_propagate(self):
+        """Test that errors in workers are raised to the caller."""
+        with self.assertRaises(TypeError):
+            list(translate_many(['ok', 123], workers=2, chunksize=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests for the HTTP translation server.
+"""
+
+import http.client
+import json
+import threading
+import unittest
+
+from b2a import __version__
+from b2a.server import make_server
+from b2a.translator import text_to_braille, braille_to_text
+
+SAMPLE_TEXT = 'The Children sing 42 songs, and THE teacher said: "Hello!"'
+
+
+class TestServer(unittest.TestCase):
+    """Test cases for the translation server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = make_server('127.0.0.1', 0)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+
+    def setUp(self):
+        host, port = self.server.server_address[:2]
+        self.connection = http.client.HTTPConnection(host, port, timeout=10)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def request(self, method, path, body=None):
+        """Send a request on the shared connection and return status and body."""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.connection.request(method, path, body=body)
+        response = self.connection.getresponse()
+        return response.status, response.read().decode('utf-8')
+
+    def test_single_endpoints(self):
+        """Test both directions and grades on one kept-alive connection."""
+        for grade in (1, 2):
+            braille = text_to_braille(SAMPLE_TEXT, grade=grade)
+            with self.subTest(grade=grade):
+                self.assertEqual(self.request('POST', f'/text-to-braille?grade={grade}', SAMPLE_TEXT),
+                                 (200, braille))
+                self.assertEqual(self.request('POST', f'/braille-to-text?grade={grade}', braille),
+                                 (200, braille_to_text(braille, grade=grade)))
+
+    def test_default_grade(self):
+        """Test that Grade 2 is used when no grade is given."""
+        self.assertEqual(self.request('POST', '/text-to-braille', 'Hello World'),
+                         (200, text_to_braille('Hello World')))
+
+    def test_batch_endpoints(self):
+        """Test translating a JSON array of strings."""
+        items = [SAMPLE_TEXT, 'Hello World', '', 'sing']
+        status, body = self.request('POST', '/batch/text-to-braille?grade=1', json.dumps(items))
+        self.assertEqual(status, 200)
+        braille = json.loads(body)
+        self.assertEqual(braille, [text_to_braille(item, grade=1) for item in items])
+
+        status, body = self.request('POST', '/batch/braille-to-text?grade=1', json.dumps(braille))
+        self.assertEqual(json.loads(body), [braille_to_text(item, grade=1) for item in braille])
+
+    def test_errors_keep_connection(self):
+        """Test that bad requests get an error and the connection stays usable."""
+        self.assertEqual(self.request('POST', '/text-to-braille?grade=3', 'a')[0], 400)
+        self.assertEqual(self.request('POST', '/sideways', 'a')[0], 404)
+        self.assertEqual(self.request('POST', '/batch/text-to-braille', '{"a": 1}')[0], 400)
+        self.assertEqual(self.request('POST', '/batch/text-to-braille', 'not json')[0], 400)
+        self.assertEqual(self.request('POST', '/braille-to-text', b'\xff')[0], 400)
+        self.assertEqual(self.request('POST', '/text-to-braille', 'sing'),
+                         (200, text_to_braille('sing')))
+
+    def test_untranslatable_input(self):
+        """Test that a character the tables cannot translate gets a JSON 400."""
+        status, body = self.request('POST', '/text-to-braille', 'x\u00b2')
+        self.assertEqual(status, 400)
+        self.assertIn('error', json.loads(body))
+        status, body = self.request('POST', '/batch/text-to-braille', json.dumps(['a', '\u00b2']))
+        self.assertEqual(status, 400)
+        self.assertIn('error', json.loads(body))
+        self.assertEqual(self.request('POST', '/text-to-braille', 'sing'),
+                         (200, text_to_braille('sing')))
+
+    def test_health(self):
+        """Test the health endpoint."""
+        status, body = self.request('GET', '/health')
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), {'status': 'ok', 'version': __version__})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Tests for the import time of b2a and the startup of the CLI.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+from b2a import __version__
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative time `import b2a` may take, in microseconds. Importing every
+# module eagerly took over 50 ms; the lazy package takes a few.
+IMPORT_TIME_BUDGET = 25000
+
+# Modules that only specific commands need
+HEAVY_MODULES = ('b2a.translator', 'b2a.brf', 'b2a.parallel', 'b2a.server', 'b2a.bench',
+                 'b2a.instrument', 'b2a.differential', 'concurrent.futures', 'http.server', 'argparse')
+
+
+def run_python(*args):
+    env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT)
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True,
+                          env=env, cwd=PACKAGE_ROOT, check=True)
+
+
+class TestStartup(unittest.TestCase):
+    """Test cases for lazy imports."""
+
+    def test_import_time(self):
+        """Test that `python -X importtime -c 'import b2a'` stays under budget."""
+        # Best of a few runs, so a busy machine does not fail the test
+        best = None
+        for _ in range(3):
+            stderr = run_python('-X', 'importtime', '-c', 'import b2a').stderr
+            lines = [line for line in stderr.splitlines() if line.endswith('| b2a')]
+            self.assertEqual(len(lines), 1, stderr)
+            cumulative = int(lines[0].split('|')[1])
+            best = cumulative if best is None else min(best, cumulative)
+        self.assertLess(best, IMPORT_TIME_BUDGET)
+
+    def test_lazy_modules(self):
+        """Test that importing b2a and asking for the version load nothing heavy."""
+        code = ('import sys, b2a; from b2a import cli; cli.main(["--version"]); '
+                'print(",".join(name for name in %r if name in sys.modules))' % (HEAVY_MODULES,))
+        stdout = run_python('-c', code).stdout.splitlines()
+        self.assertEqual(stdout, [f'B2A {__version__}', ''])
+
+    def test_lazy_names(self):
+        """Test that public names and codecs load on first use."""
+        code = ('import sys, codecs, b2a; assert "b2a.translator" not in sys.modules; '
+                'print(b2a.text_to_braille("the")); print(codecs.lookup("braille-g2").name); '
+                'print("translate_many" in dir(b2a))')
+        stdout = run_python('-c', code).stdout.splitlines()
+        self.assertEqual(stdout, ['⠮', 'braille-g2', 'True'])
+
+    def test_lazy_submodules(self):
+        """Test that submodules load on first attribute access."""
+        code = ('import sys, b2a; assert "b2a.translator" not in sys.modules; '
+                'print(b2a.translator.Translator(1).encode("ab")); '
+                'print(b2a.formatter.__name__); print("server" in dir(b2a))')
+        stdout = run_python('-c', code).stdout.splitlines()
+        self.assertEqual(stdout, ['⠁⠃', 'b2a.formatter', 'True'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Tests for rule tables loaded from files.
+"""
+
+import os
+import tempfile
+import unittest
+
+from b2a import tables
+from b2a.tables import TableError, format_table, load_table, parse_table
+from b2a.translator import Translator
+
+SAMPLE_TEXT = (
+    'The Children sing 42 songs, and THE teacher said: "Hello!"\n'
+    'Then 7 more people came from Rome with 1001 questions about this bath.'
+)
+
+
+class TestRuleTables(unittest.TestCase):
+    """Test cases for parsing, compiling and caching rule tables."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, 'cache')
+        tables._LOADED.clear()
+
+    def tearDown(self):
+        tables._LOADED.clear()
+        self.tmp.cleanup()
+
+    def write(self, source, name='test.tbl'):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source)
+        return path
+
+    def test_builtin_round_trip(self):
+        """Test that the built-in mappings translate the same from a table file."""
+        path = self.write(format_table())
+        table = load_table(path, cache_dir=self.cache_dir)
+        for grade in (1, 2):
+            with self.subTest(grade=grade):
+                builtin = Translator(grade)
+                loaded = Translator(grade, table=table)
+                self.assertEqual(loaded.encode(SAMPLE_TEXT), builtin.encode(SAMPLE_TEXT))
+                braille = builtin.encode(SAMPLE_TEXT)
+                self.assertEqual(loaded.decode(braille), builtin.decode(braille))
+        self.assertEqual(repr(Translator(2, table=path)), f'Translator(grade=2, table={path!r})')
+
+    def test_parse(self):
+        """Test the rule table format."""
+        rules = parse_table('# comment\n\nletter a ⠁\ncontraction and ⠯\n'
+                            'context whole-word and\n')
+        self.assertEqual(rules['alphabet'], {'a': '⠁'})
+        self.assertEqual(rules['contractions'], {'and': '⠯'})
+        self.assertEqual(rules['context_rules'], {'whole-word': ('and',)})
+
+    def test_context_rules(self):
+        """Test that context rules from the table are applied."""
+        source = 'letter t ⠞\nletter h ⠓\nletter e ⠑\nletter n ⠝\ncontraction the ⠮\n'
+        free = Translator(2, table=self.write(source, 'free.tbl'))
+        whole = Translator(2, table=self.write(source + 'context whole-word the\n', 'whole.tbl'))
+        self.assertEqual(free.encode('then'), '⠮⠝')
+        self.assertEqual(whole.encode('then'), '⠞⠓⠑⠝')
+
+    def test_conflicts(self):
+        """Test that every conflicting entry is reported with its line."""
+        source = ('contraction such ⠎⠡\n'
+                  'contraction such ⠎⠡\n'
+                  'contraction where ⠱⠻\n'
+                  'contraction where ⠺⠓⠑⠗⠑\n'
+                  'context whole-word nothing\n'
+                  'context sometimes where\n'
+                  'letter ab ⠁\n'
+                  'glyph a ⠁\n')
+        with self.assertRaises(TableError) as cm:
+            parse_table(source, 'bad.tbl')
+        errors = cm.exception.errors
+        self.assertEqual(len(errors), 6)
+        self.assertIn("bad.tbl:2: duplicate contraction 'such', already defined on line 1",
+                      errors)
+        self.assertIn("bad.tbl:4: conflicting contraction 'where': ⠺⠓⠑⠗⠑ here, "
+                      "⠱⠻ on line 3", errors)
+        self.assertIn("bad.tbl:6: unknown context rule 'sometimes'", errors)
+        self.assertIn("bad.tbl:5: context rule 'whole-word' names unknown contraction "
+                      "'nothing'", errors)
+        self.assertIsInstance(cm.exception, ValueError)
+
+    def test_cache(self):
+        """Test that compiled tables are cached by content and reused."""
+        path = self.write(format_table())
+        table = load_table(path, cache_dir=self.cache_dir)
+        cache_path = os.path.join(self.cache_dir, table.digest + '.pickle')
+        self.assertTrue(os.path.exists(cache_path))
+
+        # A new process reads the cache instead of compiling
+        tables._LOADED.clear()
+        original = tables.compile_table
+        tables.compile_table = None
+        try:
+            cached = load_table(path, cache_dir=self.cache_dir)
+        finally:
+            tables.compile_table = original
+        self.assertEqual(cached.tables.contractions, table.tables.contractions)
+        self.assertEqual(Translator(2, table=cached).encode(SAMPLE_TEXT),
+                         Translator(2).encode(SAMPLE_TEXT))
+
+        # A corrupt cache file is ignored and rewritten
+        tables._LOADED.clear()
+        with open(cache_path, 'wb') as f:
+            f.write(b'not a pickle')
+        self.assertEqual(load_table(path, cache_dir=self.cache_dir).digest, table.digest)
+        self.assertIsNotNone(tables._read_cache(cache_path))
+
+        # Changing the table changes the key
+        other = self.write(format_table() + 'contraction xyz ⠭\n', 'other.tbl')
+        self.assertNotEqual(load_table(other, cache_dir=self.cache_dir).digest, table.digest)
+
+
+if __name__ == '__main__':
+    unittest.main()
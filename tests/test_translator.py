@@ -2,8 +2,11 @@
 Tests for the B2A translator module.
 """
 
+import threading
 import unittest
-from b2a.translator import text_to_braille, braille_to_text, CAPITAL_INDICATOR
+from b2a.translator import (Translator, text_to_braille, braille_to_text, auto_translate,
+                            contains_braille, iter_runs, iter_braille, iter_text,
+                            tokenize, Token, CAPITAL_INDICATOR)
 
 class TestTranslator(unittest.TestCase):
     """Test cases for the translator functions."""
@@ -46,6 +49,8 @@ class TestTranslator(unittest.TestCase):
             text_to_braille('hello', grade=3)  # Invalid grade
         with self.assertRaises(ValueError):
             braille_to_text('hello', grade=0)  # Invalid grade
+        with self.assertRaises(ValueError):
+            text_to_braille('hello', grade=[2])  # Unhashable grade
 
 class TestGrade2BrailleBasic(unittest.TestCase):
     """Basic test cases for Grade 2 Braille."""
@@ -63,5 +68,269 @@ class TestGrade2BrailleBasic(unittest.TestCase):
         self.assertEqual(braille_to_text('⠮'), 'the')
         self.assertEqual(braille_to_text('⠯'), 'and')
 
+class TestTranslatorObject(unittest.TestCase):
+    """Test cases for the reusable Translator class."""
+    
+    def test_matches_module_functions(self):
+        """Test that Translator gives the same results as the module functions."""
+        samples = ['Hello World', 'the quick fox', 'HELLO 42!', 'shoulder', 'this']
+        for grade in (1, 2):
+            translator = Translator(grade=grade)
+            for text in samples:
+                with self.subTest(grade=grade, text=text):
+                    braille = translator.encode(text)
+                    self.assertEqual(braille, text_to_braille(text, grade=grade))
+                    self.assertEqual(translator.decode(braille), braille_to_text(braille, grade=grade))
+    
+    def test_invalid_input(self):
+        """Test handling of invalid input."""
+        with self.assertRaises(ValueError):
+            Translator(grade=3)
+        with self.assertRaises(TypeError):
+            Translator().encode(123)
+        with self.assertRaises(TypeError):
+            Translator().decode(None)
+    
+    def test_grade1_fast_path(self):
+        """Test that the Grade 1 fast path matches the per-character translation."""
+        translator = Translator(grade=1)
+        samples = [
+            '', 'hello', 'Hello, World!', 'ABC 123 x9y88z', '1 + 1 = 2',
+            'Special chars: #$%&*()[]{}', 'tab\there\nnew line', '~`|^_@',
+        ]
+        for text in samples:
+            with self.subTest(text=text):
+                braille = translator.encode(text)
+                self.assertEqual(braille, translator._encode_grade1_chars(text))
+    
+    def test_grade1_decode_indicators(self):
+        """Test Grade 1 decoding of capital and number indicators."""
+        translator = Translator(grade=1)
+        # Double capital runs to the next space, keeping unknown cells
+        self.assertEqual(translator.decode(f'{CAPITAL_INDICATOR*2}⠁⠃⠂⠼ ⠉'), 'AB⠂⠼ c')
+        # A capital indicator without a letter is dropped
+        self.assertEqual(translator.decode(f'⠁{CAPITAL_INDICATOR} ⠃{CAPITAL_INDICATOR}'), 'a b')
+        # Number indicators apply to the following digits only
+        self.assertEqual(translator.decode('⠼⠂⠆⠂ ⠂'), '121 ,')
+    
+    def test_tables_shared(self):
+        """Test that instances share one set of compiled tables."""
+        self.assertIs(Translator(grade=1)._tables, Translator(grade=2)._tables)
+    
+    def test_thread_safety(self):
+        """Test that one Translator can be used from several threads."""
+        translator = Translator()
+        expected = translator.encode('The children sing with their friends')
+        results = []
+        
+        def worker():
+            for _ in range(200):
+                results.append(translator.encode('The children sing with their friends'))
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(set(results), {expected})
+
+class TestWordCache(unittest.TestCase):
+    """Test cases for the Grade 2 word cache."""
+    
+    TEXT = 'The children sing. THE Children and the CHILDREN came with 42 friends!\nThen they left.'
+    
+    def test_matches_uncached(self):
+        """Test that cached translation matches uncached translation."""
+        plain = Translator(grade=2)
+        cached = Translator(grade=2, cache_size=4)
+        braille = plain.encode(self.TEXT)
+        for _ in range(3):
+            self.assertEqual(cached.encode(self.TEXT), braille)
+            self.assertEqual(cached.decode(braille), plain.decode(braille))
+        # A capital indicator at the end or before a space must not leak
+        for cells in ('⠠', '⠠ ⠁', '⠼⠁ ⠁', '⠠⠠⠉⠓ ⠉⠓'):
+            self.assertEqual(cached.decode(cells), plain.decode(cells))
+    
+    def test_case_variants_share_entry(self):
+        """Test that words differing only in case share one cache entry."""
+        translator = Translator(grade=2, cache_size=8)
+        translator.encode('sing Sing SING')
+        stats = translator.encode_cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (2, 1, 1))
+    
+    def test_eviction_and_clear(self):
+        """Test that the cache stays bounded and can be cleared."""
+        translator = Translator(grade=2, cache_size=2)
+        translator.encode('sing ring bring sing')
+        stats = translator.encode_cache.stats()
+        self.assertEqual(stats.size, 2)
+        self.assertEqual(stats.evictions, 2)
+        self.assertEqual(stats.misses, 4)
+        translator.encode_cache.clear()
+        self.assertEqual(translator.encode_cache.stats(), (0, 0, 0, 2, 0))
+    
+    def test_invalid_size(self):
+        """Test that a cache size below one is rejected."""
+        with self.assertRaises(ValueError):
+            Translator(grade=2, cache_size=0)
+    
+    def test_disabled_by_default(self):
+        """Test that translators do not cache unless asked to."""
+        translator = Translator(grade=2)
+        self.assertIsNone(translator.encode_cache)
+        self.assertIsNone(translator.decode_cache)
+
+class TestAutoTranslate(unittest.TestCase):
+    """Test cases for translating mixed Braille and print text."""
+    
+    def test_runs(self):
+        """Test that runs split at Braille-block boundaries and keep spaces inside."""
+        text = 'Note: ⠓⠑⠇⠇⠕  ⠺⠕⠗⠇⠙ (tn)⠠⠮\n⣿'
+        self.assertEqual(list(iter_runs(text)), [
+            (False, 'Note: '), (True, '⠓⠑⠇⠇⠕  ⠺⠕⠗⠇⠙'), (False, ' (tn)'),
+            (True, '⠠⠮'), (False, '\n'), (True, '⣿'),
+        ])
+        self.assertEqual(''.join(run for _, run in iter_runs(text)), text)
+        self.assertEqual(list(iter_runs('')), [])
+        self.assertTrue(contains_braille('abc ⠀'))
+        self.assertFalse(contains_braille('abc'))
+    
+    def test_auto_translate(self):
+        """Test that each run is translated in its own direction and stitched in order."""
+        for grade in (1, 2):
+            with self.subTest(grade=grade):
+                braille = text_to_braille('Hello world', grade=grade)
+                text = f'Transcriber note: {braille} (end)'
+                expected = (text_to_braille('Transcriber note: ', grade=grade)
+                            + braille_to_text(braille, grade=grade)
+                            + text_to_braille(' (end)', grade=grade))
+                self.assertEqual(auto_translate(text, grade=grade), expected)
+                self.assertEqual(Translator(grade).auto(text), expected)
+                self.assertEqual(auto_translate('plain text', grade=grade),
+                                 text_to_braille('plain text', grade=grade))
+                self.assertEqual(auto_translate(braille, grade=grade),
+                                 braille_to_text(braille, grade=grade))
+        with self.assertRaises(TypeError):
+            auto_translate(b'bytes')
+
+class TestTokenize(unittest.TestCase):
+    """Test cases for splitting text and Braille into tokens."""
+    
+    def test_text_tokens(self):
+        """Test that text tokens carry their kind and case."""
+        tokens = list(tokenize('The CHILDREN  sing 42 ... McDonald\n'))
+        self.assertEqual(tokens, [
+            Token('word', 'The', 'title'), Token('space', ' ', 'lower'),
+            Token('word', 'CHILDREN', 'upper'), Token('space', '  ', 'lower'),
+            Token('word', 'sing', 'lower'), Token('space', ' ', 'lower'),
+            Token('digits', '42', 'lower'), Token('space', ' ', 'lower'),
+            Token('punctuation', '...', 'lower'), Token('space', ' ', 'lower'),
+            Token('word', 'McDonald', 'capital'), Token('space', '\n', 'lower'),
+        ])
+        kinds = [token.kind for token in tokenize('42nd 4.2 ٣ A "hi"')]
+        self.assertEqual(kinds, ['word', 'space', 'word', 'space', 'word', 'space',
+                                 'word', 'space', 'word'])
+        self.assertEqual(list(tokenize('')), [])
+    
+    def test_braille_tokens(self):
+        """Test that Braille is split at spaces and indicators."""
+        braille = text_to_braille('The CHILDREN sing 42 songs')
+        tokens = list(tokenize(braille, braille=True))
+        self.assertEqual(''.join(token.text for token in tokens), braille)
+        self.assertEqual([token.kind for token in tokens if token.kind != 'space'],
+                         ['word', 'word', 'word', 'digits', 'word'])
+        self.assertEqual([token.case for token in tokens if token.kind == 'word'],
+                         ['title', 'upper', 'lower', 'lower'])
+    
+    def test_round_trip(self):
+        """Test that joining the tokens gives back the input."""
+        text = 'Hello,  World!\t1001 THE\nend. '
+        self.assertEqual(''.join(token.text for token in tokenize(text)), text)
+        for grade in (1, 2):
+            braille = text_to_braille(text, grade=grade) + ' ⠠'
+            joined = ''.join(token.text for token in tokenize(braille, braille=True))
+            self.assertEqual(joined, braille)
+
+class TestIterators(unittest.TestCase):
+    """Test cases for translating iterables of chunks."""
+    
+    TEXT = ('The Children sing 42 songs, and THE teacher said: "Hello!"\n'
+            'Then 7 more people came from Rome with 1001 questions about this bath.  ')
+    
+    def chunks(self, data, size):
+        return (data[i:i + size] for i in range(0, len(data), size))
+    
+    def test_matches_whole_translation(self):
+        """Test that chunks cut anywhere translate like the joined input."""
+        for grade in (1, 2):
+            braille = text_to_braille(self.TEXT, grade=grade)
+            for size in (1, 3, 10, len(self.TEXT)):
+                for batch_size in (None, 1, 8, 1000):
+                    with self.subTest(grade=grade, size=size, batch_size=batch_size):
+                        pieces = iter_braille(self.chunks(self.TEXT, size), grade, batch_size)
+                        self.assertEqual(''.join(pieces), braille)
+                        pieces = iter_text(self.chunks(braille, size), grade, batch_size)
+                        self.assertEqual(''.join(pieces), braille_to_text(braille, grade=grade))
+    
+    def test_word_by_word(self):
+        """Test that output is yielded one word at a time by default."""
+        pieces = list(iter_braille(self.chunks(self.TEXT, 5)))
+        words = ('The ', 'Children ', 'sing ')
+        self.assertEqual(pieces[:3], [text_to_braille(word) for word in words])
+        self.assertNotIn('', pieces)
+        braille = text_to_braille(self.TEXT, grade=1)
+        pieces = list(Translator(1).iter_decode(braille))
+        self.assertEqual(pieces[:2], ['The ', 'Children '])
+    
+    def test_batches(self):
+        """Test that batches are cut at words and stay near the batch size."""
+        text = self.TEXT * 50
+        pieces = list(iter_braille(text, batch_size=200))
+        self.assertEqual(''.join(pieces), text_to_braille(text))
+        self.assertGreater(len(pieces), 10)
+        for piece in pieces[:-1]:
+            self.assertTrue(piece[-1].isspace())
+            self.assertLess(len(piece), 400)
+    
+    def test_braille_line_breaks(self):
+        """Test that Braille is cut at line breaks unless a capital carries over."""
+        for grade in (1, 2):
+            cut = Translator(grade).stream_boundary(decode=True)
+            self.assertEqual(cut('⠁⠃\n⠉'), 3)
+            self.assertEqual(cut('⠁ ⠃\n⠉'), 4)
+            self.assertEqual(cut('⠠⠠⠁⠃\n⠉'), 0)
+            self.assertEqual(cut('⠁\n⠠⠠⠃\n⠉'), 2)
+        self.assertEqual(Translator(1).stream_boundary(decode=True)('⠠⠁\n⠃'), 3)
+        cut = Translator(2).stream_boundary(decode=True)
+        self.assertEqual(cut('⠠⠁\n⠃'), 0)
+        self.assertEqual(cut('⠠⠁\n⠠⠃'), 3)
+        self.assertEqual(Translator(2).stream_boundary()('a\tb'), 2)
+        
+        text = 'The\nCHILDREN\nsing\n42\nsongs,\nHello\nRome\n' * 20
+        for grade in (1, 2):
+            braille = text_to_braille(text, grade=grade)
+            for size in (1, 7, 64):
+                with self.subTest(grade=grade, size=size):
+                    pieces = list(iter_text(self.chunks(braille, size), grade, 16))
+                    self.assertEqual(''.join(pieces), braille_to_text(braille, grade=grade))
+                    self.assertLess(max(map(len, pieces)), 200)
+    
+    def test_special_phrases(self):
+        """Test that whole-input phrases apply only to the whole input."""
+        self.assertEqual(''.join(iter_braille(['Hello', ' World'])),
+                         text_to_braille('Hello World'))
+        self.assertEqual(''.join(iter_braille(['this'])), text_to_braille('this'))
+        self.assertEqual(list(iter_braille([])), [])
+        self.assertEqual(list(iter_text('')), [])
+    
+    def test_errors(self):
+        """Test that bad chunks and batch sizes are rejected."""
+        with self.assertRaises(TypeError):
+            list(iter_braille([b'bytes']))
+        with self.assertRaises(ValueError):
+            iter_braille(['text'], batch_size=0)
+        with self.assertRaises(ValueError):
+            iter_text(['⠁'], grade=3)
+
 if __name__ == '__main__':
     unittest.main()
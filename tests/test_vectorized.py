@@ -0,0 +1,67 @@
+"""
+Tests for the NumPy Grade 1 backend.
+"""
+
+import unittest
+from unittest import mock
+
+from b2a import translator
+from b2a.translator import Translator, text_to_braille
+from b2a.vectorized import AVAILABLE, text_to_grade1_braille
+
+SAMPLES = [
+    'The Children sing 42 songs, and THE teacher said: "Hello!"',
+    'Then 7 more people came from Rome with 1001 questions ½ é.',
+    'x² İstanbul ß ﬁ Ⅳ ٣٤ 1٣ É 😀 \U0001d7d9\U0001d7d9 a+b=c $5 {x} 50%',
+    '12\n34\t\t56 ',
+    'A',
+    '',
+]
+
+
+class TestLargeInput(unittest.TestCase):
+    """Test cases that run with or without NumPy."""
+
+    def test_large_input(self):
+        """Test that inputs above the threshold give the usual Grade 1 output."""
+        text = ' '.join(SAMPLES) * (translator.VECTORIZE_MIN_CHARS // 100)
+        self.assertGreaterEqual(len(text), translator.VECTORIZE_MIN_CHARS)
+        expected = Translator(grade=1)._encode_grade1_chars(text)
+        self.assertEqual(text_to_braille(text, grade=1), expected)
+
+
+@unittest.skipUnless(AVAILABLE, 'NumPy is not installed')
+class TestVectorized(unittest.TestCase):
+    """Test cases for the vectorized Grade 1 translation."""
+
+    def test_matches_translator(self):
+        """Test that the output is identical to the pure-Python translation."""
+        reference = Translator(grade=1)._encode_grade1_chars
+        for text in SAMPLES:
+            with self.subTest(text=text):
+                self.assertEqual(text_to_grade1_braille(text), reference(text))
+
+    def test_all_characters(self):
+        """Test every character of the Basic Multilingual Plane and some above it."""
+        reference = Translator(grade=1)._encode_grade1_chars
+        chars = [chr(code) for code in range(0x10000)] + ['😀', '\U0001d7d9', '\U0001d400']
+        for i in range(0, len(chars), 4096):
+            # Pair each character with a digit to exercise number indicators
+            text = '1'.join(chars[i:i + 4096])
+            self.assertEqual(text_to_grade1_braille(text), reference(text))
+
+    def test_selected_automatically(self):
+        """Test that the translator uses the backend above the threshold only."""
+        text = 'Hello 42 ' * 10
+        with mock.patch.object(translator, 'VECTORIZE_MIN_CHARS', len(text)), \
+                mock.patch('b2a.vectorized.text_to_grade1_braille',
+                           side_effect=text_to_grade1_braille) as vectorized, \
+                mock.patch.object(translator, '_VECTORIZED_GRADE1', None):
+            self.assertEqual(text_to_braille(text, grade=1), text_to_grade1_braille(text))
+            self.assertEqual(vectorized.call_count, 1)
+            text_to_braille(text[:-1], grade=1)
+            self.assertEqual(vectorized.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()